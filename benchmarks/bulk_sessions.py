@@ -0,0 +1,48 @@
+"""Compare creating N study sessions one request at a time against one bulk request.
+
+    python -m benchmarks.bulk_sessions --sessions 500
+"""
+import argparse
+from datetime import datetime, timedelta
+from benchmarks.common import run, reset_schema, bench_client, register, auth, Timer
+
+
+def session_payload(i: int) -> dict:
+    return {
+        'title': f'Session {i}',
+        'description': 'Benchmark session',
+        'date_time': (datetime(2030, 1, 1, 9) + timedelta(hours=i)).isoformat(),
+        'duration': 60,
+        'status': 'Scheduled'
+    }
+
+
+async def main(sessions: int) -> None:
+    await reset_schema()
+
+    async with bench_client() as client:
+        headers = auth(await register(client, 'bench_admin'))
+        (await client.post('/study-groups/', headers=headers, json={'name': 'Bench group', 'description': ''})).raise_for_status()
+        (await client.post('/study-groups/1/subjects', headers=headers, json={'name': 'Single'})).raise_for_status()
+        (await client.post('/study-groups/1/subjects', headers=headers, json={'name': 'Bulk'})).raise_for_status()
+
+        with Timer() as single:
+            for i in range(sessions):
+                response = await client.post('/study-groups/1/study_sessions/1', headers=headers, json=session_payload(i))
+                response.raise_for_status()
+
+        with Timer() as bulk:
+            response = await client.post('/study-groups/1/study_sessions/2/bulk', headers=headers, json={
+                'sessions': [session_payload(sessions + i) for i in range(sessions)]
+            })
+            response.raise_for_status()
+
+    print(f'single-item path: {sessions} sessions in {single.elapsed:.3f}s ({sessions / single.elapsed:,.0f} sessions/s)')
+    print(f'bulk path:        {sessions} sessions in {bulk.elapsed:.3f}s ({sessions / bulk.elapsed:,.0f} sessions/s)')
+    print(f'speedup:          {single.elapsed / bulk.elapsed:.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=500)
+    run(main(parser.parse_args().sessions))
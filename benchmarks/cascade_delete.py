@@ -0,0 +1,98 @@
+"""Delete a study group with many sessions: ORM-loaded cascade versus database-side ON DELETE CASCADE.
+
+The "orm" strategy reproduces the old behaviour by loading the whole tree before `session.delete`, so
+SQLAlchemy issues one DELETE per row. The "set" strategy is what delete_group does now.
+
+    python -m benchmarks.cascade_delete --sessions 10000
+"""
+import argparse
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, select, func
+from sqlalchemy.orm import selectinload
+from benchmarks.common import run, reset_schema, Timer
+from database import SessionLocal
+from models import User, StudyGroup, Membership, Subject, StudySession
+
+
+async def seed_group(name: str, sessions: int, subjects: int, members: int) -> int:
+    async with SessionLocal() as db:
+        owner_id = await db.scalar(select(User.id).where(User.username == 'owner'))
+        group = StudyGroup(name=name, description='', owner_id=owner_id)
+        db.add(group)
+        await db.flush()
+
+        member_ids = (await db.scalars(select(User.id).limit(members))).all()
+        await db.execute(insert(Membership), [
+            {'user_id': user_id, 'group_id': group.id, 'role': 'Member'} for user_id in member_ids
+        ])
+        await db.execute(insert(Subject), [
+            {'name': f'Subject {i}', 'group_id': group.id} for i in range(subjects)
+        ])
+        subject_ids = (await db.scalars(select(Subject.id).where(Subject.group_id == group.id))).all()
+
+        start = datetime(2030, 1, 1)
+        await db.execute(insert(StudySession), [
+            {
+                'title': f'Session {i}',
+                'description': '',
+                'date_time': start + timedelta(hours=i),
+                'duration': 60,
+                'status': 'Scheduled',
+                'subject_id': subject_ids[i % len(subject_ids)],
+                'created_by': owner_id
+            }
+            for i in range(sessions)
+        ])
+        await db.commit()
+        return group.id
+
+
+async def orm_delete(group_id: int) -> None:
+    async with SessionLocal() as db:
+        group = await db.scalar(select(StudyGroup).options(
+            selectinload(StudyGroup.memberships),
+            selectinload(StudyGroup.subjects).selectinload(Subject.sessions)
+        ).where(StudyGroup.id == group_id))
+        await db.delete(group)
+        await db.commit()
+
+
+async def set_delete(group_id: int) -> None:
+    async with SessionLocal() as db:
+        await db.execute(delete(StudyGroup).where(StudyGroup.id == group_id))
+        await db.commit()
+
+
+async def main(sessions: int, subjects: int, members: int) -> None:
+    await reset_schema()
+
+    async with SessionLocal() as db:
+        await db.execute(insert(User), [
+            {'email': f'user{i}@bench.local', 'username': 'owner' if i == 0 else f'user{i}', 'hashed_password': 'x'}
+            for i in range(members)
+        ])
+        await db.commit()
+
+    results = {}
+    for strategy, delete_group in (('orm', orm_delete), ('set', set_delete)):
+        group_id = await seed_group(f'Group {strategy}', sessions, subjects, members)
+        with Timer() as timer:
+            await delete_group(group_id)
+        results[strategy] = timer.elapsed
+
+    async with SessionLocal() as db:
+        assert await db.scalar(select(func.count()).select_from(StudySession)) == 0
+
+    print(f'group with {sessions} sessions, {subjects} subjects, {members} members')
+    print(f'orm-loaded cascade: {results["orm"]:.3f}s')
+    print(f'ON DELETE CASCADE:  {results["set"]:.3f}s')
+    print(f'speedup:            {results["orm"] / results["set"]:.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', type=int, default=10000)
+    parser.add_argument('--subjects', type=int, default=20)
+    parser.add_argument('--members', type=int, default=200)
+    args = parser.parse_args()
+    run(main(args.sessions, args.subjects, args.members))
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SCRATCH_DATABASE = 'URL' not in os.environ
+os.environ.setdefault('URL', f'sqlite:///{tempfile.mkdtemp(prefix="studyhub-bench-")}/bench.db')
+os.environ.setdefault('KEY', 'benchmark-secret')
+os.environ.setdefault('SCHEMA_CHECK', 'off')
+# Benchmarks register and log in from one address far faster than any real client would.
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+
+import httpx
+import models
+from sqlalchemy import event
+from database import engine
+from main import app
+
+
+def run(main):
+    async def runner():
+        try:
+            return await main
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+
+async def reset_schema() -> None:
+    if not SCRATCH_DATABASE and os.getenv('BENCH_ALLOW_RESET') != '1':
+        raise SystemExit('Benchmarks drop and recreate every table; set BENCH_ALLOW_RESET=1 to run against URL.')
+
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.drop_all)
+        await conn.run_sync(models.Base.metadata.create_all)
+
+
+@asynccontextmanager
+async def bench_client():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+            yield client
+
+
+async def register(client: httpx.AsyncClient, username: str, password: str = 'benchmark') -> str:
+    await client.post('/auth/', json={
+        'email': f'{username}@bench.local',
+        'username': username,
+        'password': password
+    })
+    response = await client.post('/auth/token', data={'username': username, 'password': password})
+    response.raise_for_status()
+    return response.json()['access_token']
+
+
+def auth(token: str) -> dict:
+    return {'Authorization': f'Bearer {token}'}
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(engine.sync_engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def close(self) -> None:
+        event.remove(engine.sync_engine, 'before_cursor_execute', self._on_execute)
@@ -0,0 +1,57 @@
+"""Polling cost of the read routes with and without If-None-Match.
+
+Each route is polled with a plain GET and then with the ETag from the first response, which is
+answered 304 without serializing rows: for group and subject lookups from a count/max(updated_at)
+aggregate, and for the paged group, member and session listings from the requested page itself.
+
+    python -m benchmarks.conditional_get --members 500 --sessions 200
+"""
+import argparse
+from benchmarks.common import run, reset_schema, bench_client, Timer
+from benchmarks.seed import seed
+
+
+async def poll(client, url: str, headers: dict, requests: int, expected: int) -> tuple[float, int]:
+    received = 0
+    with Timer() as timer:
+        for _ in range(requests):
+            response = await client.get(url, headers=headers)
+            assert response.status_code == expected, (url, response.status_code)
+            received += len(response.content)
+    return requests / timer.elapsed, received // requests
+
+
+async def main(members: int, sessions: int, requests: int) -> None:
+    await reset_schema()
+    data = await seed(users=members, groups=1, members_per_group=members, subjects_per_group=3,
+                      sessions_per_subject=sessions)
+    group_id, owner_id = data.groups[0]
+    subject_id = data.subjects[group_id][0]
+    headers = data.headers(owner_id)
+
+    routes = {
+        'get_groups': '/study-groups/?limit=100',
+        'get_group_by_id': f'/study-groups/{group_id}',
+        'get_members': f'/study-groups/{group_id}/members',
+        'get_subjects': f'/study-groups/{group_id}/subjects',
+        'get_sessions_by_subject': f'/study-groups/{group_id}/study_sessions/{subject_id}?limit=200',
+    }
+
+    print(f'{members} members, {sessions} sessions per subject, {requests} polls per route')
+    print(f'{"route":<26}{"200 req/s":>12}{"bytes":>9}{"304 req/s":>12}{"bytes":>9}{"speedup":>10}')
+
+    async with bench_client() as client:
+        for name, url in routes.items():
+            etag = (await client.get(url, headers=headers)).headers['etag']
+            full, full_bytes = await poll(client, url, headers, requests, 200)
+            cached, cached_bytes = await poll(client, url, {**headers, 'If-None-Match': etag}, requests, 304)
+            print(f'{name:<26}{full:>12,.0f}{full_bytes:>9}{cached:>12,.0f}{cached_bytes:>9}{cached / full:>9.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--members', type=int, default=500)
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+    run(main(args.members, args.sessions, args.requests))
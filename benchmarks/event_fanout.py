@@ -0,0 +1,61 @@
+"""Fan-out cost of the in-process event hub behind /study-groups/{group_id}/events.
+
+Subscribes N consumers to one group, publishes events, and reports how long dispatch takes and how
+long it takes for the last consumer to see each event. A share of the consumers can be made slow
+to show eviction.
+
+    python -m benchmarks.event_fanout --subscribers 5000 --events 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from benchmarks.common import run
+from core.events import EventHub, make_event
+
+
+async def consume(subscription, latencies: list, delay: float) -> None:
+    while (event := await subscription.queue.get()) is not None:
+        latencies.append(time.perf_counter() - event['sent'])
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def main(subscribers: int, events: int, queue_size: int, slow: float) -> None:
+    hub = EventHub(queue_size)
+    latencies = []
+    slow_count = int(subscribers * slow)
+    consumers = [
+        asyncio.create_task(consume(hub.subscribe(1, user_id), latencies, 0.05 if user_id < slow_count else 0))
+        for user_id in range(subscribers)
+    ]
+
+    dispatch = []
+    for i in range(events):
+        event = make_event(1, 'session.updated', {'session_id': i})
+        event['sent'] = time.perf_counter()
+        start = time.perf_counter()
+        hub.dispatch(event)
+        dispatch.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+
+    hub.close()
+    await asyncio.gather(*consumers)
+
+    latencies.sort()
+    print(f'{subscribers} subscribers ({slow_count} slow), {events} events, queue size {queue_size}')
+    print(f'dispatch: {statistics.median(dispatch) * 1000:.2f} ms median per event '
+          f'({statistics.median(dispatch) / subscribers * 1e9:.0f} ns per subscriber)')
+    print(f'delivery latency: p50 {latencies[len(latencies) // 2] * 1000:.2f} ms, '
+          f'p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms')
+    print(f'delivered {hub.delivered}, evicted {hub.evicted}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--subscribers', type=int, default=5000)
+    parser.add_argument('--events', type=int, default=200)
+    parser.add_argument('--queue-size', type=int, default=100)
+    parser.add_argument('--slow', type=float, default=0.01, help='Fraction of consumers that fall behind.')
+    args = parser.parse_args()
+    run(main(args.subscribers, args.events, args.queue_size, args.slow))
@@ -0,0 +1,120 @@
+"""CPU per response for the list routes with and without FAST_RESPONSES.
+
+Seeds a group with N members, a user who belongs to N groups and a subject with N sessions. It then
+reads each list in full and reports process CPU time per full read. The members and sessions routes
+are paged at 200 rows, so they take N / 200 requests.
+
+    python -m benchmarks.fast_json --rows 1000,10000
+"""
+import argparse
+import statistics
+import time
+from datetime import timedelta
+from benchmarks.common import run, reset_schema, bench_client
+from benchmarks.seed import Dataset, insert_batched
+from database import SessionLocal
+from models import User, StudyGroup, Membership, Subject, StudySession, utc_now
+from routers import memberships, users, subjects, study_sessions
+
+FAST_PATH_MODULES = (memberships, users, subjects, study_sessions)
+
+
+def set_fast_responses(enabled: bool) -> None:
+    for module in FAST_PATH_MODULES:
+        module.FAST_RESPONSES = enabled
+
+
+async def seed_lists(rows: int) -> Dataset:
+    data = Dataset()
+    data.users = {user_id: f'user{user_id}' for user_id in range(1, rows + 1)}
+    now = utc_now()
+
+    async with SessionLocal() as db:
+        await insert_batched(db, User, (
+            {'id': user_id, 'email': f'{name}@bench.local', 'username': name, 'hashed_password': 'x'}
+            for user_id, name in data.users.items()
+        ))
+        await insert_batched(db, StudyGroup, (
+            {'id': g, 'name': f'Group {g}', 'description': '', 'owner_id': 1} for g in range(1, rows + 1)
+        ))
+        await insert_batched(db, Membership, (
+            {'user_id': user_id, 'group_id': 1, 'role': 'Creator' if user_id == 1 else 'Member'}
+            for user_id in data.users
+        ))
+        await insert_batched(db, Membership, (
+            {'user_id': 1, 'group_id': g, 'role': 'Member'} for g in range(2, rows + 1)
+        ))
+        await insert_batched(db, Subject, [{'id': 1, 'name': 'Subject', 'group_id': 1}])
+        await insert_batched(db, StudySession, (
+            {
+                'title': f'Session {i}',
+                'description': 'Benchmark session',
+                'date_time': now + timedelta(hours=i),
+                'duration': 60,
+                'status': 'Scheduled',
+                'subject_id': 1,
+                'created_by': 1
+            }
+            for i in range(rows)
+        ))
+        await db.commit()
+
+    return data
+
+
+async def read_all(client, url: str, headers: dict) -> int:
+    rows, params = 0, {'limit': 200} if 'study_sessions' in url or url.endswith('/members') else {}
+    while True:
+        response = await client.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        body = response.json()
+        if isinstance(body, list):
+            return rows + len(body)
+        rows += len(body['items'])
+        if not body['next_cursor']:
+            return rows
+        params = {**params, 'cursor': body['next_cursor']}
+
+
+async def cpu_per_read(client, url: str, headers: dict, repeat: int) -> tuple[float, int]:
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        rows = await read_all(client, url, headers)
+        timings.append(time.process_time() - start)
+    return statistics.median(timings), rows
+
+
+async def main(sizes: list[int], repeat: int) -> None:
+    routes = {
+        'get_members': '/study-groups/1/members',
+        'get_memberships': '/user/memberships',
+        'get_subjects': '/study-groups/1/subjects',
+        'get_sessions_by_subject': '/study-groups/1/study_sessions/1',
+    }
+
+    print(f'{"route":<26}{"rows":>7}{"pydantic ms":>14}{"fast ms":>10}{"speedup":>10}')
+    for rows in sizes:
+        await reset_schema()
+        data = await seed_lists(rows)
+        headers = data.headers(1)
+
+        async with bench_client() as client:
+            for name, url in routes.items():
+                results = {}
+                for enabled in (False, True):
+                    set_fast_responses(enabled)
+                    await read_all(client, url, headers)
+                    results[enabled] = await cpu_per_read(client, url, headers, repeat)
+                (slow, count), (fast, _) = results[False], results[True]
+                print(f'{name:<26}{count:>7}{slow * 1000:>14.1f}{fast * 1000:>10.1f}{slow / fast:>9.1f}x')
+
+    set_fast_responses(False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', default='1000,10000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(main([int(size) for size in args.rows.split(',')], args.repeat))
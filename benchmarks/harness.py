@@ -0,0 +1,286 @@
+"""Load-test the StudyHub API in-process and record a JSON baseline.
+
+Seeds a scratch database (SQLite by default, or the database at URL with BENCH_ALLOW_RESET=1),
+then drives each API route through an in-process ASGI client at each concurrency level and reports
+req/s, latency percentiles and SQL queries per request. The group events stream is left out, since
+its response never completes, as are the /internal and /metrics endpoints.
+
+    python -m benchmarks.harness --requests 200 --concurrency 1,10,50 --output baseline.json
+    python -m benchmarks.harness --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, NamedTuple
+from benchmarks.common import run, reset_schema, bench_client, QueryCounter, ROOT
+from benchmarks.seed import seed, Dataset, PASSWORD
+from database import engine
+
+
+class Scenario(NamedTuple):
+    name: str
+    expected: int
+    build: Callable[[Dataset, int], tuple]
+
+
+def group(data: Dataset, i: int) -> tuple[int, int, int]:
+    index = i % len(data.groups)
+    group_id, owner_id = data.groups[index]
+    return index, group_id, owner_id
+
+
+def subject(data: Dataset, i: int) -> tuple[int, int, int]:
+    _, group_id, owner_id = group(data, i)
+    subject_ids = data.subjects[group_id]
+    return group_id, owner_id, subject_ids[i % len(subject_ids)]
+
+
+# Each writing scenario schedules into its own year so that none of them trips the overlap check.
+def session_body(i: int, year: int = 2031) -> dict:
+    return {
+        'title': f'Benchmark session {i}',
+        'description': 'Created by the benchmark harness',
+        'date_time': (datetime(year, 1, 1) + timedelta(minutes=90 * i)).isoformat(),
+        'duration': 60,
+        'status': 'Scheduled'
+    }
+
+
+# The seeded sessions start 30 days back and run a few weeks ahead.
+def seeded_time(hours: int) -> str:
+    return (datetime.now(timezone.utc) + timedelta(hours=hours)).isoformat()
+
+
+def guest(data: Dataset, i: int) -> int:
+    return data.guests[i]
+
+
+# Scenarios run in this order; the membership and account scenarios reuse the same guest for a given index.
+SCENARIOS = [
+    Scenario('auth.create_user', 201, lambda d, i: (
+        'POST', '/auth/', {'json': {'email': f'new{i}@bench.local', 'username': f'new{i}', 'password': PASSWORD}})),
+    Scenario('auth.login_for_access_token', 200, lambda d, i: (
+        'POST', '/auth/token', {'data': {'username': d.users[guest(d, i)], 'password': PASSWORD}})),
+
+    Scenario('users.get_user_profile', 200, lambda d, i: (
+        'GET', '/user/', {'headers': d.headers(group(d, i)[2])})),
+    Scenario('users.get_memberships', 200, lambda d, i: (
+        'GET', '/user/memberships', {'headers': d.headers(group(d, i)[2])})),
+    Scenario('users.get_upcoming_sessions', 200, lambda d, i: (
+        'GET', '/user/upcoming', {'headers': d.headers(group(d, i)[2])})),
+    Scenario('users.update_email', 200, lambda d, i: (
+        'PUT', '/user/email', {'headers': d.headers(guest(d, i)),
+                               'json': {'new_email': f'guest{i}@changed.local', 'password': PASSWORD}})),
+    Scenario('users.update_password', 200, lambda d, i: (
+        'PUT', '/user/password', {'headers': d.headers(guest(d, i)),
+                                  'json': {'old_password': PASSWORD, 'new_password': PASSWORD}})),
+
+    Scenario('study_groups.get_groups', 200, lambda d, i: (
+        'GET', '/study-groups/', {'params': {'limit': 20}})),
+    Scenario('study_groups.get_group_by_id', 200, lambda d, i: (
+        'GET', f'/study-groups/{group(d, i)[1]}', {})),
+    Scenario('study_groups.get_group_overview', 200, lambda d, i: (
+        'GET', f'/study-groups/{group(d, i)[1]}/overview', {'headers': d.headers(group(d, i)[2])})),
+    Scenario('study_groups.create_group', 201, lambda d, i: (
+        'POST', '/study-groups/', {'headers': d.headers(group(d, i)[2]),
+                                   'json': {'name': f'Bench group {i}', 'description': 'Harness'}})),
+    Scenario('study_groups.update_group', 200, lambda d, i: (
+        'PUT', f'/study-groups/{group(d, i)[1]}', {'headers': d.headers(group(d, i)[2]),
+                                                  'json': {'name': f'Group {group(d, i)[0]}', 'description': f'v{i}'}})),
+
+    Scenario('memberships.get_members', 200, lambda d, i: (
+        'GET', f'/study-groups/{group(d, i)[1]}/members', {'headers': d.headers(group(d, i)[2])})),
+    Scenario('memberships.join_group', 201, lambda d, i: (
+        'POST', f'/study-groups/{group(d, i)[1]}/join', {'headers': d.headers(guest(d, i))})),
+    Scenario('memberships.update_member_role', 200, lambda d, i: (
+        'PUT', f'/study-groups/{group(d, i)[1]}/member/{guest(d, i)}', {'headers': d.headers(group(d, i)[2]),
+                                                                       'json': {'role': 'Admin'}})),
+    Scenario('memberships.leave_group', 204, lambda d, i: (
+        'DELETE', f'/study-groups/{group(d, i)[1]}/leave', {'headers': d.headers(guest(d, i))})),
+
+    Scenario('subjects.get_subjects', 200, lambda d, i: (
+        'GET', f'/study-groups/{group(d, i)[1]}/subjects', {'headers': d.headers(group(d, i)[2])})),
+    Scenario('subjects.create_subject', 201, lambda d, i: (
+        'POST', f'/study-groups/{group(d, i)[1]}/subjects', {'headers': d.headers(group(d, i)[2]),
+                                                            'json': {'name': f'Bench subject {i}'}})),
+
+    Scenario('study_sessions.get_sessions_by_subject', 200, lambda d, i: (
+        'GET', '/study-groups/{0}/study_sessions/{2}'.format(*subject(d, i)), {'headers': d.headers(subject(d, i)[1])})),
+    Scenario('study_sessions.create_session', 201, lambda d, i: (
+        'POST', '/study-groups/{0}/study_sessions/{2}'.format(*subject(d, i)), {'headers': d.headers(subject(d, i)[1]),
+                                                                               'json': session_body(i)})),
+    Scenario('study_sessions.create_sessions_bulk', 201, lambda d, i: (
+        'POST', '/study-groups/{0}/study_sessions/{2}/bulk'.format(*subject(d, i)), {
+            'headers': d.headers(subject(d, i)[1]),
+            'json': {'sessions': [session_body(i * 10 + k, 2032) for k in range(10)]}})),
+    Scenario('study_sessions.update_session', 200, lambda d, i: (
+        'PUT', '/study-groups/{0}/study_sessions/{2}/'.format(*subject(d, i)) + str(d.sessions[subject(d, i)[2]]), {
+            'headers': d.headers(subject(d, i)[1]),
+            'json': {**session_body(i, 2033), 'title': f'Updated {i}', 'duration': 45}})),
+    Scenario('study_sessions.export_group_sessions', 200, lambda d, i: (
+        'GET', f'/study-groups/{group(d, i)[1]}/study_sessions/export', {'headers': d.headers(group(d, i)[2])})),
+
+    Scenario('schedule.get_conflicts', 200, lambda d, i: (
+        'GET', f'/study-groups/{group(d, i)[1]}/schedule/conflicts', {
+            'headers': d.headers(group(d, i)[2]),
+            'params': {'start': seeded_time(-7 * (i % 100)), 'duration': 60}})),
+    Scenario('schedule.get_free_slots', 200, lambda d, i: (
+        'GET', f'/study-groups/{group(d, i)[1]}/schedule/free-slots', {
+            'headers': d.headers(group(d, i)[2]),
+            'params': {'from': seeded_time(0), 'to': seeded_time(7 * 24), 'duration': 60}})),
+    Scenario('stats.get_weekly_stats', 200, lambda d, i: (
+        'GET', f'/study-groups/{group(d, i)[1]}/stats/weekly', {'headers': d.headers(group(d, i)[2])})),
+    Scenario('search.search', 200, lambda d, i: (
+        'GET', '/search/', {'headers': d.headers(group(d, i)[2]), 'params': {'q': f'Session {i % 50}'}})),
+
+    Scenario('subjects.delete_subject', 204, lambda d, i: (
+        'DELETE', '/study-groups/{0}/subjects/{1}'.format(*d.spare_subjects[i]), {
+            'headers': d.headers(dict(d.groups)[d.spare_subjects[i][0]])})),
+    Scenario('study_groups.delete_group', 204, lambda d, i: (
+        'DELETE', f'/study-groups/{d.spare_groups[i][0]}', {'headers': d.headers(d.spare_groups[i][1])})),
+    Scenario('users.delete_account', 204, lambda d, i: (
+        'DELETE', '/user/me', {'headers': d.headers(guest(d, i)), 'json': {'password': PASSWORD}})),
+]
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+async def run_scenario(client, data: Dataset, scenario: Scenario, offset: int, requests: int,
+                       concurrency: int, counter: QueryCounter) -> dict:
+    latencies, failures = [], []
+    indexes = iter(range(offset, offset + requests))
+
+    async def worker():
+        for i in indexes:
+            method, url, kwargs = scenario.build(data, i)
+            start = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != scenario.expected:
+                failures.append(f'{response.status_code} {response.text[:200]}')
+
+    queries_before = counter.count
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': requests,
+        'errors': len(failures),
+        'first_error': failures[0] if failures else None,
+        'rps': requests / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'queries_per_request': (counter.count - queries_before) / requests
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: dict) -> None:
+    print(f'{"scenario":<42} {"conc":>5} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"q/req":>6} {"err":>4}')
+    for name, levels in results.items():
+        for concurrency, r in levels.items():
+            print(f'{name:<42} {concurrency:>5} {r["rps"]:>9.1f} {r["p50_ms"]:>9.2f} {r["p95_ms"]:>9.2f} '
+                  f'{r["p99_ms"]:>9.2f} {r["queries_per_request"]:>6.1f} {r["errors"]:>4}')
+            if r['first_error']:
+                print(f'    first error: {r["first_error"]}')
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> bool:
+    regressed = False
+    print(f'\n{"scenario":<42} {"conc":>5} {"req/s Δ":>9} {"p95 Δ":>9}')
+    for name, levels in results.items():
+        for concurrency, r in levels.items():
+            base = baseline.get('results', {}).get(name, {}).get(concurrency)
+            if base is None:
+                continue
+            rps_delta = r['rps'] / base['rps'] - 1 if base['rps'] else 0.0
+            p95_delta = r['p95_ms'] / base['p95_ms'] - 1 if base['p95_ms'] else 0.0
+            flag = rps_delta < -threshold or p95_delta > threshold
+            regressed = regressed or flag
+            print(f'{name:<42} {concurrency:>5} {rps_delta:>+9.1%} {p95_delta:>+9.1%}{"  REGRESSION" if flag else ""}')
+    return regressed
+
+
+async def main(args) -> int:
+    levels = [int(level) for level in args.concurrency.split(',')]
+    scenarios = [s for s in SCENARIOS if not args.only or any(part in s.name for part in args.only.split(','))]
+    disposable = args.requests * len(levels)
+
+    await reset_schema()
+    data = await seed(
+        users=args.users,
+        groups=args.groups,
+        members_per_group=args.members,
+        subjects_per_group=args.subjects,
+        sessions_per_subject=args.sessions,
+        guests=disposable,
+        spare_groups=disposable,
+        spare_subjects=disposable
+    )
+
+    counter = QueryCounter()
+    results = {}
+    async with bench_client() as client:
+        for scenario in scenarios:
+            results[scenario.name] = {}
+            for level_index, concurrency in enumerate(levels):
+                results[scenario.name][str(concurrency)] = await run_scenario(
+                    client, data, scenario, level_index * args.requests, args.requests, concurrency, counter
+                )
+    counter.close()
+
+    print_results(results)
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'dialect': engine.dialect.name,
+            'config': vars(args)
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nwrote {args.output}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(results, json.load(f), args.threshold):
+                return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--groups', type=int, default=50)
+    parser.add_argument('--members', type=int, default=10, help='members per group')
+    parser.add_argument('--subjects', type=int, default=5, help='subjects per group')
+    parser.add_argument('--sessions', type=int, default=50, help='sessions per subject')
+    parser.add_argument('--requests', type=int, default=100, help='requests per scenario and concurrency level')
+    parser.add_argument('--concurrency', default='1,10,50')
+    parser.add_argument('--only', help='comma-separated substrings of scenario names to run')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', help='compare against a previous JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='relative change reported as a regression')
+    sys.exit(run(main(parser.parse_args())))
@@ -0,0 +1,60 @@
+"""Latency and memory of member listing pages as a group grows.
+
+Seeds one group with N members and reads the first, middle and last page of /members through the
+keyset cursor, plus a Member-only page, reporting median latency and peak traced memory per request.
+With ix_memberships_group_id_role_user_id every page should cost the same at any group size.
+
+    python -m benchmarks.member_pages --members 1000,10000,50000
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from benchmarks.common import run, reset_schema, bench_client
+from benchmarks.fast_json import seed_lists
+from core.pagination import encode_cursor
+
+
+async def measure(client, url: str, headers: dict, repeat: int) -> tuple[float, float]:
+    await client.get(url, headers=headers)
+    timings, peaks = [], []
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = await client.get(url, headers=headers)
+        timings.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        response.raise_for_status()
+    return statistics.median(timings) * 1000, statistics.median(peaks) / 1024
+
+
+async def main(sizes: list[int], limit: int, repeat: int) -> None:
+    print(f'{"members":>8}  {"page":<14}{"ms":>8}{"peak KiB":>10}')
+    for members in sizes:
+        await reset_schema()
+        data = await seed_lists(members)
+        headers = data.headers(1)
+        base = f'/study-groups/1/members?limit={limit}'
+
+        # User 1 is the Creator and everyone else a Member, so cursors can be built without paging through.
+        pages = {
+            'first': base,
+            'middle': f'{base}&cursor={encode_cursor("Member", members // 2)}',
+            'last': f'{base}&cursor={encode_cursor("Member", members - limit)}',
+            'role=Member': f'{base}&role=Member',
+        }
+
+        async with bench_client() as client:
+            for name, url in pages.items():
+                ms, kib = await measure(client, url, headers, repeat)
+                print(f'{members:>8}  {name:<14}{ms:>8.2f}{kib:>10.0f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--members', default='1000,10000,50000')
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    run(main([int(size) for size in args.members.split(',')], args.limit, args.repeat))
@@ -0,0 +1,78 @@
+"""Measure what the /metrics instrumentation costs per request.
+
+Runs the same requests with RequestMetricsMiddleware installed and removed, in alternating rounds so
+drift in the machine affects both sides equally, then times the per-request bookkeeping on its own
+and a full /metrics render.
+
+    python -m benchmarks.metrics_overhead --requests 2000 --rounds 5
+"""
+import argparse
+import statistics
+import timeit
+from starlette.middleware import Middleware
+from benchmarks.common import run, reset_schema, bench_client, register, auth, Timer
+from core.metrics import RequestMetricsMiddleware, http_requests, http_request_duration, http_requests_in_flight, registry
+from main import app
+
+ROUTES = ('/user/', '/study-groups/', '/user/memberships')
+
+
+def set_metrics_middleware(enabled: bool) -> None:
+    middleware = [m for m in app.user_middleware if m.cls is not RequestMetricsMiddleware]
+    if enabled:
+        middleware.insert(0, Middleware(RequestMetricsMiddleware))
+    app.user_middleware = middleware
+    app.middleware_stack = None
+
+
+async def drive(client, headers: dict, requests: int) -> float:
+    with Timer() as timer:
+        for i in range(requests):
+            response = await client.get(ROUTES[i % len(ROUTES)], headers=headers)
+            response.raise_for_status()
+    return requests / timer.elapsed
+
+
+def bookkeeping_cost(iterations: int) -> float:
+    def record():
+        in_flight = http_requests_in_flight.labels('GET')
+        in_flight.inc()
+        in_flight.dec()
+        http_requests.labels('GET', '/study-groups/', '200').inc()
+        http_request_duration.labels('GET', '/study-groups/').observe(0.004)
+
+    return timeit.timeit(record, number=iterations) / iterations
+
+
+async def main(requests: int, rounds: int) -> None:
+    await reset_schema()
+
+    async with bench_client() as client:
+        headers = auth(await register(client, 'bench_metrics'))
+        (await client.post('/study-groups/', headers=headers, json={'name': 'Metrics group', 'description': ''})).raise_for_status()
+
+        throughput = {True: [], False: []}
+        for _ in range(rounds):
+            for enabled in (False, True):
+                set_metrics_middleware(enabled)
+                await drive(client, headers, requests // 10)
+                throughput[enabled].append(await drive(client, headers, requests))
+        set_metrics_middleware(True)
+
+    off, on = statistics.median(throughput[False]), statistics.median(throughput[True])
+    with Timer() as render:
+        text = registry.render()
+
+    print(f'{requests} requests x {rounds} rounds over {", ".join(ROUTES)}')
+    print(f'without metrics: {off:,.0f} req/s')
+    print(f'with metrics:    {on:,.0f} req/s ({(off - on) / off:+.1%} overhead)')
+    print(f'bookkeeping:     {bookkeeping_cost(100000) * 1e6:.2f} us per request')
+    print(f'/metrics render: {render.elapsed * 1000:.2f} ms for {len(text.splitlines())} lines')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+    run(main(args.requests, args.rounds))
@@ -0,0 +1,112 @@
+"""Memory and throughput of the list queries, loading ORM entities versus projecting columns.
+
+The entity loaders are the queries get_members, get_memberships and get_subjects ran before they moved to
+core.queries: full rows hydrated into the session with a joined relationship. Each query is run against
+a fresh session and the peak traced allocation and rows per second are reported.
+
+    python -m benchmarks.projection --rows 1000,10000
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from benchmarks.common import run, reset_schema
+from benchmarks.fast_json import seed_lists
+from benchmarks.seed import insert_batched
+from core.queries import fetch_rows, group_members, group_subjects, user_memberships
+from database import SessionLocal
+from models import Membership, Subject
+from schemas.membership import MembershipResponse
+from schemas.subject import SubjectResponse
+from schemas.user import MembershipResponse as UserMembershipResponse
+
+
+async def members_entities(db):
+    members = await db.scalars(select(Membership).options(
+        joinedload(Membership.user)
+    ).where(Membership.group_id == 1))
+    return [MembershipResponse(user_id=m.user_id, username=m.user.username, role=m.role) for m in members]
+
+
+async def members_projected(db):
+    return [
+        MembershipResponse(user_id=m.user_id, username=m.username, role=m.role)
+        for m in await fetch_rows(db, group_members(1))
+    ]
+
+
+async def memberships_entities(db):
+    memberships = await db.scalars(select(Membership).options(
+        joinedload(Membership.group)
+    ).where(Membership.user_id == 1))
+    return [UserMembershipResponse(group_id=m.group_id, group_name=m.group.name, role=m.role) for m in memberships]
+
+
+async def memberships_projected(db):
+    return [
+        UserMembershipResponse(group_id=m.group_id, group_name=m.group_name, role=m.role)
+        for m in await fetch_rows(db, user_memberships(1))
+    ]
+
+
+async def subjects_entities(db):
+    subjects = (await db.scalars(select(Subject).where(Subject.group_id == 1))).all()
+    return [SubjectResponse.model_validate(s) for s in subjects]
+
+
+async def subjects_projected(db):
+    return [SubjectResponse(name=s.name, group_id=s.group_id) for s in await fetch_rows(db, group_subjects(1))]
+
+
+LOADERS = {
+    'get_members': (members_entities, members_projected),
+    'get_memberships': (memberships_entities, memberships_projected),
+    'get_subjects': (subjects_entities, subjects_projected),
+}
+
+
+async def measure(loader, repeat: int) -> tuple[float, float, int]:
+    peaks, timings = [], []
+    for _ in range(repeat):
+        async with SessionLocal() as db:
+            tracemalloc.start()
+            rows = len(await loader(db))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        async with SessionLocal() as db:
+            start = time.perf_counter()
+            await loader(db)
+            timings.append(time.perf_counter() - start)
+
+    return statistics.median(peaks) / 1024, rows / statistics.median(timings), rows
+
+
+async def main(sizes: list[int], repeat: int) -> None:
+    print(f'{"route":<18}{"rows":>7}{"entity KiB":>12}{"column KiB":>12}{"entity rows/s":>15}{"column rows/s":>15}')
+    for rows in sizes:
+        await reset_schema()
+        await seed_lists(rows)
+        async with SessionLocal() as db:
+            await insert_batched(db, Subject, (
+                {'name': f'Subject {i}', 'group_id': 1} for i in range(2, rows + 1)
+            ))
+            await db.commit()
+
+        for name, (entities, projected) in LOADERS.items():
+            async with SessionLocal() as db:
+                await entities(db)
+            entity_kib, entity_rate, count = await measure(entities, repeat)
+            column_kib, column_rate, _ = await measure(projected, repeat)
+            print(f'{name:<18}{count:>7}{entity_kib:>12.0f}{column_kib:>12.0f}'
+                  f'{entity_rate:>15,.0f}{column_rate:>15,.0f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', default='1000,10000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(main([int(size) for size in args.rows.split(',')], args.repeat))
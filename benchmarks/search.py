@@ -0,0 +1,115 @@
+"""Latency of /search as the number of sessions grows.
+
+Seeds sessions whose titles and descriptions are drawn from a generated vocabulary and times the
+query behind /search (first page of 20, ranked) against a naive scan that lowercases every
+title and description and matches it with LIKE '%word%'. On PostgreSQL the ranked query uses
+the GIN indexes on the search documents; on SQLite it reads the FTS5 tables.
+
+    python -m benchmarks.search --sessions 10000,100000
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import timedelta
+from sqlalchemy import func, or_, select, text, union_all
+from benchmarks.common import run, reset_schema
+from benchmarks.seed import insert_batched
+from core.search import SEARCH_KINDS, search_hits, search_index, visible_rows
+from database import SessionLocal, engine
+from models import User, StudyGroup, Membership, Subject, StudySession, utc_now
+
+GROUPS = 4
+PAGE = 20
+SYLLABLES = ['al', 'ge', 'bra', 'cal', 'cu', 'lus', 'geo', 'me', 'try', 'phy', 'sic', 'chem', 'is', 'bi', 'o',
+             'lo', 'gy', 'his', 'to', 'ry', 'lit', 'er', 'a', 'ture', 'vec', 'tor', 'ma', 'trix', 'in', 'te']
+# Two and three syllable words give a vocabulary of ~27,000, so a query word matches a few rows in a thousand.
+WORDS = sorted({a + b + c for a in SYLLABLES for b in SYLLABLES for c in ['', *SYLLABLES]})
+QUERIES = 20
+
+
+def phrase(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+async def seed_search(sessions: int) -> None:
+    rng = random.Random(7)
+    start = utc_now().replace(minute=0, second=0, microsecond=0)
+
+    async with SessionLocal() as db:
+        await insert_batched(db, User, [{'id': 1, 'email': 'owner@bench.local', 'username': 'owner', 'hashed_password': 'x'}])
+        await insert_batched(db, StudyGroup, (
+            {'id': g, 'name': f'Group {g} {phrase(rng, 2)}', 'description': phrase(rng, 8), 'owner_id': 1}
+            for g in range(1, GROUPS + 1)
+        ))
+        await insert_batched(db, Membership, (
+            {'user_id': 1, 'group_id': g, 'role': 'Creator'} for g in range(1, GROUPS + 1)
+        ))
+        await insert_batched(db, Subject, ({'id': g, 'name': phrase(rng, 2), 'group_id': g} for g in range(1, GROUPS + 1)))
+        await insert_batched(db, StudySession, (
+            {
+                'title': phrase(rng, 3),
+                'description': phrase(rng, 12),
+                'date_time': start + timedelta(hours=i),
+                'duration': 50,
+                'status': 'Scheduled',
+                'subject_id': i % GROUPS + 1,
+                'created_by': 1
+            }
+            for i in range(sessions)
+        ))
+        await db.commit()
+        await search_index.rebuild(db)
+
+    # Autovacuum has not seen the bulk load yet; without statistics PostgreSQL filters sessions row by row.
+    async with engine.begin() as conn:
+        await conn.execute(text('ANALYZE'))
+
+
+def indexed_query(q: str):
+    hits = search_hits(1, q)
+    return select(hits).order_by(hits.c.rank.desc(), hits.c.kind, hits.c.id).limit(PAGE)
+
+
+def naive_query(q: str):
+    columns = {'group': (StudyGroup.name, StudyGroup.description), 'subject': (Subject.name,),
+               'session': (StudySession.title, StudySession.description)}
+    selects = []
+    for kind in SEARCH_KINDS:
+        query = visible_rows(kind, 1)
+        for word in q.split():
+            query = query.where(or_(*(func.lower(column).like(f'%{word}%') for column in columns[kind])))
+        selects.append(query)
+    return select(union_all(*selects).subquery()).limit(PAGE)
+
+
+async def measure(build, queries: list[str]) -> float:
+    timings = []
+    async with SessionLocal() as db:
+        for q in queries:
+            start = time.perf_counter()
+            await db.execute(build(q))
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def main(sizes: list[int]) -> None:
+    print(f'backend: {type(search_index).__name__}')
+    print(f'{"sessions":>9}{"naive ms":>11}{"indexed ms":>12}{"speedup":>10}')
+    for sessions in sizes:
+        await reset_schema()
+        await seed_search(sessions)
+        async with SessionLocal() as db:
+            titles = (await db.scalars(select(StudySession.title).order_by(func.random()).limit(QUERIES))).all()
+        # One and two word queries taken from real titles, so every query has at least one hit.
+        queries = [' '.join(title.split()[:1 + i % 2]) for i, title in enumerate(titles)]
+        naive = await measure(naive_query, queries)
+        indexed = await measure(indexed_query, queries)
+        print(f'{sessions:>9}{naive:>11.2f}{indexed:>12.2f}{naive / indexed:>9.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', default='10000,100000')
+    args = parser.parse_args()
+    run(main([int(size) for size in args.sessions.split(',')]))
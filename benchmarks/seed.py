@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from sqlalchemy import func, insert, select
+from core.security import bcrypt_context, create_access_token
+from core.stats import rebuild_session_stats
+from core.search import search_index
+from database import SessionLocal
+from models import User, StudyGroup, Membership, Subject, StudySession
+
+
+PASSWORD = 'benchmark'
+STATUSES = ('Scheduled', 'Scheduled', 'Scheduled', 'Completed', 'Cancelled')
+
+
+class Dataset:
+    def __init__(self):
+        self.users: dict[int, str] = {}
+        self.groups: list[tuple[int, int]] = []
+        self.subjects: dict[int, list[int]] = {}
+        self.sessions: dict[int, int] = {}
+        self.guests: list[int] = []
+        self.spare_groups: list[tuple[int, int]] = []
+        self.spare_subjects: list[tuple[int, int]] = []
+        self._tokens: dict[int, str] = {}
+
+    def token(self, user_id: int) -> str:
+        if user_id not in self._tokens:
+            self._tokens[user_id] = create_access_token(self.users[user_id], user_id, timedelta(hours=6))
+        return self._tokens[user_id]
+
+    def headers(self, user_id: int) -> dict:
+        return {'Authorization': f'Bearer {self.token(user_id)}'}
+
+
+async def insert_batched(db, model, rows, batch_size: int = 5000) -> None:
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        await db.execute(insert(model), batch)
+
+
+async def seed(
+        users: int = 200,
+        groups: int = 50,
+        members_per_group: int = 10,
+        subjects_per_group: int = 5,
+        sessions_per_subject: int = 50,
+        guests: int = 0,
+        spare_groups: int = 0,
+        spare_subjects: int = 0
+    ) -> Dataset:
+
+    data = Dataset()
+    hashed_password = bcrypt_context.hash(PASSWORD)
+    now = datetime.now(timezone.utc).replace(tzinfo=None, minute=0, second=0, microsecond=0)
+
+    async with SessionLocal() as db:
+        await insert_batched(db, User, (
+            {'email': f'user{i}@bench.local', 'username': f'user{i}', 'hashed_password': hashed_password}
+            for i in range(users + guests)
+        ))
+        user_rows = (await db.execute(select(User.id, User.username).order_by(User.id))).all()
+        data.users = dict(user_rows)
+        member_ids = [row.id for row in user_rows[:users]]
+        data.guests = [row.id for row in user_rows[users:]]
+
+        await insert_batched(db, StudyGroup, (
+            {'name': f'Group {i}', 'description': 'Benchmark group', 'owner_id': member_ids[i % users]}
+            for i in range(groups + spare_groups)
+        ))
+        group_rows = (await db.execute(select(StudyGroup.id, StudyGroup.owner_id).order_by(StudyGroup.id))).all()
+        data.groups = [tuple(row) for row in group_rows[:groups]]
+        data.spare_groups = [tuple(row) for row in group_rows[groups:]]
+
+        def memberships():
+            for index, (group_id, owner_id) in enumerate(group_rows):
+                yield {'user_id': owner_id, 'group_id': group_id, 'role': 'Creator'}
+                for k in range(1, min(members_per_group, users)):
+                    yield {'user_id': member_ids[(index + k) % users], 'group_id': group_id, 'role': 'Member'}
+
+        await insert_batched(db, Membership, memberships())
+
+        await insert_batched(db, Subject, (
+            {'name': f'Subject {i}', 'group_id': group_id}
+            for group_id, _ in data.groups
+            for i in range(subjects_per_group)
+        ))
+        await insert_batched(db, Subject, (
+            {'name': f'Spare subject {i}', 'group_id': data.groups[i % groups][0]}
+            for i in range(spare_subjects)
+        ))
+        subject_rows = (await db.execute(select(Subject.id, Subject.group_id, Subject.name).order_by(Subject.id))).all()
+        for row in subject_rows:
+            if row.name.startswith('Spare'):
+                data.spare_subjects.append((row.group_id, row.id))
+            else:
+                data.subjects.setdefault(row.group_id, []).append(row.id)
+
+        owners = dict(data.groups)
+        start = now - timedelta(days=30)
+        await insert_batched(db, StudySession, (
+            {
+                'title': f'Session {i}',
+                'description': 'Benchmark session',
+                'date_time': start + timedelta(hours=7 * i + subject_id % 7),
+                'duration': 60,
+                'status': STATUSES[i % len(STATUSES)],
+                'subject_id': subject_id,
+                'created_by': owners[group_id]
+            }
+            for group_id, subject_ids in data.subjects.items()
+            for subject_id in subject_ids
+            for i in range(sessions_per_subject)
+        ))
+
+        first_sessions = await db.execute(
+            select(StudySession.subject_id, func.min(StudySession.id)).group_by(StudySession.subject_id)
+        )
+        data.sessions = dict(first_sessions.all())
+
+        await rebuild_session_stats(db)
+        await search_index.rebuild(db)
+
+    return data
@@ -0,0 +1,131 @@
+"""Peak memory of exporting a group's sessions as the group grows.
+
+Seeds one group with N sessions and requests /study-groups/{id}/study_sessions/export through the
+ASGI app directly, counting body chunks and dropping them as they arrive (httpx's ASGI transport
+would keep the whole body). Before each run the process's peak RSS is reset through
+/proc/self/clear_refs, and VmHWM is read back afterwards, so this only runs on Linux. The streamed
+export is set against a buffered one that loads every row before encoding, as the per-subject
+listing does.
+
+    python -m benchmarks.session_export --rows 100000,1000000
+"""
+import argparse
+import gc
+import time
+from datetime import timedelta
+from benchmarks.common import bench_client, register, run, reset_schema
+from benchmarks.seed import insert_batched
+from core.export import csv_batch, export_query, ndjson_batch
+from database import SessionLocal
+from main import app
+from models import StudyGroup, Membership, Subject, StudySession, utc_now
+
+SUBJECTS = 10
+
+
+def peak_rss_mib() -> float:
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    raise SystemExit('VmHWM is not available; this benchmark needs Linux.')
+
+
+def reset_peak_rss() -> float:
+    gc.collect()
+    with open('/proc/self/clear_refs', 'w') as clear_refs:
+        clear_refs.write('5')
+    return peak_rss_mib()
+
+
+async def seed_export(rows: int) -> None:
+    start = utc_now().replace(minute=0, second=0, microsecond=0)
+
+    async with SessionLocal() as db:
+        await insert_batched(db, StudyGroup, [{'id': 1, 'name': 'Export', 'description': '', 'owner_id': 1}])
+        await insert_batched(db, Membership, [{'user_id': 1, 'group_id': 1, 'role': 'Creator'}])
+        await insert_batched(db, Subject, ({'id': s, 'name': f'Subject {s}', 'group_id': 1} for s in range(1, SUBJECTS + 1)))
+        await insert_batched(db, StudySession, (
+            {
+                'title': f'Session {i}',
+                'description': 'Chapter review, past papers and a short quiz at the end.',
+                'date_time': start + timedelta(minutes=30 * i),
+                'duration': 25,
+                'status': 'Scheduled',
+                'subject_id': i % SUBJECTS + 1,
+                'created_by': 1
+            }
+            for i in range(rows)
+        ))
+        await db.commit()
+
+
+async def streamed_export(token: str, export_format: str) -> int:
+    received = 0
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal received
+        if message['type'] == 'http.response.start':
+            assert message['status'] == 200, message
+        elif message['type'] == 'http.response.body':
+            received += len(message.get('body', b''))
+
+    path = '/study-groups/1/study_sessions/export'
+    # spec_version 2.4 lets the response detect disconnects from send() instead of polling receive().
+    await app({
+        'type': 'http',
+        'asgi': {'version': '3.0', 'spec_version': '2.4'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'root_path': '',
+        'query_string': f'format={export_format}'.encode(),
+        'headers': [(b'host', b'bench'), (b'authorization', f'Bearer {token}'.encode())],
+        'client': ('127.0.0.1', 50000),
+        'server': ('bench', 80)
+    }, receive, send)
+    return received
+
+
+async def buffered_export(token: str, export_format: str) -> int:
+    async with SessionLocal() as db:
+        rows = (await db.execute(export_query(1))).all()
+    body = ndjson_batch(rows) if export_format == 'ndjson' else csv_batch(rows).encode()
+    return len(body)
+
+
+async def measure(export, token: str, export_format: str) -> tuple[float, float, int]:
+    baseline = reset_peak_rss()
+    start = time.perf_counter()
+    size = await export(token, export_format)
+    elapsed = time.perf_counter() - start
+    return elapsed, peak_rss_mib() - baseline, size
+
+
+async def main(sizes: list[int], export_format: str, buffered: bool) -> None:
+    print(f'format: {export_format}')
+    print(f'{"rows":>9}{"mode":>10}{"MiB out":>10}{"seconds":>9}{"rows/s":>10}{"peak RSS +MiB":>15}')
+    for rows in sizes:
+        await reset_schema()
+        async with bench_client() as client:
+            token = await register(client, 'exporter')
+            await seed_export(rows)
+
+            modes = [('streamed', streamed_export)] + ([('buffered', buffered_export)] if buffered else [])
+            for mode, export in modes:
+                elapsed, peak, size = await measure(export, token, export_format)
+                print(f'{rows:>9}{mode:>10}{size / 2 ** 20:>10.1f}{elapsed:>9.2f}{rows / elapsed:>10.0f}{peak:>15.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', default='100000,1000000')
+    parser.add_argument('--format', default='ndjson', choices=['ndjson', 'csv'])
+    parser.add_argument('--no-buffered', action='store_true', help='Skip the buffered comparison.')
+    args = parser.parse_args()
+    run(main([int(size) for size in args.rows.split(',')], args.format, not args.no_buffered))
@@ -0,0 +1,102 @@
+"""Cost of one session overlap check as a group's schedule grows.
+
+Seeds several groups with N back-to-back sessions each and times find_conflicts for random
+hour-long windows, against a naive check that loads every session in the group and compares
+them in Python. On PostgreSQL the indexed check is a GiST range query; on SQLite it is the
+per-group interval tree, and "first ms" is the one-off cost of building it.
+
+    python -m benchmarks.session_overlaps --sessions 1000,10000,100000
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import timedelta
+from benchmarks.common import run, reset_schema
+from benchmarks.seed import insert_batched
+from core.schedule import Interval, busy_query, find_conflicts, schedule_index, session_end, to_interval
+from database import SessionLocal
+from models import User, StudyGroup, Subject, StudySession, utc_now
+
+GROUPS = 4
+
+
+async def seed_schedule(sessions: int) -> None:
+    start = utc_now().replace(minute=0, second=0, microsecond=0)
+
+    async with SessionLocal() as db:
+        await insert_batched(db, User, [{'id': 1, 'email': 'owner@bench.local', 'username': 'owner', 'hashed_password': 'x'}])
+        await insert_batched(db, StudyGroup, (
+            {'id': g, 'name': f'Group {g}', 'description': '', 'owner_id': 1} for g in range(1, GROUPS + 1)
+        ))
+        await insert_batched(db, Subject, ({'id': g, 'name': 'Subject', 'group_id': g} for g in range(1, GROUPS + 1)))
+        await insert_batched(db, StudySession, (
+            {
+                'title': f'Session {i}',
+                'description': '',
+                'date_time': start + timedelta(hours=i),
+                'duration': 50,
+                'status': 'Scheduled',
+                'subject_id': g,
+                'created_by': 1
+            }
+            for g in range(1, GROUPS + 1)
+            for i in range(sessions)
+        ))
+        await db.commit()
+
+
+async def naive_conflicts(db, group_id: int, candidate: Interval) -> list[Interval]:
+    rows = (await db.execute(busy_query(group_id))).all()
+    return [i for i in map(to_interval, rows) if i.start < candidate.end and i.end > candidate.start]
+
+
+async def indexed_conflicts(db, group_id: int, candidate: Interval) -> list[Interval]:
+    [conflicts] = await find_conflicts(db, group_id, [candidate])
+    return conflicts
+
+
+def windows(sessions: int, checks: int) -> list[Interval]:
+    start = utc_now().replace(minute=0, second=0, microsecond=0)
+    offsets = [random.randrange((sessions - 1) * 60) for _ in range(checks)]
+    return [Interval(start + timedelta(minutes=m), session_end(start + timedelta(minutes=m), 60), None, None, '')
+            for m in offsets]
+
+
+async def measure(check, candidates: list[Interval]) -> float:
+    timings = []
+    async with SessionLocal() as db:
+        for i, candidate in enumerate(candidates):
+            group_id = i % GROUPS + 1
+            start = time.perf_counter()
+            assert await check(db, group_id, candidate)
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+async def main(sizes: list[int], checks: int) -> None:
+    print(f'backend: {schedule_index.stats()["backend"]}')
+    print(f'{"sessions":>9}{"naive ms":>11}{"indexed ms":>12}{"speedup":>10}{"first ms":>10}')
+    for sessions in sizes:
+        await reset_schema()
+        await seed_schedule(sessions)
+        schedule_index.clear()
+        candidates = windows(sessions, checks)
+
+        build_start = time.perf_counter()
+        async with SessionLocal() as db:
+            for group_id in range(1, GROUPS + 1):
+                await schedule_index.busy(db, group_id, candidates[0].start, candidates[0].end)
+        build = (time.perf_counter() - build_start) * 1000 / GROUPS
+
+        naive = await measure(naive_conflicts, candidates[:max(1, checks // 10)])
+        indexed = await measure(indexed_conflicts, candidates)
+        print(f'{sessions:>9}{naive:>11.2f}{indexed:>12.3f}{naive / indexed:>9.0f}x{build:>10.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sessions', default='1000,10000,100000')
+    parser.add_argument('--checks', type=int, default=200)
+    args = parser.parse_args()
+    run(main([int(size) for size in args.sessions.split(',')], args.checks))
@@ -0,0 +1,117 @@
+"""Upcoming sessions for a user in many groups: /user/upcoming against a per-group fan-out.
+
+The fan-out is what a client had to do before the feed existed: list memberships, then fetch each
+group's overview and merge the upcoming sessions locally.
+
+    python -m benchmarks.upcoming_feed --groups 150
+"""
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from benchmarks.common import run, reset_schema, bench_client, QueryCounter, Timer
+from benchmarks.seed import Dataset, insert_batched
+from database import SessionLocal
+from models import User, StudyGroup, Membership, Subject, StudySession, utc_now
+
+
+async def seed_feed(groups: int, other_groups: int, subjects: int, sessions: int) -> Dataset:
+    data = Dataset()
+    data.users = {1: 'feed_user', 2: 'feed_owner'}
+    total_groups = groups + other_groups
+    now = utc_now()
+
+    async with SessionLocal() as db:
+        await insert_batched(db, User, (
+            {'id': user_id, 'email': f'{name}@bench.local', 'username': name, 'hashed_password': 'x'}
+            for user_id, name in data.users.items()
+        ))
+        await insert_batched(db, StudyGroup, (
+            {'id': g, 'name': f'Feed group {g}', 'description': '', 'owner_id': 2, 'created_at': now}
+            for g in range(1, total_groups + 1)
+        ))
+        await insert_batched(db, Membership, (
+            {'user_id': 1, 'group_id': g, 'role': 'Member'} for g in range(1, groups + 1)
+        ))
+        await insert_batched(db, Subject, (
+            {'id': (g - 1) * subjects + s + 1, 'name': f'Subject {s}', 'group_id': g}
+            for g in range(1, total_groups + 1)
+            for s in range(subjects)
+        ))
+
+        # Half of each subject's sessions are in the past, so the date_time filter has work to do.
+        start = now - timedelta(days=sessions // 2)
+        await insert_batched(db, StudySession, (
+            {
+                'title': f'Session {i}',
+                'description': '',
+                'date_time': start + timedelta(days=i, minutes=subject_id % 1440),
+                'duration': 60,
+                'status': 'Cancelled' if i % 7 == 0 else 'Scheduled',
+                'subject_id': subject_id,
+                'created_by': 2
+            }
+            for subject_id in range(1, total_groups * subjects + 1)
+            for i in range(sessions)
+        ))
+        await db.commit()
+
+    return data
+
+
+async def feed(client, headers: dict, limit: int) -> list:
+    response = await client.get('/user/upcoming', headers=headers, params={'limit': limit})
+    response.raise_for_status()
+    return response.json()['items']
+
+
+async def fan_out(client, headers: dict, limit: int) -> list:
+    memberships = (await client.get('/user/memberships', headers=headers)).json()
+    upcoming = []
+    for membership in memberships:
+        response = await client.get(f"/study-groups/{membership['group_id']}/overview",
+                                    headers=headers, params={'upcoming': limit})
+        response.raise_for_status()
+        upcoming.extend(response.json()['upcoming_sessions'])
+    return sorted(upcoming, key=lambda s: (s['date_time'], s['session_id']))[:limit]
+
+
+async def measure(strategy, client, headers: dict, limit: int, repeat: int, counter: QueryCounter) -> tuple:
+    timings = []
+    counter.count = 0
+    for _ in range(repeat):
+        with Timer() as timer:
+            items = await strategy(client, headers, limit)
+        timings.append(timer.elapsed)
+    return items, statistics.median(timings), counter.count / repeat
+
+
+async def main(groups: int, other_groups: int, subjects: int, sessions: int, limit: int, repeat: int) -> None:
+    await reset_schema()
+    data = await seed_feed(groups, other_groups, subjects, sessions)
+    headers = data.headers(1)
+
+    counter = QueryCounter()
+    async with bench_client() as client:
+        feed_items, feed_time, feed_queries = await measure(feed, client, headers, limit, repeat, counter)
+        fan_items, fan_time, fan_queries = await measure(fan_out, client, headers, limit, repeat, counter)
+    counter.close()
+
+    assert [s['session_id'] for s in feed_items] == [s['session_id'] for s in fan_items]
+
+    print(f'user in {groups} groups ({other_groups} others), {subjects} subjects/group, '
+          f'{sessions} sessions/subject, next {limit}')
+    print(f'/user/upcoming: {feed_time * 1000:8.2f} ms  {feed_queries:6.1f} queries')
+    print(f'fan-out:        {fan_time * 1000:8.2f} ms  {fan_queries:6.1f} queries')
+    print(f'speedup:        {fan_time / feed_time:8.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--groups', type=int, default=150)
+    parser.add_argument('--other-groups', type=int, default=150)
+    parser.add_argument('--subjects', type=int, default=3)
+    parser.add_argument('--sessions', type=int, default=60)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    run(main(args.groups, args.other_groups, args.subjects, args.sessions, args.limit, args.repeat))
@@ -0,0 +1,34 @@
+import hashlib
+from fastapi import Request, Response
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+
+def make_etag(*parts) -> str:
+    return 'W/"' + hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest() + '"'
+
+
+# '*' only matches a resource that exists, so it must never turn a 404 into a 304.
+def etag_matches(if_none_match: str | None, etag: str, exists: bool = True) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+    return (exists and '*' in candidates) or etag in candidates or etag.removeprefix('W/') in candidates
+
+
+def check_etag(request: Request, response: Response, *parts, exists: bool = True) -> Response | None:
+    etag = make_etag(*parts, request.url.path, request.url.query)
+
+    if etag_matches(request.headers.get('if-none-match'), etag, exists):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    response.headers['ETag'] = etag
+    return None
+
+
+async def check_not_modified(db: AsyncSession, request: Request, response: Response, version: Select) -> Response | None:
+    # The version query is an aggregate led by count(), such as count() and max(updated_at); the rows themselves
+    # are never loaded. A zero count means there is nothing for '*' to match.
+    version = tuple((await db.execute(version)).one())
+    return check_etag(request, response, version, exists=version[0] > 0)
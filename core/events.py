@@ -0,0 +1,211 @@
+import asyncio
+import asyncpg
+import json
+import logging
+import os
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.engine import make_url
+from core.metrics import Callback, registry
+from models import utc_now
+
+
+logger = logging.getLogger(__name__)
+
+EVENTS_BACKEND = os.getenv('EVENTS_BACKEND', 'local')
+EVENTS_URL = os.getenv('EVENTS_URL', os.getenv('URL'))
+EVENTS_QUEUE_SIZE = int(os.getenv('EVENTS_QUEUE_SIZE', 100))
+EVENTS_HEARTBEAT = float(os.getenv('EVENTS_HEARTBEAT', 15))
+EVENTS_STREAM_TIMEOUT = float(os.getenv('EVENTS_STREAM_TIMEOUT', 300))
+
+CLOSING_EVENTS = ('group.deleted',)
+
+# pg_notify rejects payloads of 8000 bytes or more.
+NOTIFY_PAYLOAD_LIMIT = 7999
+
+
+class Subscription:
+    def __init__(self, group_id: int, user_id: int, queue_size: int):
+        self.group_id = group_id
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.evicted = False
+
+    def close(self) -> None:
+        # None tells the stream to end; a full backlog is dropped so that it always fits.
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class EventHub:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.subscriptions: dict[int, set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.evicted = 0
+
+    def subscribe(self, group_id: int, user_id: int) -> Subscription:
+        subscription = Subscription(group_id, user_id, self.queue_size)
+        self.subscriptions.setdefault(group_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self.subscriptions.get(subscription.group_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.group_id]
+
+    def dispatch(self, event: dict) -> None:
+        self.published += 1
+        group_id = event['group_id']
+
+        for subscription in list(self.subscriptions.get(group_id, ())):
+            try:
+                subscription.queue.put_nowait(event)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                # A consumer that cannot keep up is dropped rather than allowed to hold events in memory.
+                subscription.evicted = True
+                subscription.close()
+                self.unsubscribe(subscription)
+                self.evicted += 1
+
+        if event['type'] in CLOSING_EVENTS:
+            for subscription in list(self.subscriptions.get(group_id, ())):
+                subscription.close()
+                self.unsubscribe(subscription)
+
+    def close(self) -> None:
+        for subscriptions in list(self.subscriptions.values()):
+            for subscription in list(subscriptions):
+                subscription.close()
+        self.subscriptions.clear()
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self.subscriptions.values())
+
+    def stats(self) -> dict:
+        return {
+            'groups': len(self.subscriptions),
+            'subscribers': self.subscriber_count(),
+            'published': self.published,
+            'delivered': self.delivered,
+            'evicted': self.evicted,
+            'queue_size': self.queue_size
+        }
+
+
+def make_event(group_id: int, event_type: str, data: dict) -> dict:
+    return jsonable_encoder({'type': event_type, 'group_id': group_id, 'at': utc_now(), 'data': data})
+
+
+def notify_payload(event: dict) -> str:
+    # An event too large to NOTIFY goes out without its data; 'truncated' tells clients to refetch.
+    payload = json.dumps(event)
+    if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+        payload = json.dumps({**event, 'data': {}, 'truncated': True})
+    return payload
+
+
+class LocalEventBus:
+    def __init__(self, queue_size: int):
+        self.hub = EventHub(queue_size)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        self.hub.close()
+
+    async def publish(self, group_id: int, event_type: str, data: dict) -> None:
+        self.hub.dispatch(make_event(group_id, event_type, data))
+
+    def subscribe(self, group_id: int, user_id: int) -> Subscription:
+        return self.hub.subscribe(group_id, user_id)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self.hub.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        return {'backend': 'local', **self.hub.stats()}
+
+
+class PostgresEventBus(LocalEventBus):
+    def __init__(self, url: str, queue_size: int, channel: str = 'studyhub_events'):
+        super().__init__(queue_size)
+        self.dsn = make_url(url).set(drivername='postgresql').render_as_string(hide_password=False)
+        self.channel = channel
+        self.listener = None
+        self.pool = None
+        self.publish_errors = 0
+
+    async def start(self) -> None:
+        self.pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=4)
+        await self._listen()
+
+    async def _listen(self) -> None:
+        self.listener = await asyncpg.connect(self.dsn)
+        self.listener.add_termination_listener(self._on_terminated)
+        await self.listener.add_listener(self.channel, self._on_notify)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self.hub.dispatch(json.loads(payload))
+        except (ValueError, KeyError):
+            logger.warning('Ignoring malformed event payload on %s', channel)
+
+    def _on_terminated(self, connection) -> None:
+        if self.pool is not None:
+            logger.error('Event listener connection lost, reconnecting')
+            asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self, delay: float = 1) -> None:
+        while self.pool is not None:
+            try:
+                await self._listen()
+                return
+            except (OSError, asyncpg.PostgresError):
+                logger.warning('Event listener reconnect failed, retrying in %.0fs', delay, exc_info=True)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    async def stop(self) -> None:
+        pool, self.pool = self.pool, None
+        if self.listener is not None:
+            await self.listener.close()
+        if pool is not None:
+            await pool.close()
+        await super().stop()
+
+    # Every worker, including this one, receives the event back through its LISTEN connection.
+    async def publish(self, group_id: int, event_type: str, data: dict) -> None:
+        payload = notify_payload(make_event(group_id, event_type, data))
+        try:
+            await self.pool.execute('SELECT pg_notify($1, $2)', self.channel, payload)
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+            self.publish_errors += 1
+            logger.error('Publishing %s for group %s failed', event_type, group_id, exc_info=True)
+
+    def stats(self) -> dict:
+        return {'backend': 'postgres', 'publish_errors': self.publish_errors, **self.hub.stats()}
+
+
+def create_event_bus():
+    if EVENTS_BACKEND == 'postgres':
+        return PostgresEventBus(EVENTS_URL, EVENTS_QUEUE_SIZE)
+    if EVENTS_BACKEND != 'local':
+        raise ValueError(f'Unknown events backend: {EVENTS_BACKEND!r}')
+    return LocalEventBus(EVENTS_QUEUE_SIZE)
+
+
+event_bus = create_event_bus()
+
+registry.add('studyhub_event_subscribers', 'Open group event streams.', 'gauge',
+             Callback(event_bus.hub.subscriber_count))
+registry.add('studyhub_events_published_total', 'Group events dispatched to this worker.', 'counter',
+             Callback(lambda: event_bus.hub.published))
+registry.add('studyhub_event_subscribers_evicted_total', 'Event streams dropped for falling behind.', 'counter',
+             Callback(lambda: event_bus.hub.evicted))
@@ -0,0 +1,71 @@
+import csv
+import io
+import os
+from datetime import datetime
+import orjson
+from sqlalchemy import select
+from database import SessionLocal
+from models import StudySession, Subject
+
+
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 2000))
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def export_query(group_id: int, date_from: datetime | None = None, date_to: datetime | None = None,
+                 session_status: str | None = None):
+    query = select(
+        StudySession.id,
+        StudySession.subject_id,
+        Subject.name.label('subject'),
+        StudySession.title,
+        StudySession.description,
+        StudySession.date_time,
+        StudySession.duration,
+        StudySession.status,
+        StudySession.created_by
+    ).join(Subject, Subject.id == StudySession.subject_id).where(
+        Subject.group_id == group_id
+    ).order_by(StudySession.date_time, StudySession.id)
+
+    if date_from:
+        query = query.where(StudySession.date_time >= date_from)
+    if date_to:
+        query = query.where(StudySession.date_time < date_to)
+    if session_status:
+        query = query.where(StudySession.status == session_status)
+    return query
+
+
+# The request's own session is closed before a streaming body is sent, so the export opens its own.
+# stream() reads through a server-side cursor on PostgreSQL, and yield_per caps the rows held at once.
+async def stream_batches(query):
+    async with SessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield rows
+
+
+def ndjson_batch(rows) -> bytes:
+    return b''.join(orjson.dumps(row._asdict(), option=orjson.OPT_APPEND_NEWLINE) for row in rows)
+
+
+def csv_batch(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [value.isoformat() if isinstance(value, datetime) else value for value in row] for row in rows
+    )
+    return buffer.getvalue()
+
+
+async def export_sessions(query, export_format: str):
+    if export_format == 'csv':
+        yield csv_batch([query.selected_columns.keys()])
+
+    encode = ndjson_batch if export_format == 'ndjson' else csv_batch
+    async for rows in stream_batches(query):
+        yield encode(rows)
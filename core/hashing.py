@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException
+from starlette import status
+from core.security import bcrypt_context
+from core.metrics import Callback, registry
+
+
+HASH_POOL = os.getenv('HASH_POOL', 'thread')
+HASH_WORKERS = int(os.getenv('HASH_WORKERS', min(4, os.cpu_count() or 1)))
+HASH_MAX_PENDING = int(os.getenv('HASH_MAX_PENDING', 64))
+
+hash_duration = registry.histogram(
+    'studyhub_password_hash_duration_seconds', 'Time spent inside bcrypt, by operation.', ('operation',),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+)
+
+
+def _hash(password: str) -> str:
+    return bcrypt_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return bcrypt_context.verify(password, hashed_password)
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class PasswordHasher:
+    def __init__(self, pool: str = 'thread', workers: int = 4, max_pending: int = 64):
+        if pool not in ('thread', 'process'):
+            raise ValueError(f'Unknown hash pool type: {pool!r}')
+        self.pool = pool
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.pool == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='bcrypt')
+        return self._executor
+
+    async def _run(self, operation: str, func, *args):
+        # Jobs running or queued on the pool are capped; past that we shed load instead of queueing.
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail='Server is busy, please try again shortly.',
+                headers={'Retry-After': '1'}
+            )
+
+        self.pending += 1
+        try:
+            result, duration = await asyncio.get_running_loop().run_in_executor(self.executor, _timed, func, *args)
+        finally:
+            self.pending -= 1
+
+        hash_duration.labels(operation).observe(duration)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run('hash', _hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run('verify', _verify, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(HASH_POOL, HASH_WORKERS, HASH_MAX_PENDING)
+registry.add('studyhub_password_hash_pending', 'Hash and verify jobs running or queued.', 'gauge',
+             Callback(lambda: password_hasher.pending))
@@ -0,0 +1,157 @@
+import itertools
+import logging
+import os
+from core.cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+MEMBERSHIP_CACHE_URL = os.getenv('MEMBERSHIP_CACHE_URL')
+MEMBERSHIP_CACHE_TTL = float(os.getenv('MEMBERSHIP_CACHE_TTL', 30))
+MEMBERSHIP_CACHE_SIZE = int(os.getenv('MEMBERSHIP_CACHE_SIZE', 10000))
+
+
+# A miss takes a generation before reading the database, and set() only stores the role while that
+# generation is current. Invalidation drops it, so a read that raced a membership change is not cached.
+class LocalMembershipCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize, ttl)
+        self.generations = TTLCache(maxsize, ttl)
+        self.clock = itertools.count(1)
+
+    async def get(self, user_id: int, group_id: int) -> str | None:
+        return self.cache.get((user_id, group_id))
+
+    async def generation(self, user_id: int, group_id: int) -> int | None:
+        key = (user_id, group_id)
+        generation = self.generations.get(key)
+        if generation is None:
+            generation = next(self.clock)
+            self.generations.set(key, generation)
+        return generation
+
+    async def set(self, user_id: int, group_id: int, role: str, generation: int | None) -> None:
+        key = (user_id, group_id)
+        if generation is not None and self.generations.get(key) == generation:
+            self.cache.set(key, role)
+
+    async def invalidate(self, user_id: int, group_id: int) -> None:
+        self.cache.pop((user_id, group_id))
+        self.generations.pop((user_id, group_id))
+
+    async def invalidate_group(self, group_id: int) -> None:
+        self.cache.discard_where(lambda key: key[1] == group_id)
+        self.generations.discard_where(lambda key: key[1] == group_id)
+
+    async def invalidate_user(self, user_id: int) -> None:
+        self.cache.discard_where(lambda key: key[0] == user_id)
+        self.generations.discard_where(lambda key: key[0] == user_id)
+
+    def stats(self) -> dict:
+        return {'backend': 'local', **self.cache.stats()}
+
+
+class RedisMembershipCache:
+    GENERATION_SCRIPT = '''
+local generation = redis.call('GET', KEYS[1])
+if not generation then
+    generation = tostring(redis.call('INCR', KEYS[2]))
+    redis.call('SET', KEYS[1], generation, 'PX', ARGV[1])
+end
+return generation
+'''
+    SET_SCRIPT = '''
+if redis.call('GET', KEYS[2]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+end
+return 0
+'''
+
+    def __init__(self, url: str, ttl: float, prefix: str = 'studyhub:membership'):
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError('MEMBERSHIP_CACHE_URL requires the "redis" package to be installed.')
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.errors = redis.RedisError
+        self.generation_script = self.client.register_script(self.GENERATION_SCRIPT)
+        self.set_script = self.client.register_script(self.SET_SCRIPT)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, user_id, group_id) -> str:
+        return f'{self.prefix}:{group_id}:{user_id}'
+
+    def _generation_key(self, user_id, group_id) -> str:
+        return f'{self.prefix}-generation:{group_id}:{user_id}'
+
+    # Invalidation runs after the write has committed; a failure leaves the entry to expire via TTL.
+    async def _delete_matching(self, pattern: str) -> None:
+        try:
+            if '*' not in pattern:
+                await self.client.delete(pattern)
+                return
+
+            keys = [key async for key in self.client.scan_iter(match=pattern, count=500)]
+            if keys:
+                await self.client.delete(*keys)
+        except self.errors:
+            logger.error('Membership cache invalidation failed for %s', pattern, exc_info=True)
+
+    # A cache outage must never lock users out, so read failures fall back to the database.
+    async def get(self, user_id: int, group_id: int) -> str | None:
+        if self.ttl <= 0:
+            return None
+        try:
+            return await self.client.get(self._key(user_id, group_id))
+        except self.errors:
+            logger.warning('Membership cache read failed', exc_info=True)
+            return None
+
+    async def generation(self, user_id: int, group_id: int) -> str | None:
+        if self.ttl <= 0:
+            return None
+        try:
+            return await self.generation_script(
+                keys=[self._generation_key(user_id, group_id), f'{self.prefix}-generation:clock'],
+                args=[int(self.ttl * 1000)]
+            )
+        except self.errors:
+            logger.warning('Membership cache read failed', exc_info=True)
+            return None
+
+    async def set(self, user_id: int, group_id: int, role: str, generation: str | None) -> None:
+        if self.ttl <= 0 or generation is None:
+            return
+        try:
+            await self.set_script(
+                keys=[self._key(user_id, group_id), self._generation_key(user_id, group_id)],
+                args=[generation, role, int(self.ttl * 1000)]
+            )
+        except self.errors:
+            logger.warning('Membership cache write failed', exc_info=True)
+
+    async def invalidate(self, user_id: int, group_id: int) -> None:
+        await self._delete_matching(self._key(user_id, group_id))
+        await self._delete_matching(self._generation_key(user_id, group_id))
+
+    async def invalidate_group(self, group_id: int) -> None:
+        await self._delete_matching(self._key('*', group_id))
+        await self._delete_matching(self._generation_key('*', group_id))
+
+    async def invalidate_user(self, user_id: int) -> None:
+        await self._delete_matching(self._key(user_id, '*'))
+        await self._delete_matching(self._generation_key(user_id, '*'))
+
+    def stats(self) -> dict:
+        return {'backend': 'redis', 'ttl': self.ttl}
+
+
+def create_membership_cache():
+    if MEMBERSHIP_CACHE_URL:
+        return RedisMembershipCache(MEMBERSHIP_CACHE_URL, MEMBERSHIP_CACHE_TTL)
+    return LocalMembershipCache(MEMBERSHIP_CACHE_SIZE, MEMBERSHIP_CACHE_TTL)
+
+
+membership_cache = create_membership_cache()
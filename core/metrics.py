@@ -0,0 +1,188 @@
+import time
+from bisect import bisect_left
+
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+# Metrics are only updated from the event loop thread, so plain attribute updates need no locks.
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class Gauge(Counter):
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+
+class Callback:
+    def __init__(self, func):
+        self.func = func
+
+    @property
+    def value(self):
+        return self.func()
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets['+Inf'] = self.count
+
+        return {
+            'buckets': buckets,
+            'sum': self.sum,
+            'count': self.count
+        }
+
+
+class MetricFamily:
+    def __init__(self, name: str, documentation: str, kind: str, factory, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.factory = factory
+        self.labelnames = labelnames
+        self.children = {}
+
+    def labels(self, *values: str):
+        child = self.children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f'{self.name} expects labels {self.labelnames}')
+            child = self.children.setdefault(values, self.factory())
+        return child
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+
+        for values, child in list(self.children.items()):
+            labels = dict(zip(self.labelnames, values))
+            if isinstance(child, Histogram):
+                cumulative = 0
+                for bound, count in zip(child.buckets, child.counts):
+                    cumulative += count
+                    lines.append(f'{self.name}_bucket{format_labels(labels, le=str(bound))} {cumulative}')
+                lines.append(f'{self.name}_bucket{format_labels(labels, le="+Inf")} {child.count}')
+                lines.append(f'{self.name}_sum{format_labels(labels)} {child.sum}')
+                lines.append(f'{self.name}_count{format_labels(labels)} {child.count}')
+            else:
+                lines.append(f'{self.name}{format_labels(labels)} {child.value}')
+        return lines
+
+
+def escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels: dict, **extra: str) -> str:
+    labels = {**labels, **extra}
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in labels.items()) + '}'
+
+
+class Registry:
+    def __init__(self):
+        self.families: dict[str, MetricFamily] = {}
+
+    def register(self, family: MetricFamily) -> MetricFamily:
+        if family.name in self.families:
+            raise ValueError(f'Metric {family.name!r} is already registered')
+        self.families[family.name] = family
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> MetricFamily:
+        return self.register(MetricFamily(name, documentation, 'counter', Counter, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> MetricFamily:
+        return self.register(MetricFamily(name, documentation, 'gauge', Gauge, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                  buckets: tuple[float, ...] = LATENCY_BUCKETS) -> MetricFamily:
+        return self.register(MetricFamily(name, documentation, 'histogram', lambda: Histogram(buckets), labelnames))
+
+    def add(self, name: str, documentation: str, kind: str, metric) -> None:
+        family = self.register(MetricFamily(name, documentation, kind, None))
+        family.children[()] = metric
+
+    def render(self) -> str:
+        lines = []
+        for family in self.families.values():
+            lines.extend(family.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    'studyhub_http_requests_total', 'HTTP requests by route and status code.', ('method', 'route', 'status')
+)
+http_request_duration = registry.histogram(
+    'studyhub_http_request_duration_seconds', 'HTTP request latency by route.', ('method', 'route')
+)
+http_requests_in_flight = registry.gauge(
+    'studyhub_http_requests_in_flight', 'HTTP requests currently being served.', ('method',)
+)
+
+
+HTTP_METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'CONNECT', 'TRACE'))
+
+
+def route_template(scope) -> str:
+    route = scope.get('route')
+    return route.path if route is not None else '<unmatched>'
+
+
+# The method is whatever token the client sends; folding unknown ones into OTHER keeps label sets bounded.
+def method_label(scope) -> str:
+    return scope['method'] if scope['method'] in HTTP_METHODS else 'OTHER'
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = method_label(scope)
+        in_flight = http_requests_in_flight.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = route_template(scope)
+            http_requests.labels(method, route, str(status_code)).inc()
+            http_request_duration.labels(method, route).observe(time.perf_counter() - start)
@@ -0,0 +1,37 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from fastapi import HTTPException
+from starlette import status
+
+
+def encode_cursor(*values) -> str:
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, *types) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError(cursor)
+
+        values = tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, payload)
+        )
+        # Cursors are issued with the naive UTC values stored in the database; an offset means it was edited.
+        if any(isinstance(value, datetime) and value.tzinfo is not None for value in values):
+            raise ValueError(cursor)
+        return values
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor.')
+
+
+def like_prefix(prefix: str) -> str:
+    escaped = prefix.replace('/', '//').replace('%', '/%').replace('_', '/_')
+    return f'{escaped}%'
@@ -0,0 +1,90 @@
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from core.metrics import Callback, Histogram, registry
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connections_opened = 0
+        self.invalidations = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait = Histogram()
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_stats.checkout_timeouts += 1
+            raise
+        finally:
+            pool_stats.checkout_wait.observe(time.perf_counter() - start)
+
+
+def instrument_pool(engine) -> None:
+    register_pool_metrics(engine.pool)
+
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        pool_stats.connections_opened += 1
+
+    @event.listens_for(engine, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_stats.checkouts += 1
+
+    @event.listens_for(engine, 'checkin')
+    def on_checkin(dbapi_connection, connection_record):
+        pool_stats.checkins += 1
+
+    @event.listens_for(engine, 'invalidate')
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_stats.invalidations += 1
+
+
+def register_pool_metrics(pool) -> None:
+    registry.add('studyhub_db_pool_checkouts_total', 'Connections checked out of the pool.', 'counter',
+                 Callback(lambda: pool_stats.checkouts))
+    registry.add('studyhub_db_pool_connections_opened_total', 'New database connections opened.', 'counter',
+                 Callback(lambda: pool_stats.connections_opened))
+    registry.add('studyhub_db_pool_invalidations_total', 'Pooled connections invalidated.', 'counter',
+                 Callback(lambda: pool_stats.invalidations))
+    registry.add('studyhub_db_pool_checkout_timeouts_total', 'Pool checkouts that timed out.', 'counter',
+                 Callback(lambda: pool_stats.checkout_timeouts))
+    registry.add('studyhub_db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled connection.',
+                 'histogram', pool_stats.checkout_wait)
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        registry.add('studyhub_db_pool_checked_out', 'Connections currently checked out.', 'gauge',
+                     Callback(pool.checkedout))
+        registry.add('studyhub_db_pool_overflow', 'Overflow connections currently open.', 'gauge',
+                     Callback(lambda: max(pool.overflow(), 0)))
+
+
+def pool_snapshot(pool) -> dict:
+    snapshot = {
+        'pool_class': type(pool).__name__,
+        'checkouts': pool_stats.checkouts,
+        'checkins': pool_stats.checkins,
+        'connections_opened': pool_stats.connections_opened,
+        'invalidations': pool_stats.invalidations,
+        'checkout_timeouts': pool_stats.checkout_timeouts,
+        'checkout_wait_seconds': pool_stats.checkout_wait.snapshot()
+    }
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        snapshot.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            timeout=pool.timeout()
+        )
+    return snapshot
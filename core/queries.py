@@ -0,0 +1,31 @@
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Membership, StudyGroup, Subject, User
+
+
+# Plain column selects: rows come back as tuples, nothing is added to the session's identity map.
+def group_members(group_id: int) -> Select:
+    return select(
+        Membership.user_id,
+        User.username,
+        Membership.role
+    ).join(User, User.id == Membership.user_id).where(Membership.group_id == group_id)
+
+
+def user_memberships(user_id: int) -> Select:
+    return select(
+        Membership.group_id,
+        StudyGroup.name.label('group_name'),
+        Membership.role
+    ).join(StudyGroup, StudyGroup.id == Membership.group_id).where(Membership.user_id == user_id)
+
+
+def group_subjects(group_id: int) -> Select:
+    return select(
+        Subject.name,
+        Subject.group_id
+    ).where(Subject.group_id == group_id)
+
+
+async def fetch_rows(db: AsyncSession, query: Select) -> list:
+    return (await db.execute(query)).all()
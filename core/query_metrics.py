@@ -0,0 +1,112 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from core.metrics import Histogram, method_label, route_template
+
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 0))
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+class RequestQueryStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, duration: float) -> None:
+        self.queries += 1
+        self.db_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries", '
+            f'app;dur={total * 1000:.2f}'
+        )
+
+
+class RouteQueryStats:
+    def __init__(self):
+        self.requests = 0
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.db_time = Histogram()
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+
+    def record(self, stats: RequestQueryStats) -> None:
+        self.requests += 1
+        self.queries.observe(stats.queries)
+        self.db_time.observe(stats.db_time)
+        if stats.slowest_time > self.slowest_time:
+            self.slowest_time = stats.slowest_time
+            self.slowest_statement = stats.slowest_statement
+
+    def snapshot(self) -> dict:
+        return {
+            'requests': self.requests,
+            'queries_per_request': self.queries.snapshot(),
+            'db_time_seconds': self.db_time.snapshot(),
+            'slowest_statement': self.slowest_statement,
+            'slowest_statement_seconds': self.slowest_time
+        }
+
+
+current_query_stats: ContextVar[RequestQueryStats | None] = ContextVar('current_query_stats', default=None)
+route_query_stats: dict[str, RouteQueryStats] = {}
+
+
+def instrument_queries(engine) -> None:
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info['query_start_time'].pop()
+
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+
+        if SLOW_QUERY_MS and duration * 1000 >= SLOW_QUERY_MS:
+            logger.warning('Slow query (%.1f ms): %s', duration * 1000, statement)
+
+
+class QueryMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message['type'] == 'http.response.start':
+                headers = MutableHeaders(scope=message)
+                headers.append('Server-Timing', stats.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            route_query_stats.setdefault(f'{method_label(scope)} {route_template(scope)}', RouteQueryStats()).record(stats)
+
+
+def query_metrics_snapshot() -> dict:
+    return {route: stats.snapshot() for route, stats in sorted(route_query_stats.items())}
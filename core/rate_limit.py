@@ -0,0 +1,201 @@
+import ipaddress
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+from starlette import status
+from core.metrics import Callback, registry
+
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+RATE_LIMIT_URL = os.getenv('RATE_LIMIT_URL')
+RATE_LIMIT_SIZE = int(os.getenv('RATE_LIMIT_SIZE', 100000))
+RATE_LIMIT_LOGIN_IP = os.getenv('RATE_LIMIT_LOGIN_IP', '50/60')
+RATE_LIMIT_LOGIN_USER = os.getenv('RATE_LIMIT_LOGIN_USER', '10/300')
+RATE_LIMIT_REGISTER_IP = os.getenv('RATE_LIMIT_REGISTER_IP', '10/600')
+RATE_LIMIT_PASSWORD_USER = os.getenv('RATE_LIMIT_PASSWORD_USER', '5/300')
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(network.strip(), strict=False)
+    for network in os.getenv('TRUSTED_PROXIES', '').split(',') if network.strip()
+]
+
+rate_limited = registry.counter(
+    'studyhub_rate_limited_total', 'Requests rejected by a rate limit.', ('scope',)
+)
+
+
+def parse_limit(spec: str) -> tuple[int, float]:
+    # '10/60' allows 10 attempts per 60 seconds; an empty spec or '0' turns the limit off.
+    if not spec or spec.strip() == '0':
+        return 0, 0
+    count, _, window = spec.partition('/')
+    if not window or int(count) < 1 or float(window) <= 0:
+        raise ValueError(f'Invalid rate limit: {spec!r}')
+    return int(count), float(window)
+
+
+# Sliding window counter: the previous fixed window is weighted by how much of it still overlaps.
+def estimate(limit: int, window: float, elapsed: float, count: int, previous: int) -> tuple[bool, int]:
+    if previous * (window - elapsed) / window + count < limit:
+        return True, 0
+
+    if count < limit:
+        retry_after = window - elapsed - (limit - count) * window / previous
+    else:
+        retry_after = window - elapsed + window * (1 - limit / count)
+    return False, max(1, math.ceil(retry_after))
+
+
+class LocalRateLimitStore:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._windows = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> tuple[bool, int]:
+        now = time.time()
+        bucket, elapsed = divmod(now, window)
+        current, count, previous = self._windows.get(key, (bucket, 0, 0))
+
+        if current != bucket:
+            count, previous = 0, count if current == bucket - 1 else 0
+
+        allowed, retry_after = estimate(limit, window, elapsed, count, previous)
+        self._windows[key] = (bucket, count + 1 if allowed else count, previous)
+        self._windows.move_to_end(key)
+
+        # Least recently hit keys go first, so an active attacker's own key is never the one dropped.
+        while len(self._windows) > self.maxsize:
+            self._windows.popitem(last=False)
+            self.evictions += 1
+
+        return allowed, retry_after
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def stats(self) -> dict:
+        return {'backend': 'local', 'size': len(self._windows), 'maxsize': self.maxsize, 'evictions': self.evictions}
+
+
+class RedisRateLimitStore:
+    HIT_SCRIPT = '''
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit, window, elapsed = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+if previous * (window - elapsed) / window + count < limit then
+    redis.call('INCR', KEYS[1])
+    redis.call('PEXPIRE', KEYS[1], math.ceil(window * 2000))
+end
+return {count, previous}
+'''
+
+    def __init__(self, url: str, prefix: str = 'studyhub:rate'):
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError('RATE_LIMIT_URL requires the "redis" package to be installed.')
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.errors = redis.RedisError
+        self.script = self.client.register_script(self.HIT_SCRIPT)
+        self.prefix = prefix
+        self.failures = 0
+
+    # A limiter outage must not lock everyone out, so store errors let the request through.
+    async def hit(self, key: str, limit: int, window: float) -> tuple[bool, int]:
+        bucket, elapsed = divmod(time.time(), window)
+        keys = [f'{self.prefix}:{key}:{int(bucket)}', f'{self.prefix}:{key}:{int(bucket) - 1}']
+        try:
+            count, previous = await self.script(keys=keys, args=[limit, window, elapsed])
+        except self.errors:
+            self.failures += 1
+            logger.warning('Rate limit store unavailable, allowing %s', key, exc_info=True)
+            return True, 0
+
+        return estimate(limit, window, elapsed, int(count), int(previous))
+
+    def stats(self) -> dict:
+        return {'backend': 'redis', 'failures': self.failures}
+
+
+def create_rate_limit_store():
+    if RATE_LIMIT_URL:
+        return RedisRateLimitStore(RATE_LIMIT_URL)
+    return LocalRateLimitStore(RATE_LIMIT_SIZE)
+
+
+rate_limit_store = create_rate_limit_store()
+
+
+def is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+# X-Forwarded-For is read from the right, past our own proxies: entries to the left of the first
+# address a trusted proxy reports were written by the client and cannot be used as its key.
+def client_ip(request: Request) -> str:
+    host = request.client.host if request.client else 'unknown'
+    if not is_trusted_proxy(host):
+        return host
+
+    forwarded = ','.join(request.headers.getlist('x-forwarded-for')).split(',')
+    for hop in reversed([hop.strip() for hop in forwarded if hop.strip()]):
+        if not is_trusted_proxy(hop):
+            try:
+                return str(ipaddress.ip_address(hop))
+            except ValueError:
+                return host
+        host = hop
+    return host
+
+
+class RateLimit:
+    def __init__(self, scope: str, spec: str):
+        self.scope = scope
+        self.limit, self.window = parse_limit(spec)
+
+    async def check(self, key) -> None:
+        if not RATE_LIMIT_ENABLED or not self.window:
+            return
+
+        allowed, retry_after = await rate_limit_store.hit(f'{self.scope}:{key}', self.limit, self.window)
+        if not allowed:
+            rate_limited.labels(self.scope).inc()
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail='Too many attempts, please try again later.',
+                headers={'Retry-After': str(retry_after)}
+            )
+
+    def stats(self) -> dict:
+        return {'limit': self.limit, 'window': self.window}
+
+
+# Addresses get a looser limit than accounts, since many users can share one address behind NAT.
+login_ip_limit = RateLimit('login_ip', RATE_LIMIT_LOGIN_IP)
+login_user_limit = RateLimit('login_user', RATE_LIMIT_LOGIN_USER)
+register_ip_limit = RateLimit('register_ip', RATE_LIMIT_REGISTER_IP)
+password_user_limit = RateLimit('password_user', RATE_LIMIT_PASSWORD_USER)
+RATE_LIMITS = (login_ip_limit, login_user_limit, register_ip_limit, password_user_limit)
+
+
+def rate_limit_stats() -> dict:
+    return {
+        'enabled': RATE_LIMIT_ENABLED,
+        'store': rate_limit_store.stats(),
+        'limits': {limit.scope: limit.stats() for limit in RATE_LIMITS}
+    }
+
+
+if isinstance(rate_limit_store, LocalRateLimitStore):
+    registry.add('studyhub_rate_limit_keys', 'Rate limit windows tracked by this worker.', 'gauge',
+                 Callback(lambda: len(rate_limit_store)))
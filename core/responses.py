@@ -0,0 +1,22 @@
+import os
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+
+FAST_RESPONSES = os.getenv('FAST_RESPONSES', 'false').lower() in ('1', 'true', 'yes')
+
+
+def rows_payload(rows) -> list[dict]:
+    if not rows:
+        return []
+    fields = rows[0]._fields
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def fast_json_response(content, response: Response) -> ORJSONResponse:
+    # Returning a response directly skips response_model validation, so carry over headers such as ETag.
+    fast_response = ORJSONResponse(content)
+    for name, value in response.headers.items():
+        if name not in ('content-length', 'content-type'):
+            fast_response.headers.append(name, value)
+    return fast_response
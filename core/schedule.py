@@ -0,0 +1,220 @@
+import os
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.cache import TTLCache
+from database import engine
+from models import StudySession, Subject, session_time_range
+
+
+SESSION_CONFLICTS = os.getenv('SESSION_CONFLICTS', 'group')
+SCHEDULE_CACHE_SIZE = int(os.getenv('SCHEDULE_CACHE_SIZE', 1000))
+SCHEDULE_CACHE_TTL = float(os.getenv('SCHEDULE_CACHE_TTL', 60))
+
+# Namespace for the per-group advisory locks taken while a write is checked for overlaps.
+SCHEDULE_LOCK_ID = 0x5e55
+
+if SESSION_CONFLICTS not in ('group', 'subject', 'off'):
+    raise ValueError(f'Unknown SESSION_CONFLICTS mode: {SESSION_CONFLICTS!r}')
+
+
+class Interval(NamedTuple):
+    start: datetime
+    end: datetime
+    session_id: Optional[int]
+    subject_id: Optional[int]
+    title: str
+
+
+def interval_key(interval: Interval) -> tuple[datetime, datetime]:
+    return interval.start, interval.end
+
+
+def session_end(date_time: datetime, duration: int) -> datetime:
+    return date_time + timedelta(minutes=duration)
+
+
+class IntervalTree:
+    # A balanced tree laid over the intervals sorted by start; each node records the latest end below it.
+    def __init__(self, intervals: list[Interval]):
+        self.intervals = sorted(intervals, key=interval_key)
+        self.max_end = [None] * len(self.intervals)
+        self._build(0, len(self.intervals))
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def _build(self, lo: int, hi: int):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        ends = [self.intervals[mid].end, self._build(lo, mid), self._build(mid + 1, hi)]
+        self.max_end[mid] = max(end for end in ends if end is not None)
+        return self.max_end[mid]
+
+    def overlapping(self, start: datetime, end: datetime) -> list[Interval]:
+        found, pending = [], [(0, len(self.intervals))]
+        while pending:
+            lo, hi = pending.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self.max_end[mid] <= start:
+                continue
+
+            pending.append((lo, mid))
+            interval = self.intervals[mid]
+            if interval.start < end:
+                if interval.end > start:
+                    found.append(interval)
+                pending.append((mid + 1, hi))
+
+        return sorted(found, key=interval_key)
+
+
+def busy_query(group_id: int):
+    return select(
+        StudySession.date_time,
+        StudySession.duration,
+        StudySession.id,
+        StudySession.subject_id,
+        StudySession.title
+    ).join(Subject, Subject.id == StudySession.subject_id).where(
+        Subject.group_id == group_id,
+        StudySession.status != 'Cancelled'
+    )
+
+
+def to_interval(row) -> Interval:
+    return Interval(row.date_time, session_end(row.date_time, row.duration), row.id, row.subject_id, row.title)
+
+
+class PostgresScheduleIndex:
+    async def lock(self, db: AsyncSession, group_id: int) -> None:
+        # Held until the transaction ends, so two writers cannot both pass the check for the same group.
+        await db.execute(select(func.pg_advisory_xact_lock(SCHEDULE_LOCK_ID, group_id)))
+
+    async def busy(self, db: AsyncSession, group_id: int, start: datetime, end: datetime) -> list[Interval]:
+        rows = (await db.execute(busy_query(group_id).where(
+            session_time_range.op('&&')(func.tsrange(start, end))
+        ).order_by(StudySession.date_time, StudySession.id))).all()
+        return [to_interval(row) for row in rows]
+
+    def invalidate(self, group_id: int) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {'backend': 'postgres'}
+
+
+class LocalScheduleIndex:
+    # SQLite has no range index, so each group's sessions are kept in an interval tree built on first use.
+    def __init__(self, maxsize: int, ttl: float):
+        self.trees = TTLCache(maxsize, ttl)
+
+    async def lock(self, db: AsyncSession, group_id: int) -> None:
+        pass
+
+    async def busy(self, db: AsyncSession, group_id: int, start: datetime, end: datetime) -> list[Interval]:
+        tree = self.trees.get(group_id)
+        if tree is None:
+            tree = IntervalTree([to_interval(row) for row in (await db.execute(busy_query(group_id))).all()])
+            self.trees.set(group_id, tree)
+        return tree.overlapping(start, end)
+
+    def invalidate(self, group_id: int) -> None:
+        self.trees.pop(group_id)
+
+    def clear(self) -> None:
+        self.trees.clear()
+
+    def stats(self) -> dict:
+        return {'backend': 'local', **self.trees.stats()}
+
+
+def create_schedule_index():
+    if engine.dialect.name == 'postgresql':
+        return PostgresScheduleIndex()
+    return LocalScheduleIndex(SCHEDULE_CACHE_SIZE, SCHEDULE_CACHE_TTL)
+
+
+schedule_index = create_schedule_index()
+
+
+async def find_conflicts(
+        db: AsyncSession,
+        group_id: int,
+        candidates: list[Interval],
+        subject_id: int | None = None,
+        exclude_id: int | None = None
+    ) -> list[list[Interval]]:
+    # Returns, for each candidate, the existing sessions and other candidates it overlaps.
+    if not candidates:
+        return []
+
+    existing = await schedule_index.busy(
+        db, group_id, min(c.start for c in candidates), max(c.end for c in candidates)
+    )
+    existing = [i for i in existing if i.session_id != exclude_id and (subject_id is None or i.subject_id == subject_id)]
+
+    if len(candidates) == 1:
+        candidate = candidates[0]
+        return [[i for i in existing if i.start < candidate.end and i.end > candidate.start]]
+
+    tree = IntervalTree(existing + candidates)
+    return [
+        [i for i in tree.overlapping(candidate.start, candidate.end) if i is not candidate]
+        for candidate in candidates
+    ]
+
+
+def conflict_scope(subject_id: int | None) -> int | None:
+    return subject_id if SESSION_CONFLICTS == 'subject' else None
+
+
+# Writes lock the group first; the read-only preview passes lock=False but applies the same rules.
+async def check_conflicts(
+        db: AsyncSession,
+        group_id: int,
+        subject_id: int | None,
+        candidates: list[Interval],
+        exclude_id: int | None = None,
+        lock: bool = True
+    ) -> list[list[Interval]]:
+    if SESSION_CONFLICTS == 'off':
+        return [[] for _ in candidates]
+
+    if lock:
+        await schedule_index.lock(db, group_id)
+    return await find_conflicts(db, group_id, candidates, conflict_scope(subject_id), exclude_id)
+
+
+async def free_slots(
+        db: AsyncSession,
+        group_id: int,
+        start: datetime,
+        end: datetime,
+        minutes: int,
+        limit: int,
+        subject_id: int | None = None
+    ) -> list[tuple[datetime, datetime]]:
+    busy = await schedule_index.busy(db, group_id, start, end)
+    scope = conflict_scope(subject_id)
+    if scope is not None:
+        busy = [i for i in busy if i.subject_id == scope]
+
+    slots, cursor, length = [], start, timedelta(minutes=minutes)
+    for interval in busy:
+        if interval.start - cursor >= length:
+            slots.append((cursor, interval.start))
+            if len(slots) == limit:
+                return slots
+        cursor = max(cursor, interval.end)
+
+    if end - cursor >= length:
+        slots.append((cursor, end))
+    return slots
@@ -0,0 +1,39 @@
+import logging
+from pathlib import Path
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / 'alembic.ini'
+
+
+def alembic_config() -> Config:
+    return Config(str(ALEMBIC_INI))
+
+
+def head_revision() -> str:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+async def current_revision(engine: AsyncEngine) -> str | None:
+    async with engine.connect() as conn:
+        try:
+            return await conn.scalar(text('SELECT version_num FROM alembic_version'))
+        except DBAPIError:
+            return None
+
+
+async def check_schema_version(engine: AsyncEngine, strict: bool = False) -> None:
+    current, head = await current_revision(engine), head_revision()
+    if current == head:
+        return
+
+    message = f'Database schema is at revision {current}, expected {head}. Run `python manage.py migrate`.'
+    if strict:
+        raise RuntimeError(message)
+    logger.warning(message)
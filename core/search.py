@@ -0,0 +1,149 @@
+import re
+from sqlalchemy import Integer, String, delete, false, func, insert, literal, literal_column, null, or_, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import engine
+from models import (
+    Membership,
+    StudyGroup,
+    StudySession,
+    Subject,
+    group_search,
+    group_search_document,
+    session_search,
+    session_search_document,
+    subject_search,
+    subject_search_document
+)
+
+
+SEARCH_KINDS = ('group', 'subject', 'session')
+SEARCH_MODELS = {'group': StudyGroup, 'subject': Subject, 'session': StudySession}
+SEARCH_TABLES = {'group': group_search, 'subject': subject_search, 'session': session_search}
+SEARCH_DOCUMENTS = {'group': group_search_document, 'subject': subject_search_document, 'session': session_search_document}
+
+
+def fts_query(q: str) -> str:
+    # Every word is quoted, so FTS5 operators and column filters in user input are matched as plain text.
+    return ' '.join(f'"{term}"' for term in re.findall(r'\w+', q))
+
+
+def source_rows(kind: str):
+    model, table = SEARCH_MODELS[kind], SEARCH_TABLES[kind]
+    return select(model.id, *(getattr(model, column.name) for column in table.columns if column.name != 'rowid'))
+
+
+# Groups are listed publicly; subjects and sessions only turn up for members of their group.
+def visible_rows(kind: str, user_id: int):
+    member_groups = select(Membership.group_id).where(Membership.user_id == user_id)
+
+    if kind == 'group':
+        return select(
+            literal(kind, String).label('kind'),
+            StudyGroup.id,
+            StudyGroup.id.label('group_id'),
+            null().cast(Integer).label('subject_id'),
+            StudyGroup.name.label('title')
+        )
+    if kind == 'subject':
+        return select(
+            literal(kind, String).label('kind'),
+            Subject.id,
+            Subject.group_id,
+            Subject.id.label('subject_id'),
+            Subject.name.label('title')
+        ).where(Subject.group_id.in_(member_groups))
+    return select(
+        literal(kind, String).label('kind'),
+        StudySession.id,
+        Subject.group_id,
+        StudySession.subject_id,
+        StudySession.title
+    ).join(Subject, Subject.id == StudySession.subject_id).where(Subject.group_id.in_(member_groups))
+
+
+class PostgresSearchIndex:
+    # The GIN indexes cover expressions over the rows themselves, so writes keep them current.
+    async def index(self, db: AsyncSession, kind: str, ids) -> None:
+        pass
+
+    async def remove(self, db: AsyncSession, kind: str, ids) -> None:
+        pass
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        return 0
+
+    def match(self, query, kind: str, q: str):
+        document = SEARCH_DOCUMENTS[kind]
+        terms = func.websearch_to_tsquery(text("'english'"), q)
+        return query.add_columns(func.ts_rank(document, terms).label('rank')).where(document.op('@@')(terms))
+
+
+class SqliteSearchIndex:
+    async def index(self, db: AsyncSession, kind: str, ids) -> None:
+        # Pending changes must reach the rows before they are copied into the FTS table.
+        await db.flush()
+        await self.remove(db, kind, ids)
+        await db.execute(insert(SEARCH_TABLES[kind]).from_select(
+            [column.name for column in SEARCH_TABLES[kind].columns],
+            source_rows(kind).where(SEARCH_MODELS[kind].id.in_(ids))
+        ))
+
+    async def remove(self, db: AsyncSession, kind: str, ids) -> None:
+        table = SEARCH_TABLES[kind]
+        await db.execute(delete(table).where(table.c.rowid.in_(ids)))
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        indexed = 0
+        for kind, table in SEARCH_TABLES.items():
+            await db.execute(delete(table))
+            result = await db.execute(insert(table).from_select(
+                [column.name for column in table.columns], source_rows(kind)
+            ))
+            indexed += result.rowcount
+        await db.commit()
+        return indexed
+
+    def match(self, query, kind: str, q: str):
+        table, terms = SEARCH_TABLES[kind], fts_query(q)
+        source = literal_column(table.name)
+        # bm25() scores better matches lower; it is negated so both backends rank descending.
+        return query.add_columns((-func.bm25(source)).label('rank')).join(
+            table, table.c.rowid == SEARCH_MODELS[kind].id
+        ).where(source.op('MATCH')(terms) if terms else false())
+
+
+def create_search_index():
+    if engine.dialect.name == 'postgresql':
+        return PostgresSearchIndex()
+    return SqliteSearchIndex()
+
+
+search_index = create_search_index()
+
+
+def search_hits(user_id: int, q: str, kinds=SEARCH_KINDS):
+    return union_all(*(search_index.match(visible_rows(kind, user_id), kind, q) for kind in kinds)).subquery()
+
+
+async def remove_subject(db: AsyncSession, subject_id: int) -> None:
+    await search_index.remove(db, 'session', select(StudySession.id).where(StudySession.subject_id == subject_id))
+    await search_index.remove(db, 'subject', [subject_id])
+
+
+async def remove_group(db: AsyncSession, group_id: int) -> None:
+    subjects = select(Subject.id).where(Subject.group_id == group_id)
+    await search_index.remove(db, 'session', select(StudySession.id).where(StudySession.subject_id.in_(subjects)))
+    await search_index.remove(db, 'subject', subjects)
+    await search_index.remove(db, 'group', [group_id])
+
+
+async def remove_user(db: AsyncSession, user_id: int) -> None:
+    # Deleting a user cascades to the sessions they created and the groups they own.
+    groups = select(StudyGroup.id).where(StudyGroup.owner_id == user_id)
+    subjects = select(Subject.id).where(Subject.group_id.in_(groups))
+    await search_index.remove(db, 'session', select(StudySession.id).where(or_(
+        StudySession.created_by == user_id,
+        StudySession.subject_id.in_(subjects)
+    )))
+    await search_index.remove(db, 'subject', subjects)
+    await search_index.remove(db, 'group', groups)
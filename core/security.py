@@ -1,22 +1,35 @@
 from datetime import timedelta, datetime, timezone
-from jose import jwt, JWTError
+from jose import jwt, JWTError, ExpiredSignatureError
 from typing import Annotated
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Header
 from schemas.user import CurrentUserResponse
 from starlette import status
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
 from dotenv import load_dotenv
+from core.cache import TTLCache
+from core.metrics import registry
+import hashlib
+import hmac
 import os
+import time
 
 
 load_dotenv()
 
 SECRET_KEY = os.getenv('KEY')
 ALGORITHM = 'HS256'
+INTERNAL_TOKEN = os.getenv('INTERNAL_TOKEN')
+INTERNAL_PUBLIC = os.getenv('INTERNAL_PUBLIC', 'false').lower() in ('1', 'true', 'yes')
+JWT_CACHE_SIZE = int(os.getenv('JWT_CACHE_SIZE', 10000))
+JWT_CACHE_MAX_TTL = float(os.getenv('JWT_CACHE_MAX_TTL', 3600))
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl='auth/token')
 bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+token_cache = TTLCache(JWT_CACHE_SIZE, JWT_CACHE_MAX_TTL)
+jwt_failures = registry.counter(
+    'studyhub_jwt_decode_failures_total', 'Bearer tokens rejected by get_current_user.', ('reason',)
+)
 
 
 def create_access_token(username: str, user_id: int, expires: timedelta) -> str:
@@ -30,18 +43,41 @@ def create_access_token(username: str, user_id: int, expires: timedelta) -> str:
 
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> CurrentUserResponse:
+    token_key = hashlib.sha256(token.encode()).digest()
+    cached_user = token_cache.get(token_key)
+    if cached_user is not None:
+        return cached_user
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         required_fields = ['sub', 'user_id']
 
         if any(payload.get(field) is None for field in required_fields):
+            jwt_failures.labels('missing_claims').inc()
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Authentication failed!')
 
+    except ExpiredSignatureError:
+        jwt_failures.labels('expired').inc()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Authentication failed!')
     except JWTError:
+        jwt_failures.labels('invalid').inc()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Authentication failed!')
 
-    return CurrentUserResponse(
+    current_user = CurrentUserResponse(
         username=payload.get('sub'),
         user_id=payload.get('user_id')
     )
 
+    if payload.get('exp') is not None:
+        token_cache.set(token_key, current_user, payload['exp'] - time.time())
+
+    return current_user
+
+
+# Closed unless a token is configured; INTERNAL_PUBLIC=true opens the endpoints for local development.
+async def require_internal_access(x_internal_token: Annotated[str | None, Header()] = None) -> None:
+    if INTERNAL_TOKEN:
+        if not hmac.compare_digest(x_internal_token or '', INTERNAL_TOKEN):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Not allowed.')
+    elif not INTERNAL_PUBLIC:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Not Found')
@@ -0,0 +1,110 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from sqlalchemy import Date, cast, delete, func, insert, literal_column, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import SessionStat, StudySession, Subject
+
+
+UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def week_start(value: date) -> date:
+    if isinstance(value, datetime):
+        value = value.date()
+    return value - timedelta(days=value.weekday())
+
+
+def week_expression(dialect: str, column):
+    if dialect == 'postgresql':
+        return cast(func.date_trunc('week', column), Date)
+    # 'weekday 0' moves forward to Sunday (or stays on it), six days back is that week's Monday.
+    return func.date(column, 'weekday 0', '-6 days')
+
+
+class StatsDelta:
+    def __init__(self, group_id: int):
+        self.group_id = group_id
+        self.buckets = defaultdict(lambda: [0, 0])
+
+    def add(self, subject_id: int, date_time: datetime, status: str, duration: int, sign: int = 1) -> None:
+        bucket = self.buckets[(subject_id, week_start(date_time), status)]
+        bucket[0] += sign
+        bucket[1] += sign * duration
+
+    def remove(self, subject_id: int, date_time: datetime, status: str, duration: int) -> None:
+        self.add(subject_id, date_time, status, duration, sign=-1)
+
+    async def apply(self, db: AsyncSession) -> None:
+        # Sorted so concurrent writers touch rollup rows in the same order and cannot deadlock.
+        rows = [
+            {
+                'group_id': self.group_id,
+                'subject_id': subject_id,
+                'week': week,
+                'status': status,
+                'session_count': count,
+                'total_minutes': minutes
+            }
+            for (subject_id, week, status), (count, minutes) in sorted(self.buckets.items())
+            if count or minutes
+        ]
+        if not rows:
+            return
+
+        upsert = UPSERT_INSERTS[db.bind.dialect.name](SessionStat)
+        await db.execute(upsert.on_conflict_do_update(
+            index_elements=['group_id', 'subject_id', 'week', 'status'],
+            set_={
+                'session_count': SessionStat.session_count + upsert.excluded.session_count,
+                'total_minutes': SessionStat.total_minutes + upsert.excluded.total_minutes
+            }
+        ), rows)
+
+
+async def remove_sessions_created_by(db: AsyncSession, user_id: int) -> None:
+    sessions = (await db.execute(select(
+        Subject.group_id,
+        StudySession.subject_id,
+        StudySession.date_time,
+        StudySession.status,
+        StudySession.duration
+    ).join(Subject, Subject.id == StudySession.subject_id).where(
+        StudySession.created_by == user_id
+    ))).all()
+
+    deltas = {}
+    for session in sessions:
+        delta = deltas.setdefault(session.group_id, StatsDelta(session.group_id))
+        delta.remove(session.subject_id, session.date_time, session.status, session.duration)
+
+    for delta in deltas.values():
+        await delta.apply(db)
+
+
+async def rebuild_session_stats(db: AsyncSession, group_id: int | None = None) -> int:
+    clear = delete(SessionStat)
+    sessions = select(
+        Subject.group_id,
+        StudySession.subject_id,
+        week_expression(db.bind.dialect.name, StudySession.date_time).label('week'),
+        StudySession.status,
+        func.count().label('session_count'),
+        func.sum(StudySession.duration).label('total_minutes')
+    ).join(Subject, Subject.id == StudySession.subject_id).group_by(
+        Subject.group_id, StudySession.subject_id, literal_column('week'), StudySession.status
+    )
+
+    if group_id is not None:
+        clear = clear.where(SessionStat.group_id == group_id)
+        sessions = sessions.where(Subject.group_id == group_id)
+
+    await db.execute(clear)
+    result = await db.execute(insert(SessionStat).from_select(
+        ['group_id', 'subject_id', 'week', 'status', 'session_count', 'total_minutes'], sessions
+    ))
+    await db.commit()
+    return result.rowcount
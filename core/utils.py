@@ -1,16 +1,30 @@
+from typing import NamedTuple
 from models import StudyGroup, Membership
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 from starlette import status
+from core.membership_cache import membership_cache
 
 
-def get_group_member(db: Session, user, group_id: int):
-    member = db.query(Membership).filter(
+class GroupMember(NamedTuple):
+    user_id: int
+    group_id: int
+    role: str
+
+
+async def get_group_member(db: AsyncSession, user, group_id: int) -> GroupMember:
+    role = await membership_cache.get(user.user_id, group_id)
+    if role is not None:
+        return GroupMember(user.user_id, group_id, role)
+
+    generation = await membership_cache.generation(user.user_id, group_id)
+    role = await db.scalar(select(Membership.role).where(
         Membership.user_id == user.user_id,
-        Membership.group_id == group_id).first()
+        Membership.group_id == group_id))
 
-    if not member:
-        if not db.get(StudyGroup, group_id):
+    if not role:
+        if not await db.get(StudyGroup, group_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail='Group not found.'
@@ -19,7 +33,9 @@ def get_group_member(db: Session, user, group_id: int):
             status_code=status.HTTP_403_FORBIDDEN,
             detail='You must be a group member to perform this action.'
         )
-    return member
+
+    await membership_cache.set(user.user_id, group_id, role, generation)
+    return GroupMember(user.user_id, group_id, role)
 
 
 def require_role(member_role, allowed_roles: list[str]):
@@ -1,21 +1,80 @@
 import os
+import time
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
+from core.metrics import registry
+from core.pool_metrics import InstrumentedQueuePool, instrument_pool
+from core.query_metrics import instrument_queries
 
 
 load_dotenv()
 
-SQLALCHEMY_DATABASE_URL = os.getenv('URL')
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', -1))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'false').lower() in ('1', 'true', 'yes')
+
+db_session_duration = registry.histogram(
+    'studyhub_db_session_duration_seconds', 'Time a request holds the session checked out by get_db.'
+).labels()
+
+
+def async_database_url(url: str) -> str:
+    url = make_url(url)
+    backend = url.get_backend_name()
+
+    if backend in ASYNC_DRIVERS and url.drivername != ASYNC_DRIVERS[backend]:
+        url = url.set(drivername=ASYNC_DRIVERS[backend])
+    return url.render_as_string(hide_password=False)
+
+
+def engine_options(url: str) -> dict:
+    url = make_url(url)
+
+    # In-memory SQLite runs on a single shared connection, so there is no pool to size.
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+
+    return {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+
+
+SQLALCHEMY_DATABASE_URL = async_database_url(os.getenv('URL', 'sqlite:///./studyhub.db'))
+
+engine = create_async_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+instrument_pool(engine.sync_engine)
+instrument_queries(engine.sync_engine)
+
+if engine.dialect.name == 'sqlite':
+    # SQLite ignores ON DELETE CASCADE unless foreign keys are switched on per connection.
+    @event.listens_for(engine.sync_engine, 'connect')
+    def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
-def get_db() -> Session:
-    db= SessionLocal()
+async def get_db() -> AsyncSession:
+    start = time.perf_counter()
     try:
-        yield db
+        async with SessionLocal() as db:
+            yield db
     finally:
-        db.close()
\ No newline at end of file
+        db_session_duration.observe(time.perf_counter() - start)
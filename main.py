@@ -1,12 +1,34 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from database import engine
-import models
-from routers import auth, users, study_groups, memberships, subjects, study_sessions
+from core.hashing import password_hasher
+from core.events import event_bus
+from core.schema import check_schema_version
+from core.metrics import RequestMetricsMiddleware
+from core.query_metrics import QueryMetricsMiddleware
+from routers import auth, users, study_groups, memberships, subjects, study_sessions, schedule, search, stats, events, internal, metrics
 
 
-app = FastAPI()
+SCHEMA_CHECK = os.getenv('SCHEMA_CHECK', 'warn')
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
 
-models.Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SCHEMA_CHECK != 'off':
+        await check_schema_version(engine, strict=SCHEMA_CHECK == 'strict')
+    await event_bus.start()
+    yield
+    await event_bus.stop()
+    await engine.dispose()
+    password_hasher.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(QueryMetricsMiddleware)
+if METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
 
 app.include_router(auth.router)
 app.include_router(users.router)
@@ -14,6 +36,12 @@ app.include_router(study_groups.router)
 app.include_router(memberships.router)
 app.include_router(subjects.router)
 app.include_router(study_sessions.router)
+app.include_router(schedule.router)
+app.include_router(search.router)
+app.include_router(stats.router)
+app.include_router(events.router)
+app.include_router(internal.router)
+app.include_router(metrics.router)
 
 
 
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+from alembic import command
+from core.schema import alembic_config
+from core.stats import rebuild_session_stats
+from core.search import search_index
+from database import SessionLocal, engine
+
+
+async def rebuild_stats(group_id: int | None) -> int:
+    try:
+        async with SessionLocal() as db:
+            return await rebuild_session_stats(db, group_id)
+    finally:
+        await engine.dispose()
+
+
+async def rebuild_search() -> int:
+    try:
+        async with SessionLocal() as db:
+            return await search_index.rebuild(db)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='StudyHub management commands.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    migrate = commands.add_parser('migrate', help='Upgrade the database schema.')
+    migrate.add_argument('revision', nargs='?', default='head')
+    migrate.add_argument('--sql', action='store_true', help='Print the SQL instead of running it.')
+
+    downgrade = commands.add_parser('downgrade', help='Revert the database schema to an earlier revision.')
+    downgrade.add_argument('revision')
+
+    stamp = commands.add_parser('stamp', help='Record a revision without running any migrations.')
+    stamp.add_argument('revision')
+
+    revision = commands.add_parser('makemigration', help='Create a new migration script.')
+    revision.add_argument('-m', '--message', required=True)
+    revision.add_argument('--autogenerate', action='store_true')
+
+    rebuild = commands.add_parser('rebuild-stats', help='Recompute the weekly session statistics rollup.')
+    rebuild.add_argument('--group', type=int, help='Only rebuild this study group.')
+
+    commands.add_parser('rebuild-search', help='Repopulate the SQLite full-text search tables.')
+
+    commands.add_parser('current', help='Show the current database revision.')
+    commands.add_parser('history', help='List all migrations.')
+
+    args = parser.parse_args()
+    config = alembic_config()
+
+    if args.command == 'migrate':
+        command.upgrade(config, args.revision, sql=args.sql)
+    elif args.command == 'downgrade':
+        command.downgrade(config, args.revision)
+    elif args.command == 'stamp':
+        command.stamp(config, args.revision)
+    elif args.command == 'makemigration':
+        command.revision(config, message=args.message, autogenerate=args.autogenerate)
+    elif args.command == 'current':
+        command.current(config, verbose=True)
+    elif args.command == 'history':
+        command.history(config)
+    elif args.command == 'rebuild-stats':
+        print(f'Wrote {asyncio.run(rebuild_stats(args.group))} rollup rows.')
+    elif args.command == 'rebuild-search':
+        print(f'Indexed {asyncio.run(rebuild_search())} rows.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Initial schema, as previously created by metadata.create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Databases created before migrations existed already have this schema:
+mark them with `python manage.py stamp 0001` and then run `python manage.py migrate`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(250), nullable=False),
+        sa.Column('username', sa.String(250), nullable=False),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id', name='users_pkey')
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+
+    op.create_table(
+        'study_groups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(250), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], name='study_groups_owner_id_fkey'),
+        sa.PrimaryKeyConstraint('id', name='study_groups_pkey'),
+        sa.UniqueConstraint('name', name='study_groups_name_key')
+    )
+    op.create_index('ix_study_groups_id', 'study_groups', ['id'])
+    op.create_index('ix_study_groups_owner_id', 'study_groups', ['owner_id'])
+
+    op.create_table(
+        'memberships',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.Enum('Member', 'Admin', 'Creator', name='role_name'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='memberships_user_id_fkey'),
+        sa.ForeignKeyConstraint(['group_id'], ['study_groups.id'], name='memberships_group_id_fkey'),
+        sa.PrimaryKeyConstraint('user_id', 'group_id', name='memberships_pkey')
+    )
+
+    op.create_table(
+        'subjects',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(250), nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['study_groups.id'], name='subjects_group_id_fkey', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id', name='subjects_pkey'),
+        sa.UniqueConstraint('group_id', 'name', name='uq_group_subject_name')
+    )
+    op.create_index('ix_subjects_id', 'subjects', ['id'])
+    op.create_index('ix_subjects_group_id', 'subjects', ['group_id'])
+
+    op.create_table(
+        'study_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(250), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('date_time', sa.DateTime(), nullable=False),
+        sa.Column('duration', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('Scheduled', 'Completed', 'In Progress', 'Cancelled', name='session_status'),
+                  nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=False),
+        sa.CheckConstraint('duration > 0', name='duration_range'),
+        sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], name='study_sessions_subject_id_fkey',
+                                ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], name='study_sessions_created_by_fkey',
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id', name='study_sessions_pkey')
+    )
+    op.create_index('ix_study_sessions_id', 'study_sessions', ['id'])
+    op.create_index('ix_study_sessions_date_time', 'study_sessions', ['date_time'])
+    op.create_index('ix_study_sessions_subject_id', 'study_sessions', ['subject_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('study_sessions')
+    op.drop_table('subjects')
+    op.drop_table('memberships')
+    op.drop_table('study_groups')
+    op.drop_table('users')
+    sa.Enum(name='session_status').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='role_name').drop(op.get_bind(), checkfirst=True)
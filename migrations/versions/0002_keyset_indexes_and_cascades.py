@@ -0,0 +1,60 @@
+"""Keyset pagination indexes and ON DELETE CASCADE on every foreign key
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# Matches PostgreSQL's default constraint names, and lets batch mode name SQLite's reflected foreign keys.
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+CASCADED_FOREIGN_KEYS = [
+    ('study_groups', 'owner_id', 'users'),
+    ('memberships', 'user_id', 'users'),
+    ('memberships', 'group_id', 'study_groups'),
+]
+
+
+def replace_foreign_keys(ondelete: str | None) -> None:
+    for table, column, referent in CASCADED_FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, referent, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    replace_foreign_keys('CASCADE')
+
+    is_postgres = op.get_bind().dialect.name == 'postgresql'
+    name_lower = sa.text('lower(name) text_pattern_ops' if is_postgres else 'lower(name)')
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_study_groups_created_at_id', 'study_groups', ['created_at', 'id'],
+                        postgresql_concurrently=True)
+        op.create_index('ix_study_groups_name_lower', 'study_groups', [name_lower],
+                        postgresql_concurrently=True)
+        op.create_index('ix_study_sessions_subject_id_date_time', 'study_sessions', ['subject_id', 'date_time'],
+                        postgresql_concurrently=True)
+        op.drop_index('ix_study_sessions_subject_id', table_name='study_sessions', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_study_sessions_subject_id', 'study_sessions', ['subject_id'],
+                        postgresql_concurrently=True)
+        op.drop_index('ix_study_sessions_subject_id_date_time', table_name='study_sessions',
+                      postgresql_concurrently=True)
+        op.drop_index('ix_study_groups_name_lower', table_name='study_groups', postgresql_concurrently=True)
+        op.drop_index('ix_study_groups_created_at_id', table_name='study_groups', postgresql_concurrently=True)
+
+    replace_foreign_keys(None)
@@ -0,0 +1,57 @@
+"""Weekly session statistics rollup
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+SESSION_STATUSES = ('Scheduled', 'Completed', 'In Progress', 'Cancelled')
+
+WEEK_EXPRESSIONS = {
+    'postgresql': "date_trunc('week', study_sessions.date_time)::date",
+    'sqlite': "date(study_sessions.date_time, 'weekday 0', '-6 days')",
+}
+
+
+def upgrade() -> None:
+    # The session_status type already exists on PostgreSQL; study_sessions created it.
+    status_type = sa.Enum(*SESSION_STATUSES, name='session_status').with_variant(
+        postgresql.ENUM(*SESSION_STATUSES, name='session_status', create_type=False), 'postgresql'
+    )
+
+    op.create_table(
+        'session_stats',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('subject_id', sa.Integer(), nullable=False),
+        sa.Column('week', sa.Date(), nullable=False),
+        sa.Column('status', status_type, nullable=False),
+        sa.Column('session_count', sa.Integer(), nullable=False),
+        sa.Column('total_minutes', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['study_groups.id'], name='session_stats_group_id_fkey',
+                                ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['subject_id'], ['subjects.id'], name='session_stats_subject_id_fkey',
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('group_id', 'subject_id', 'week', 'status', name='session_stats_pkey')
+    )
+
+    week = WEEK_EXPRESSIONS[op.get_bind().dialect.name]
+    op.execute(f"""
+        INSERT INTO session_stats (group_id, subject_id, week, status, session_count, total_minutes)
+        SELECT subjects.group_id, study_sessions.subject_id, {week} AS week, study_sessions.status,
+               count(*), sum(study_sessions.duration)
+        FROM study_sessions JOIN subjects ON subjects.id = study_sessions.subject_id
+        GROUP BY subjects.group_id, study_sessions.subject_id, week, study_sessions.status
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('session_stats')
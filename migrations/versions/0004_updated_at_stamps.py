@@ -0,0 +1,52 @@
+"""updated_at stamps for conditional GETs
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+STAMPED_TABLES = {
+    'study_groups': 'created_at',
+    'memberships': None,
+    'subjects': None,
+    'study_sessions': None,
+}
+
+UTC_NOW = {
+    'postgresql': "timezone('utc', now())",
+    'sqlite': 'CURRENT_TIMESTAMP',
+}
+
+
+def restore_name_index() -> None:
+    # SQLite batch mode rebuilds study_groups without reflecting its expression index, so put it back.
+    if op.get_bind().dialect.name == 'sqlite':
+        op.create_index('ix_study_groups_name_lower', 'study_groups', [sa.text('lower(name)')])
+
+
+def upgrade() -> None:
+    now = UTC_NOW[op.get_bind().dialect.name]
+
+    for table, backfill in STAMPED_TABLES.items():
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=True))
+        op.execute(f'UPDATE {table} SET updated_at = {backfill or now}')
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+    restore_name_index()
+
+
+def downgrade() -> None:
+    for table in reversed(STAMPED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
+
+    restore_name_index()
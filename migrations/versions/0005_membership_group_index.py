@@ -0,0 +1,26 @@
+"""Group-first membership index for member listings
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_memberships_group_id_role_user_id', 'memberships', ['group_id', 'role', 'user_id'],
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_memberships_group_id_role_user_id', table_name='memberships',
+                      postgresql_concurrently=True)
@@ -0,0 +1,34 @@
+"""GiST index on session time ranges for overlap checks
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SQLite has no range types; the API checks overlaps there with an in-process interval tree.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY ix_study_sessions_time_range ON study_sessions
+            USING gist (tsrange(date_time, date_time + duration * interval '1 minute'))
+            WHERE status != 'Cancelled'
+        """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY ix_study_sessions_time_range')
@@ -0,0 +1,50 @@
+"""Full-text search indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# The expressions must match the search documents in models.py for the planner to use these indexes.
+SEARCH_INDEXES = {
+    'ix_study_groups_search': "study_groups USING gin (to_tsvector('english', name || ' ' || coalesce(description, '')))",
+    'ix_subjects_search': "subjects USING gin (to_tsvector('english', name))",
+    'ix_study_sessions_search': "study_sessions USING gin (to_tsvector('english', title || ' ' || coalesce(description, '')))",
+}
+
+# SQLite keeps FTS5 tables keyed by the indexed row's id instead.
+SEARCH_TABLES = {
+    'group_search': ('study_groups', 'name, description'),
+    'subject_search': ('subjects', 'name'),
+    'session_search': ('study_sessions', 'title, description'),
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, definition in SEARCH_INDEXES.items():
+                op.execute(f'CREATE INDEX CONCURRENTLY {name} ON {definition}')
+        return
+
+    for name, (source, columns) in SEARCH_TABLES.items():
+        op.execute(f"CREATE VIRTUAL TABLE {name} USING fts5({columns}, tokenize='porter unicode61')")
+        op.execute(f'INSERT INTO {name} (rowid, {columns}) SELECT id, {columns} FROM {source}')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name in SEARCH_INDEXES:
+                op.execute(f'DROP INDEX CONCURRENTLY {name}')
+        return
+
+    for name in SEARCH_TABLES:
+        op.execute(f'DROP TABLE {name}')
@@ -1,9 +1,17 @@
 from sqlalchemy.orm import relationship
 from database import Base
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, CheckConstraint, UniqueConstraint, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Date, DateTime, CheckConstraint, UniqueConstraint, Enum, Index, func, literal_column, text
+from sqlalchemy import DDL, MetaData, Table, event
 from datetime import datetime, timezone
 
 
+session_status = Enum('Scheduled', 'Completed', 'In Progress', 'Cancelled', name='session_status')
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 
 class User(Base):
     __tablename__ = 'users'
@@ -12,10 +20,10 @@ class User(Base):
     email = Column(String(250), index=True, unique=True, nullable=False)
     username = Column(String(250), index=True, unique=True, nullable=False)
     hashed_password = Column(String, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = Column(DateTime, default=utc_now, nullable=False)
 
-    sessions = relationship('StudySession', back_populates='creator', cascade='all, delete')
-    memberships = relationship('Membership', back_populates='user', cascade='all, delete')
+    sessions = relationship('StudySession', back_populates='creator', cascade='all, delete', passive_deletes=True)
+    memberships = relationship('Membership', back_populates='user', cascade='all, delete', passive_deletes=True)
 
 
 
@@ -25,20 +33,38 @@ class StudyGroup(Base):
     id = Column(Integer, primary_key=True, index=True, nullable=False)
     name = Column(String(250), unique=True, nullable=False)
     description = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    owner_id = Column(Integer, ForeignKey('users.id'), index=True, nullable=False)
+    created_at = Column(DateTime, default=utc_now, nullable=False)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
+    owner_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), index=True, nullable=False)
+
+    __table_args__ = (
+        Index('ix_study_groups_created_at_id', 'created_at', 'id'),
+    )
+
+    subjects = relationship('Subject', back_populates='group', cascade='all, delete', passive_deletes=True)
+    memberships = relationship('Membership', back_populates='group', cascade='all, delete', passive_deletes=True)
+
 
-    subjects = relationship('Subject', back_populates='group', cascade='all, delete')
-    memberships = relationship('Membership', back_populates='group', cascade='all, delete')
+Index(
+    'ix_study_groups_name_lower',
+    func.lower(StudyGroup.name).label('name_lower'),
+    postgresql_ops={'name_lower': 'text_pattern_ops'}
+)
 
 
 
 class Membership(Base):
     __tablename__ = 'memberships'
 
-    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True, nullable=False)
-    group_id = Column(Integer, ForeignKey('study_groups.id'), primary_key=True, nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True, nullable=False)
+    group_id = Column(Integer, ForeignKey('study_groups.id', ondelete='CASCADE'), primary_key=True, nullable=False)
     role = Column(Enum('Member', 'Admin', 'Creator', name='role_name'), default='Member', nullable=False)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
+
+    # The primary key leads with user_id; member listings filter on the group.
+    __table_args__ = (
+        Index('ix_memberships_group_id_role_user_id', 'group_id', 'role', 'user_id'),
+    )
 
     group = relationship('StudyGroup', back_populates='memberships')
     user = relationship('User', back_populates='memberships')
@@ -52,12 +78,13 @@ class Subject(Base):
     id = Column(Integer, primary_key=True, index=True, nullable=False)
     name = Column(String(250), nullable=False)
     group_id = Column(Integer, ForeignKey('study_groups.id', ondelete='CASCADE'), index=True, nullable=False)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
 
     __table_args__ = (
         UniqueConstraint('group_id', 'name', name='uq_group_subject_name'),
     )
 
-    sessions = relationship('StudySession', back_populates='subject', cascade='all, delete')
+    sessions = relationship('StudySession', back_populates='subject', cascade='all, delete', passive_deletes=True)
     group = relationship('StudyGroup', back_populates='subjects')
 
 
@@ -70,14 +97,88 @@ class StudySession(Base):
     description = Column(Text)
     date_time = Column(DateTime, index=True, nullable=False)
     duration = Column(Integer, nullable=False)
-    status = Column(Enum('Scheduled', 'Completed', 'In Progress', 'Cancelled', name='session_status'),
-                    default='Scheduled', nullable=False)
-    subject_id = Column(Integer, ForeignKey('subjects.id', ondelete='CASCADE'), index=True, nullable=False)
+    status = Column(session_status, default='Scheduled', nullable=False)
+    subject_id = Column(Integer, ForeignKey('subjects.id', ondelete='CASCADE'), nullable=False)
     created_by = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
 
     __table_args__ = (
         CheckConstraint('duration > 0', name='duration_range'),
+        Index('ix_study_sessions_subject_id_date_time', 'subject_id', 'date_time'),
     )
 
     creator = relationship('User', back_populates='sessions')
-    subject = relationship('Subject', back_populates='sessions')
\ No newline at end of file
+    subject = relationship('Subject', back_populates='sessions')
+
+
+# Queries must repeat this expression verbatim for PostgreSQL to use the GiST index on it.
+session_time_range = func.tsrange(
+    StudySession.date_time,
+    StudySession.date_time + StudySession.duration * literal_column("interval '1 minute'")
+)
+
+Index(
+    'ix_study_sessions_time_range',
+    session_time_range,
+    postgresql_using='gist',
+    postgresql_where=StudySession.status != 'Cancelled'
+).ddl_if(dialect='postgresql')
+
+
+# Full-text documents for /search. Like the time range above, these are repeated verbatim in queries.
+def search_document(*columns):
+    document = columns[0]
+    for column in columns[1:]:
+        document = document + literal_column("' '") + func.coalesce(column, literal_column("''"))
+    return func.to_tsvector(text("'english'"), document)
+
+
+group_search_document = search_document(StudyGroup.name, StudyGroup.description)
+subject_search_document = search_document(Subject.name)
+session_search_document = search_document(StudySession.title, StudySession.description)
+
+Index('ix_study_groups_search', group_search_document, postgresql_using='gin').ddl_if(dialect='postgresql')
+Index('ix_subjects_search', subject_search_document, postgresql_using='gin').ddl_if(dialect='postgresql')
+Index('ix_study_sessions_search', session_search_document, postgresql_using='gin').ddl_if(dialect='postgresql')
+
+
+
+class SessionStat(Base):
+    __tablename__ = 'session_stats'
+
+    group_id = Column(Integer, ForeignKey('study_groups.id', ondelete='CASCADE'), primary_key=True, nullable=False)
+    subject_id = Column(Integer, ForeignKey('subjects.id', ondelete='CASCADE'), primary_key=True, nullable=False)
+    week = Column(Date, primary_key=True, nullable=False)
+    status = Column(session_status, primary_key=True, nullable=False)
+    session_count = Column(Integer, default=0, nullable=False)
+    total_minutes = Column(Integer, default=0, nullable=False)
+
+
+# SQLite has no tsvector, so there /search reads FTS5 tables whose rowid is the id of the row they index.
+# They live outside Base.metadata because create_all cannot emit CREATE VIRTUAL TABLE.
+search_metadata = MetaData()
+
+group_search = Table(
+    'group_search', search_metadata,
+    Column('rowid', Integer, primary_key=True),
+    Column('name', Text),
+    Column('description', Text)
+)
+subject_search = Table(
+    'subject_search', search_metadata,
+    Column('rowid', Integer, primary_key=True),
+    Column('name', Text)
+)
+session_search = Table(
+    'session_search', search_metadata,
+    Column('rowid', Integer, primary_key=True),
+    Column('title', Text),
+    Column('description', Text)
+)
+
+for search_table in search_metadata.tables.values():
+    search_columns = ', '.join(column.name for column in search_table.columns if column.name != 'rowid')
+    event.listen(Base.metadata, 'after_create', DDL(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {search_table.name} USING fts5({search_columns}, tokenize='porter unicode61')"
+    ).execute_if(dialect='sqlite'))
+    event.listen(Base.metadata, 'before_drop', DDL(f'DROP TABLE IF EXISTS {search_table.name}').execute_if(dialect='sqlite'))
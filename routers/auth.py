@@ -1,42 +1,55 @@
 from fastapi.security import OAuth2PasswordRequestForm
 from schemas.user import CreateUserRequest, UserResponse
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from models import User
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from starlette import status
 from typing import Annotated
 from database import get_db
-from sqlalchemy.orm import Session
-from core.security import create_access_token, bcrypt_context
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.security import create_access_token
+from core.hashing import password_hasher
+from core.rate_limit import client_ip, login_ip_limit, login_user_limit, register_ip_limit
 
 
 router = APIRouter(
     prefix='/auth',
     tags=['Auth']
 )
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+form_dependency = Annotated[OAuth2PasswordRequestForm, Depends()]
 
-def check_user_duplicate(db: Session, email: str, username: str) -> bool:
-    user_exist = db.query(User).filter(or_(
+
+async def limit_registrations(request: Request) -> None:
+    await register_ip_limit.check(client_ip(request))
+
+
+async def limit_logins(request: Request, form_data: form_dependency) -> None:
+    await login_ip_limit.check(client_ip(request))
+    await login_user_limit.check(form_data.username)
+
+
+async def check_user_duplicate(db: AsyncSession, email: str, username: str) -> bool:
+    user_exist = await db.scalar(select(User.id).where(or_(
         User.email == email, User.username == username
-    )).first()
+    )).limit(1))
 
     return user_exist is not None
 
 
-@router.post('/', status_code=status.HTTP_201_CREATED)
+@router.post('/', status_code=status.HTTP_201_CREATED, dependencies=[Depends(limit_registrations)])
 async def create_user(db: db_dependency, create_user_request: CreateUserRequest) -> UserResponse:
 
-    if check_user_duplicate(db, create_user_request.email, create_user_request.username):
+    if await check_user_duplicate(db, create_user_request.email, create_user_request.username):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Email/username already exists!')
 
     user_data = create_user_request.model_dump(exclude={'password'})
-    password = bcrypt_context.hash(create_user_request.password)
+    password = await password_hasher.hash(create_user_request.password)
     user = User(**user_data, hashed_password=password)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     return UserResponse(
         id=user.id,
@@ -46,11 +59,11 @@ async def create_user(db: db_dependency, create_user_request: CreateUserRequest)
     )
 
 
-@router.post('/token', status_code=status.HTTP_200_OK)
-async def login_for_access_token(db: db_dependency, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
-    user = db.query(User).filter(User.username == form_data.username).first()
+@router.post('/token', status_code=status.HTTP_200_OK, dependencies=[Depends(limit_logins)])
+async def login_for_access_token(db: db_dependency, form_data: form_dependency):
+    user = await db.scalar(select(User).where(User.username == form_data.username))
 
-    if not user or not bcrypt_context.verify(form_data.password, user.hashed_password):
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Authentication failed!')
 
     token = create_access_token(user.username, user.id, timedelta(minutes=60))
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+from fastapi import APIRouter, Depends, Path, Request
+from fastapi.responses import StreamingResponse
+from schemas.user import CurrentUserResponse
+from core.security import get_current_user
+from core.utils import get_group_member
+from core.events import event_bus, Subscription, EVENTS_HEARTBEAT, EVENTS_STREAM_TIMEOUT
+from starlette import status
+from typing import Annotated
+from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+router = APIRouter(
+    prefix='/study-groups',
+    tags=['Events']
+)
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+user_dependency = Annotated[CurrentUserResponse, Depends(get_current_user)]
+
+
+def format_event(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def stream_events(request: Request, subscription: Subscription):
+    # Streams are recycled periodically so clients spread across workers and shutdowns are not held open.
+    deadline = time.monotonic() + EVENTS_STREAM_TIMEOUT
+    try:
+        yield 'retry: 3000\n\n'
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), min(EVENTS_HEARTBEAT, remaining))
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ': keep-alive\n\n'
+                continue
+
+            if event is None:
+                if subscription.evicted:
+                    yield 'event: evicted\ndata: {}\n\n'
+                break
+
+            yield format_event(event)
+
+            if event['type'] == 'member.left' and event['data'].get('user_id') == subscription.user_id:
+                break
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get('/{group_id}/events', status_code=status.HTTP_200_OK)
+async def get_group_events(db: db_dependency, user: user_dependency, request: Request, group_id: int = Path(gt=0)):
+
+    await get_group_member(db, user, group_id)
+
+    # Subscribe before the response starts so nothing committed after this point is missed.
+    subscription = event_bus.subscribe(group_id, user.user_id)
+
+    return StreamingResponse(
+        stream_events(request, subscription),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
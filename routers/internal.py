@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends
+from starlette import status
+from core.security import require_internal_access, token_cache
+from core.pool_metrics import pool_snapshot
+from core.membership_cache import membership_cache
+from core.query_metrics import query_metrics_snapshot
+from core.events import event_bus
+from core.rate_limit import rate_limit_stats
+from core.schedule import schedule_index
+from database import engine
+
+
+router = APIRouter(
+    prefix='/internal',
+    tags=['Internal'],
+    dependencies=[Depends(require_internal_access)],
+    include_in_schema=False
+)
+
+
+@router.get('/db-pool', status_code=status.HTTP_200_OK)
+async def get_db_pool_stats():
+    return pool_snapshot(engine.pool)
+
+
+@router.get('/membership-cache', status_code=status.HTTP_200_OK)
+async def get_membership_cache_stats():
+    return membership_cache.stats()
+
+
+@router.get('/auth-cache', status_code=status.HTTP_200_OK)
+async def get_auth_cache_stats():
+    return token_cache.stats()
+
+
+@router.get('/query-metrics', status_code=status.HTTP_200_OK)
+async def get_query_metrics():
+    return query_metrics_snapshot()
+
+
+@router.get('/events', status_code=status.HTTP_200_OK)
+async def get_event_stats():
+    return event_bus.stats()
+
+
+@router.get('/rate-limits', status_code=status.HTTP_200_OK)
+async def get_rate_limit_stats():
+    return rate_limit_stats()
+
+
+@router.get('/schedule-index', status_code=status.HTTP_200_OK)
+async def get_schedule_index_stats():
+    return schedule_index.stats()
@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
 from schemas.user import CurrentUserResponse, MessageResponse
+from schemas.page import Page
 from schemas.membership import MembershipResponse, MemberUpdateRequest
 from core.security import get_current_user
 from models import StudyGroup, Membership
 from starlette import status
-from typing import Annotated, List
+from typing import Annotated, Optional
 from database import get_db
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, delete, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.utils import require_role, get_group_member
+from core.membership_cache import membership_cache
+from core.etag import check_etag
+from core.pagination import encode_cursor, decode_cursor
+from core.events import event_bus
+from core.responses import FAST_RESPONSES, fast_json_response, rows_payload
+from core.queries import fetch_rows, group_members
 
 
 router = APIRouter(
     prefix='/study-groups',
     tags=['Study Groups']
 )
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 user_dependency = Annotated[CurrentUserResponse, Depends(get_current_user)]
 
+MEMBER_ROLES = Membership.__table__.c.role.type.enums
+
 
 def authorize_role_update(member_role: str, target_role: str, requested_role: str) -> None:
     require_role(member_role, ['Admin', 'Creator'])
@@ -34,34 +44,71 @@ def authorize_role_update(member_role: str, target_role: str, requested_role: st
         )
 
 
-@router.get('/{group_id}/members', status_code=status.HTTP_200_OK, response_model=List[MembershipResponse])
-async def get_members(db: db_dependency, user: user_dependency, group_id: int = Path(gt=0)):
-
-    get_group_member(db, user, group_id)
-
-    members = db.query(Membership).options(
-        joinedload(Membership.user)
-    ).filter(Membership.group_id == group_id).all()
-
-    return [
-        MembershipResponse(
-            user_id=m.user_id,
-            username=m.user.username,
-            role=m.role
-        ) for m in members
-    ]
+@router.get('/{group_id}/members', status_code=status.HTTP_200_OK, response_model=Page[MembershipResponse])
+async def get_members(
+        db: db_dependency,
+        user: user_dependency,
+        request: Request,
+        response: Response,
+        group_id: int = Path(gt=0),
+        role: Optional[str] = Query(default=None, max_length=100),
+        cursor: Optional[str] = None,
+        limit: int = Query(default=50, ge=1, le=200)
+    ):
+
+    await get_group_member(db, user, group_id)
+
+    if role and role not in MEMBER_ROLES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f'Role must be one of {list(MEMBER_ROLES)}.')
+
+    # Walks ix_memberships_group_id_role_user_id, so any page costs the same however large the group is.
+    query = group_members(group_id).order_by(Membership.role, Membership.user_id).limit(limit + 1)
+
+    if role:
+        query = query.where(Membership.role == role)
+    if cursor:
+        member_role, member_id = decode_cursor(cursor, str, int)
+        if member_role not in MEMBER_ROLES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Invalid cursor.')
+        query = query.where(tuple_(Membership.role, Membership.user_id) > (member_role, member_id))
+
+    members = await fetch_rows(db, query)
+
+    next_cursor = None
+    if len(members) > limit:
+        members = members[:limit]
+        next_cursor = encode_cursor(members[-1].role, members[-1].user_id)
+
+    # The page itself is the version, so a 304 never needs an aggregate over the whole group.
+    not_modified = check_etag(request, response, [tuple(m) for m in members], next_cursor)
+    if not_modified:
+        return not_modified
+
+    if FAST_RESPONSES:
+        return fast_json_response({'items': rows_payload(members), 'next_cursor': next_cursor}, response)
+
+    return Page(
+        items=[
+            MembershipResponse(
+                user_id=m.user_id,
+                username=m.username,
+                role=m.role
+            ) for m in members
+        ],
+        next_cursor=next_cursor
+    )
 
 
 @router.post('/{group_id}/join', status_code=status.HTTP_201_CREATED, response_model=MessageResponse)
 async def join_group(db: db_dependency, user: user_dependency, group_id: int = Path(gt=0)):
 
-    if not db.get(StudyGroup, group_id):
+    if not await db.get(StudyGroup, group_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Group not found.')
 
-    if db.query(Membership).filter(
+    if await db.scalar(select(Membership).where(
             Membership.user_id == user.user_id,
             Membership.group_id == group_id
-    ).first():
+    )):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='You are already a member of this group!')
 
     new_member = Membership(
@@ -70,8 +117,10 @@ async def join_group(db: db_dependency, user: user_dependency, group_id: int = P
     )
 
     db.add(new_member)
-    db.commit()
-    db.refresh(new_member)
+    await db.commit()
+    await db.refresh(new_member)
+    await membership_cache.invalidate(user.user_id, group_id)
+    await event_bus.publish(group_id, 'member.joined', {'user_id': user.user_id, 'role': new_member.role})
 
     return MessageResponse(
         success=True,
@@ -87,12 +136,12 @@ async def update_member_role(
         group_id: int = Path(gt=0),
         user_id: int = Path(gt=0)
 ):
-    acting_member = get_group_member(db, user, group_id)
+    acting_member = await get_group_member(db, user, group_id)
 
-    target_member = db.query(Membership).filter(
+    target_member = await db.scalar(select(Membership).where(
         Membership.user_id == user_id,
         Membership.group_id == group_id
-    ).first()
+    ))
 
     if not target_member:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Member not found in this group.')
@@ -100,8 +149,14 @@ async def update_member_role(
     authorize_role_update(acting_member.role, target_member.role, member_request.role)
 
     target_member.role = member_request.role
-    db.commit()
-    db.refresh(target_member)
+    if member_request.role == 'Creator':
+        # Groups are deleted along with their owner's account, so ownership follows the Creator role.
+        group = await db.get(StudyGroup, group_id)
+        group.owner_id = user_id
+    await db.commit()
+    await db.refresh(target_member)
+    await membership_cache.invalidate(user_id, group_id)
+    await event_bus.publish(group_id, 'member.role_updated', {'user_id': user_id, 'role': target_member.role})
 
     return MessageResponse(
         success=True,
@@ -112,10 +167,15 @@ async def update_member_role(
 @router.delete('/{group_id}/leave', status_code=status.HTTP_204_NO_CONTENT)
 async def leave_group(db: db_dependency, user: user_dependency, group_id: int = Path(gt=0)):
 
-    member = get_group_member(db, user, group_id)
+    member = await get_group_member(db, user, group_id)
 
     if member.role == 'Creator':
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Must transfer ownership first.')
 
-    db.delete(member)
-    db.commit()
+    await db.execute(delete(Membership).where(
+        Membership.user_id == user.user_id,
+        Membership.group_id == group_id
+    ))
+    await db.commit()
+    await membership_cache.invalidate(user.user_id, group_id)
+    await event_bus.publish(group_id, 'member.left', {'user_id': user.user_id})
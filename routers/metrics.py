@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from starlette import status
+from core.metrics import CONTENT_TYPE, registry
+from core.security import require_internal_access
+
+
+router = APIRouter(
+    tags=['Metrics'],
+    dependencies=[Depends(require_internal_access)],
+    include_in_schema=False
+)
+
+
+@router.get('/metrics', status_code=status.HTTP_200_OK, response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
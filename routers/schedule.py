@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from schemas.user import CurrentUserResponse
+from schemas.schedule import SessionConflict, FreeSlot
+from schemas.study_session import to_naive_utc
+from core.security import get_current_user
+from core.utils import get_group_member
+from core.schedule import check_conflicts, free_slots, session_end, Interval
+from models import Subject
+from starlette import status
+from typing import Annotated, List, Optional
+from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+router = APIRouter(
+    prefix='/study-groups',
+    tags=['Schedule']
+)
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+user_dependency = Annotated[CurrentUserResponse, Depends(get_current_user)]
+
+MAX_SLOT_SEARCH = timedelta(days=92)
+
+
+async def check_subject(db: AsyncSession, group_id: int, subject_id: Optional[int]) -> None:
+    if subject_id is None:
+        return
+    subject = await db.get(Subject, subject_id)
+    if not subject or subject.group_id != group_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Subject not found!')
+
+
+@router.get('/{group_id}/schedule/conflicts', status_code=status.HTTP_200_OK, response_model=List[SessionConflict])
+async def get_conflicts(
+        db: db_dependency,
+        user: user_dependency,
+        start: datetime,
+        group_id: int = Path(gt=0),
+        duration: int = Query(gt=0, le=24 * 60),
+        subject_id: Optional[int] = Query(default=None, gt=0),
+        exclude: Optional[int] = Query(default=None, gt=0)
+    ):
+
+    await get_group_member(db, user, group_id)
+    await check_subject(db, group_id, subject_id)
+
+    # The same check the session endpoints run, so a slot reported free here is one they accept.
+    start = to_naive_utc(start)
+    candidate = Interval(start, session_end(start, duration), None, subject_id, '')
+    [conflicts] = await check_conflicts(db, group_id, subject_id, [candidate], exclude, lock=False)
+
+    return [SessionConflict(**c._asdict()) for c in conflicts]
+
+
+@router.get('/{group_id}/schedule/free-slots', status_code=status.HTTP_200_OK, response_model=List[FreeSlot])
+async def get_free_slots(
+        db: db_dependency,
+        user: user_dependency,
+        date_from: datetime = Query(alias='from'),
+        date_to: datetime = Query(alias='to'),
+        group_id: int = Path(gt=0),
+        duration: int = Query(gt=0, le=24 * 60),
+        subject_id: Optional[int] = Query(default=None, gt=0),
+        limit: int = Query(default=20, ge=1, le=100)
+    ):
+
+    await get_group_member(db, user, group_id)
+    await check_subject(db, group_id, subject_id)
+
+    date_from, date_to = to_naive_utc(date_from), to_naive_utc(date_to)
+    if not date_from < date_to <= date_from + MAX_SLOT_SEARCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'"to" must be after "from" and at most {MAX_SLOT_SEARCH.days} days later.'
+        )
+
+    slots = await free_slots(db, group_id, date_from, date_to, duration, limit, subject_id)
+    return [FreeSlot(start=start, end=end) for start, end in slots]
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from schemas.user import CurrentUserResponse
+from schemas.search import SearchHit
+from schemas.page import Page
+from core.security import get_current_user
+from core.pagination import encode_cursor, decode_cursor
+from core.search import SEARCH_KINDS, search_hits
+from starlette import status
+from typing import Annotated, Optional
+from database import get_db
+from sqlalchemy import select, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+router = APIRouter(
+    prefix='/search',
+    tags=['Search']
+)
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+user_dependency = Annotated[CurrentUserResponse, Depends(get_current_user)]
+
+
+@router.get('/', status_code=status.HTTP_200_OK, response_model=Page[SearchHit])
+async def search(
+        db: db_dependency,
+        user: user_dependency,
+        q: str = Query(min_length=1, max_length=200),
+        kind: Optional[str] = Query(default=None, max_length=20),
+        cursor: Optional[str] = None,
+        limit: int = Query(default=20, ge=1, le=100)
+    ):
+
+    if kind and kind not in SEARCH_KINDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f'Kind must be one of {list(SEARCH_KINDS)}.')
+
+    hits = search_hits(user.user_id, q, [kind] if kind else SEARCH_KINDS)
+    query = select(hits).order_by(hits.c.rank.desc(), hits.c.kind, hits.c.id).limit(limit + 1)
+
+    if cursor:
+        rank, hit_kind, hit_id = decode_cursor(cursor, float, str, int)
+        query = query.where(or_(
+            hits.c.rank < rank,
+            and_(hits.c.rank == rank, tuple_(hits.c.kind, hits.c.id) > (hit_kind, hit_id))
+        ))
+
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].kind, rows[-1].id)
+
+    return Page(
+        items=[
+            SearchHit(kind=r.kind, id=r.id, group_id=r.group_id, subject_id=r.subject_id, title=r.title)
+            for r in rows
+        ],
+        next_cursor=next_cursor
+    )
@@ -0,0 +1,66 @@
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from schemas.user import CurrentUserResponse
+from schemas.stats import WeeklyStat
+from core.security import get_current_user
+from core.utils import get_group_member
+from core.stats import week_start
+from models import SessionStat, Subject
+from starlette import status
+from typing import Annotated, List, Optional
+from database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+router = APIRouter(
+    prefix='/study-groups',
+    tags=['Statistics']
+)
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+user_dependency = Annotated[CurrentUserResponse, Depends(get_current_user)]
+
+SESSION_STATUSES = SessionStat.__table__.c.status.type.enums
+
+
+@router.get('/{group_id}/stats/weekly', status_code=status.HTTP_200_OK, response_model=List[WeeklyStat])
+async def get_weekly_stats(
+        db: db_dependency,
+        user: user_dependency,
+        group_id: int = Path(gt=0),
+        subject_id: Optional[int] = Query(default=None, gt=0),
+        session_status: Optional[str] = Query(default=None, alias='status', max_length=100),
+        date_from: Optional[date] = Query(default=None, alias='from'),
+        date_to: Optional[date] = Query(default=None, alias='to')
+    ):
+
+    await get_group_member(db, user, group_id)
+
+    if session_status and session_status not in SESSION_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Status must be one of {list(SESSION_STATUSES)}.'
+        )
+
+    query = select(
+        SessionStat.week,
+        SessionStat.subject_id,
+        Subject.name.label('subject'),
+        SessionStat.status,
+        SessionStat.session_count,
+        SessionStat.total_minutes
+    ).join(Subject, Subject.id == SessionStat.subject_id).where(
+        SessionStat.group_id == group_id,
+        SessionStat.session_count > 0
+    ).order_by(SessionStat.week, Subject.name, SessionStat.status)
+
+    if subject_id:
+        query = query.where(SessionStat.subject_id == subject_id)
+    if session_status:
+        query = query.where(SessionStat.status == session_status)
+    if date_from:
+        query = query.where(SessionStat.week >= week_start(date_from))
+    if date_to:
+        query = query.where(SessionStat.week <= week_start(date_to))
+
+    return [WeeklyStat.model_validate(row, from_attributes=True) for row in (await db.execute(query)).all()]
@@ -1,45 +1,182 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
-from sqlalchemy import func
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from sqlalchemy import func, select, delete, tuple_, true
 from schemas.user import CurrentUserResponse
-from schemas.study_group import GroupRequest, GroupResponse
+from schemas.study_group import (
+    GroupRequest,
+    GroupResponse,
+    GroupOverviewResponse,
+    MemberCounts,
+    SubjectOverview,
+    UpcomingSession
+)
+from schemas.page import Page
 from core.security import get_current_user
 from core.utils import get_group_member, require_role
-from models import StudyGroup, Membership
+from core.pagination import encode_cursor, decode_cursor, like_prefix
+from core.membership_cache import membership_cache
+from core.etag import check_etag, check_not_modified
+from core.events import event_bus
+from core.schedule import schedule_index
+from core.search import search_index, remove_group
+from models import StudyGroup, Membership, Subject, StudySession, utc_now
 from starlette import status
-from typing import Annotated, List
+from typing import Annotated, Optional
 from database import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 router = APIRouter(
     prefix='/study-groups',
     tags=['Study Groups']
 )
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 user_dependency = Annotated[CurrentUserResponse, Depends(get_current_user)]
 
 
-@router.get('/', status_code=status.HTTP_200_OK, response_model=List[GroupResponse])
-async def get_groups(db: db_dependency):
-    return db.query(StudyGroup).all()
+@router.get('/', status_code=status.HTTP_200_OK, response_model=Page[GroupResponse])
+async def get_groups(
+        db: db_dependency,
+        request: Request,
+        response: Response,
+        name: Optional[str] = Query(default=None, min_length=1, max_length=250),
+        cursor: Optional[str] = None,
+        limit: int = Query(default=20, ge=1, le=100)
+    ):
+
+    query = select(StudyGroup).order_by(StudyGroup.created_at, StudyGroup.id).limit(limit + 1)
+
+    if name:
+        query = query.where(func.lower(StudyGroup.name).like(like_prefix(name.lower()), escape='/'))
+
+    if cursor:
+        created_at, group_id = decode_cursor(cursor, datetime, int)
+        query = query.where(tuple_(StudyGroup.created_at, StudyGroup.id) > (created_at, group_id))
+
+    groups = (await db.scalars(query)).all()
+
+    next_cursor = None
+    if len(groups) > limit:
+        groups = groups[:limit]
+        next_cursor = encode_cursor(groups[-1].created_at, groups[-1].id)
+
+    # Tagging the page itself keeps a 304 as cheap as the keyset query, with or without a name filter.
+    not_modified = check_etag(request, response, [(g.id, g.updated_at) for g in groups], next_cursor)
+    if not_modified:
+        return not_modified
+
+    return Page(items=groups, next_cursor=next_cursor)
 
 
 @router.get('/{group_id}', status_code=status.HTTP_200_OK, response_model=GroupResponse)
-async def get_group_by_id(db: db_dependency, group_id: int = Path(gt=0)):
+async def get_group_by_id(db: db_dependency, request: Request, response: Response, group_id: int = Path(gt=0)):
+
+    not_modified = await check_not_modified(db, request, response, select(
+        func.count(), func.max(StudyGroup.updated_at)
+    ).where(StudyGroup.id == group_id))
+    if not_modified:
+        return not_modified
 
-    group = db.get(StudyGroup, group_id)
+    group = await db.get(StudyGroup, group_id)
     if group is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Group not found!')
 
     return group
 
 
+@router.get('/{group_id}/overview', status_code=status.HTTP_200_OK, response_model=GroupOverviewResponse)
+async def get_group_overview(
+        db: db_dependency,
+        user: user_dependency,
+        group_id: int = Path(gt=0),
+        upcoming: int = Query(default=5, ge=1, le=50)
+    ):
+
+    await get_group_member(db, user, group_id)
+
+    roles = select(
+        func.count().label('total'),
+        func.count().filter(Membership.role == 'Creator').label('creators'),
+        func.count().filter(Membership.role == 'Admin').label('admins'),
+        func.count().filter(Membership.role == 'Member').label('members')
+    ).where(Membership.group_id == group_id).subquery()
+
+    subject_stats = select(
+        Subject.id.label('subject_id'),
+        Subject.name,
+        func.count(StudySession.id).label('session_count'),
+        func.coalesce(func.sum(StudySession.duration).filter(StudySession.status == 'Scheduled'), 0).label('scheduled_minutes')
+    ).outerjoin(StudySession, StudySession.subject_id == Subject.id).where(
+        Subject.group_id == group_id
+    ).group_by(Subject.id, Subject.name).subquery()
+
+    rows = (await db.execute(
+        select(
+            StudyGroup.name.label('group_name'),
+            StudyGroup.description,
+            StudyGroup.created_at,
+            roles,
+            subject_stats,
+            func.sum(subject_stats.c.session_count).over().label('group_session_count'),
+            func.sum(subject_stats.c.scheduled_minutes).over().label('group_scheduled_minutes')
+        ).select_from(StudyGroup).join(roles, true()).outerjoin(subject_stats, true()).where(
+            StudyGroup.id == group_id
+        ).order_by(subject_stats.c.name)
+    )).all()
+
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Group not found.')
+
+    upcoming_rows = (await db.execute(
+        select(
+            StudySession.id.label('session_id'),
+            StudySession.title,
+            StudySession.date_time,
+            StudySession.duration,
+            StudySession.status,
+            StudySession.subject_id,
+            Subject.name.label('subject'),
+            func.count().over().label('upcoming_total')
+        ).join(Subject, Subject.id == StudySession.subject_id).where(
+            Subject.group_id == group_id,
+            StudySession.date_time >= utc_now(),
+            StudySession.status != 'Cancelled'
+        ).order_by(StudySession.date_time, StudySession.id).limit(upcoming)
+    )).all()
+
+    group = rows[0]
+    return GroupOverviewResponse(
+        name=group.group_name,
+        description=group.description,
+        created_at=group.created_at,
+        member_counts=MemberCounts(
+            total=group.total,
+            creators=group.creators,
+            admins=group.admins,
+            members=group.members
+        ),
+        subjects=[
+            SubjectOverview(
+                subject_id=row.subject_id,
+                name=row.name,
+                session_count=row.session_count,
+                scheduled_minutes=row.scheduled_minutes
+            )
+            for row in rows if row.subject_id is not None
+        ],
+        session_count=int(group.group_session_count or 0),
+        scheduled_minutes=int(group.group_scheduled_minutes or 0),
+        upcoming_total=upcoming_rows[0].upcoming_total if upcoming_rows else 0,
+        upcoming_sessions=[UpcomingSession.model_validate(row, from_attributes=True) for row in upcoming_rows]
+    )
+
+
 @router.post('/', status_code=status.HTTP_201_CREATED, response_model=GroupResponse)
 async def create_group(db: db_dependency, user: user_dependency, group_request: GroupRequest):
 
-    group_exists = db.query(StudyGroup).filter(
+    group_exists = await db.scalar(select(StudyGroup.id).where(
         func.lower(StudyGroup.name) == func.lower(group_request.name)
-    ).first()
+    ))
 
     if group_exists:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Study group name already exists!')
@@ -51,7 +188,8 @@ async def create_group(db: db_dependency, user: user_dependency, group_request:
     )
 
     db.add(group)
-    db.flush()
+    await db.flush()
+    await search_index.index(db, 'group', [group.id])
 
     creator = Membership(
         user_id=user.user_id,
@@ -60,8 +198,8 @@ async def create_group(db: db_dependency, user: user_dependency, group_request:
     )
 
     db.add(creator)
-    db.commit()
-    db.refresh(group)
+    await db.commit()
+    await db.refresh(group)
 
     return group
 
@@ -69,30 +207,35 @@ async def create_group(db: db_dependency, user: user_dependency, group_request:
 @router.put('/{group_id}', status_code=status.HTTP_200_OK)
 async def update_group(db: db_dependency, user: user_dependency, group_request: GroupRequest, group_id: int):
 
-    member = get_group_member(db, user, group_id)
+    member = await get_group_member(db, user, group_id)
     require_role(member.role, ['Creator', 'Admin'])
 
-    group_exists = db.query(StudyGroup).filter(
+    group_exists = await db.scalar(select(StudyGroup.id).where(
         func.lower(StudyGroup.name) == func.lower(group_request.name),
         StudyGroup.id != group_id
-    ).first()
+    ))
 
     if group_exists:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Study group name already exists!')
 
-    group = db.get(StudyGroup, group_id)
+    group = await db.get(StudyGroup, group_id)
     group.name = group_request.name
     group.description = group_request.description
+    await search_index.index(db, 'group', [group_id])
 
-    db.commit()
-    db.refresh(group)
+    await db.commit()
+    await db.refresh(group)
+    await event_bus.publish(group_id, 'group.updated', {'name': group.name, 'description': group.description})
 
 
 @router.delete('/{group_id}', status_code=status.HTTP_204_NO_CONTENT)
 async def delete_group(db: db_dependency, user: user_dependency, group_id: int = Path(gt=0)):
-    member = get_group_member(db, user, group_id)
+    member = await get_group_member(db, user, group_id)
     require_role(member.role, ['Creator', 'Admin'])
 
-    group = db.get(StudyGroup, group_id)
-    db.delete(group)
-    db.commit()
\ No newline at end of file
+    await remove_group(db, group_id)
+    await db.execute(delete(StudyGroup).where(StudyGroup.id == group_id))
+    await db.commit()
+    await membership_cache.invalidate_group(group_id)
+    schedule_index.invalidate(group_id)
+    await event_bus.publish(group_id, 'group.deleted', {})
\ No newline at end of file
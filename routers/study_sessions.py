@@ -1,55 +1,241 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from schemas.user import CurrentUserResponse
-from schemas.study_session import SessionResponse, SessionRequest, SessionUpdateRequest
+from schemas.study_session import (
+    SessionResponse,
+    SessionRequest,
+    SessionUpdateRequest,
+    BulkSessionItem,
+    BulkSessionRequest,
+    BulkSessionError,
+    BulkSessionResponse,
+    MAX_BULK_SESSIONS,
+    to_naive_utc
+)
+from schemas.page import Page
+from schemas.schedule import SessionConflict
 from core.security import get_current_user
 from core.utils import get_group_member, require_role
+from core.pagination import encode_cursor, decode_cursor
+from core.stats import StatsDelta
+from core.schedule import Interval, check_conflicts, schedule_index, session_end
+from core.search import search_index
+from core.etag import check_etag
+from core.events import event_bus
+from core.responses import FAST_RESPONSES, fast_json_response
+from core.export import EXPORT_FORMATS, export_query, export_sessions
 from models import Subject, StudySession
 from starlette import status
-from typing import Annotated, List
+from typing import Annotated, Optional
+from pydantic import ValidationError
 from database import get_db
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, insert, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 router = APIRouter(
     prefix='/study-groups',
     tags=['Study Groups']
 )
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 user_dependency = Annotated[CurrentUserResponse, Depends(get_current_user)]
 
+SESSION_STATUSES = StudySession.__table__.c.status.type.enums
+RECURRENCE_STEPS = {'daily': timedelta(days=1), 'weekly': timedelta(weeks=1)}
+
+
+def expand_recurrence(item: BulkSessionItem) -> list[datetime]:
+    if item.recurrence is None:
+        return [item.date_time]
+
+    step = RECURRENCE_STEPS[item.recurrence.frequency] * item.recurrence.interval
+    return [item.date_time + step * i for i in range(item.recurrence.count)]
+
+
+def validate_bulk_sessions(raw_sessions: list[dict]) -> tuple[list, list[BulkSessionError]]:
+    occurrences, errors = [], []
+
+    for index, raw in enumerate(raw_sessions):
+        try:
+            item = BulkSessionItem.model_validate(raw)
+        except ValidationError as e:
+            errors.append(BulkSessionError(
+                index=index,
+                errors=[f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()]
+            ))
+            continue
+
+        if item.status not in SESSION_STATUSES:
+            errors.append(BulkSessionError(index=index, errors=[f'status: must be one of {list(SESSION_STATUSES)}']))
+            continue
+
+        occurrences.extend((item, date_time) for date_time in expand_recurrence(item))
+
+    if len(occurrences) > MAX_BULK_SESSIONS:
+        errors.append(BulkSessionError(
+            index=-1,
+            errors=[f'A batch may create at most {MAX_BULK_SESSIONS} sessions, got {len(occurrences)}.']
+        ))
+
+    return occurrences, errors
+
+
+def session_interval(subject_id: int, title: str, date_time: datetime, duration: int) -> Interval:
+    return Interval(date_time, session_end(date_time, duration), None, subject_id, title)
+
+
+def conflict_payload(conflicts: list[Interval]) -> list[dict]:
+    return [SessionConflict(**c._asdict()).model_dump(mode='json') for c in conflicts]
+
+
+def overlap_error(detail) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+def session_event(session: StudySession) -> dict:
+    return {
+        'session_id': session.id,
+        'subject_id': session.subject_id,
+        'title': session.title,
+        'date_time': session.date_time,
+        'duration': session.duration,
+        'status': session.status
+    }
+
+
+# Declared before the per-subject routes so that 'export' is not taken for a subject id.
+@router.get('/{group_id}/study_sessions/export', status_code=status.HTTP_200_OK)
+async def export_group_sessions(
+        db: db_dependency,
+        user: user_dependency,
+        group_id: int = Path(gt=0),
+        export_format: str = Query(default='ndjson', alias='format', max_length=10),
+        date_from: Optional[datetime] = Query(default=None, alias='from'),
+        date_to: Optional[datetime] = Query(default=None, alias='to'),
+        session_status: Optional[str] = Query(default=None, alias='status', max_length=100)
+    ):
+
+    await get_group_member(db, user, group_id)
+
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Format must be one of {list(EXPORT_FORMATS)}.'
+        )
+    # Checked up front: once the body starts streaming, a failing query can only cut it short.
+    if session_status and session_status not in SESSION_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Status must be one of {list(SESSION_STATUSES)}.'
+        )
+
+    query = export_query(
+        group_id,
+        to_naive_utc(date_from) if date_from else None,
+        to_naive_utc(date_to) if date_to else None,
+        session_status
+    )
+
+    return StreamingResponse(
+        export_sessions(query, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="group-{group_id}-sessions.{export_format}"'}
+    )
+
 
 @router.get(
     '/{group_id}/study_sessions/{subject_id}',
     status_code=status.HTTP_200_OK,
-    response_model=List[SessionResponse]
+    response_model=Page[SessionResponse]
     )
 async def get_sessions_by_subject(
         db: db_dependency,
         user: user_dependency,
+        request: Request,
+        response: Response,
         group_id: int = Path(gt=0),
-        subject_id: int = Path(gt=0)
+        subject_id: int = Path(gt=0),
+        date_from: Optional[datetime] = Query(default=None, alias='from'),
+        date_to: Optional[datetime] = Query(default=None, alias='to'),
+        session_status: Optional[str] = Query(default=None, alias='status', max_length=100),
+        cursor: Optional[str] = None,
+        limit: int = Query(default=50, ge=1, le=200)
     ):
 
-    get_group_member(db, user, group_id)
+    await get_group_member(db, user, group_id)
 
-    subject = db.get(Subject, subject_id)
+    if session_status and session_status not in SESSION_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Status must be one of {list(SESSION_STATUSES)}.'
+        )
+
+    subject = await db.get(Subject, subject_id)
     if not subject or subject.group_id != group_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Subject not found!')
 
-    sessions = db.query(StudySession).options(
-        joinedload(StudySession.subject)
-    ).filter(StudySession.subject_id == subject_id).all()
-
-    return [
-        SessionResponse(
-            title=s.title,
-            description=s.description,
-            date_time=s.date_time,
-            duration=s.duration,
-            status=s.status,
-            subject=s.subject.name
-        ) for s in sessions
-    ]
+    query = select(
+        StudySession.id,
+        StudySession.title,
+        StudySession.description,
+        StudySession.date_time,
+        StudySession.duration,
+        StudySession.status,
+        StudySession.updated_at
+    ).where(
+        StudySession.subject_id == subject_id
+    ).order_by(StudySession.date_time, StudySession.id).limit(limit + 1)
+
+    if date_from:
+        query = query.where(StudySession.date_time >= to_naive_utc(date_from))
+    if date_to:
+        query = query.where(StudySession.date_time < to_naive_utc(date_to))
+    if session_status:
+        query = query.where(StudySession.status == session_status)
+    if cursor:
+        date_time, session_id = decode_cursor(cursor, datetime, int)
+        query = query.where(tuple_(StudySession.date_time, StudySession.id) > (date_time, session_id))
+
+    sessions = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        next_cursor = encode_cursor(sessions[-1].date_time, sessions[-1].id)
+
+    not_modified = check_etag(request, response, subject.name, [(s.id, s.updated_at) for s in sessions], next_cursor)
+    if not_modified:
+        return not_modified
+
+    if FAST_RESPONSES:
+        return fast_json_response({
+            'items': [
+                {
+                    'title': s.title,
+                    'description': s.description,
+                    'date_time': s.date_time,
+                    'duration': s.duration,
+                    'status': s.status,
+                    'subject': subject.name
+                } for s in sessions
+            ],
+            'next_cursor': next_cursor
+        }, response)
+
+    return Page(
+        items=[
+            SessionResponse(
+                title=s.title,
+                description=s.description,
+                date_time=s.date_time,
+                duration=s.duration,
+                status=s.status,
+                subject=subject.name
+            ) for s in sessions
+        ],
+        next_cursor=next_cursor
+    )
 
 
 @router.post(
@@ -64,13 +250,29 @@ async def create_session(
         subject_id: int = Path(gt=0)
     ):
 
-    subject = db.get(Subject, subject_id)
+    subject = await db.get(Subject, subject_id)
     if not subject or subject.group_id != group_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Subject not found!')
 
-    member = get_group_member(db, user, group_id)
+    member = await get_group_member(db, user, group_id)
     require_role(member.role, ['Admin', 'Creator'])
 
+    if session_request.status not in SESSION_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Status must be one of {list(SESSION_STATUSES)}.'
+        )
+
+    if session_request.status != 'Cancelled':
+        [conflicts] = await check_conflicts(db, group_id, subject_id, [session_interval(
+            subject_id, session_request.title, session_request.date_time, session_request.duration
+        )])
+        if conflicts:
+            raise overlap_error({
+                'message': 'The session overlaps other sessions.',
+                'conflicts': conflict_payload(conflicts)
+            })
+
     new_session = StudySession(
         title=session_request.title,
         description=session_request.description,
@@ -82,14 +284,86 @@ async def create_session(
     )
 
     db.add(new_session)
-    db.commit()
-    db.refresh(new_session)
+    await db.flush()
+    await search_index.index(db, 'session', [new_session.id])
+
+    stats = StatsDelta(group_id)
+    stats.add(subject_id, new_session.date_time, new_session.status, new_session.duration)
+    await stats.apply(db)
+
+    await db.commit()
+    await db.refresh(new_session)
+    schedule_index.invalidate(group_id)
+    await event_bus.publish(group_id, 'session.created', session_event(new_session))
 
     return {
         'success': 'Study Session successfully created.'
     }
 
 
+@router.post(
+    '/{group_id}/study_sessions/{subject_id}/bulk',
+    status_code=status.HTTP_201_CREATED,
+    response_model=BulkSessionResponse
+    )
+async def create_sessions_bulk(
+        db: db_dependency,
+        user: user_dependency,
+        bulk_request: BulkSessionRequest,
+        group_id: int = Path(gt=0),
+        subject_id: int = Path(gt=0)
+    ):
+
+    subject = await db.get(Subject, subject_id)
+    if not subject or subject.group_id != group_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Subject not found!')
+
+    member = await get_group_member(db, user, group_id)
+    require_role(member.role, ['Admin', 'Creator'])
+
+    occurrences, errors = validate_bulk_sessions(bulk_request.sessions)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors]
+        )
+
+    scheduled = [(item, date_time) for item, date_time in occurrences if item.status != 'Cancelled']
+    candidates = [session_interval(subject_id, item.title, date_time, item.duration) for item, date_time in scheduled]
+    overlaps = [
+        {'title': candidate.title, 'start': candidate.start.isoformat(), 'conflicts': conflict_payload(conflicts)}
+        for candidate, conflicts in zip(candidates, await check_conflicts(db, group_id, subject_id, candidates))
+        if conflicts
+    ]
+    if overlaps:
+        raise overlap_error(overlaps)
+
+    session_ids = await db.scalars(insert(StudySession).returning(StudySession.id), [
+        {
+            'title': item.title,
+            'description': item.description,
+            'date_time': date_time,
+            'duration': item.duration,
+            'status': item.status,
+            'subject_id': subject_id,
+            'created_by': user.user_id
+        }
+        for item, date_time in occurrences
+    ])
+    await search_index.index(db, 'session', session_ids.all())
+
+    stats = StatsDelta(group_id)
+    for item, date_time in occurrences:
+        stats.add(subject_id, date_time, item.status, item.duration)
+    await stats.apply(db)
+
+    await db.commit()
+    schedule_index.invalidate(group_id)
+    await event_bus.publish(group_id, 'sessions.created', {'subject_id': subject_id, 'created': len(occurrences)})
+
+    return BulkSessionResponse(success=True, created=len(occurrences))
+
+
 @router.put(
     '/{group_id}/study_sessions/{subject_id}/{session_id}',
     status_code=status.HTTP_200_OK,
@@ -104,22 +378,57 @@ async def update_session(
         session_id: int = Path(gt=0)
     ):
 
-    subject = db.get(Subject, subject_id)
+    subject = await db.get(Subject, subject_id)
     if not subject or subject.group_id != group_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Subject not found!')
 
-    member = get_group_member(db, user, group_id)
+    member = await get_group_member(db, user, group_id)
     require_role(member.role, ['Admin', 'Creator'])
 
-    session = db.query(StudySession).filter(
+    if session_update_request.status not in SESSION_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Status must be one of {list(SESSION_STATUSES)}.'
+        )
+
+    session = await db.scalar(select(StudySession).where(
         StudySession.subject_id == subject_id,
         StudySession.id == session_id
-        ).first()
+        ))
     if session is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Study Session not found!')
 
-    for field, value in session_update_request.model_dump(exclude_unset=True).items():
+    stats = StatsDelta(group_id)
+    stats.remove(subject_id, session.date_time, session.status, session.duration)
+
+    updates = session_update_request.model_dump(exclude_unset=True)
+    for field, value in updates.items():
         setattr(session, field, value)
 
-    db.commit()
-    db.refresh(session)
\ No newline at end of file
+    if session.status != 'Cancelled' and updates.keys() & {'date_time', 'duration', 'status'}:
+        [conflicts] = await check_conflicts(db, group_id, subject_id, [session_interval(
+            subject_id, session.title, session.date_time, session.duration
+        )], exclude_id=session.id)
+        if conflicts:
+            raise overlap_error({
+                'message': 'The session overlaps other sessions.',
+                'conflicts': conflict_payload(conflicts)
+            })
+
+    stats.add(subject_id, session.date_time, session.status, session.duration)
+    await stats.apply(db)
+    await search_index.index(db, 'session', [session.id])
+
+    await db.commit()
+    await db.refresh(session)
+    schedule_index.invalidate(group_id)
+    await event_bus.publish(group_id, 'session.updated', session_event(session))
+
+    return SessionResponse(
+        title=session.title,
+        description=session.description,
+        date_time=session.date_time,
+        duration=session.duration,
+        status=session.status,
+        subject=subject.name
+    )
\ No newline at end of file
@@ -1,33 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, Response
 from schemas.user import CurrentUserResponse
 from schemas.subject import SubjectResponse, SubjectRequest
 from core.security import get_current_user
 from core.utils import get_group_member, require_role
+from core.etag import check_not_modified
+from core.events import event_bus
+from core.schedule import schedule_index
+from core.search import search_index, remove_subject
+from core.responses import FAST_RESPONSES, fast_json_response, rows_payload
+from core.queries import fetch_rows, group_subjects
 from models import Subject
 from starlette import status
 from typing import Annotated, List
 from database import get_db
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 router = APIRouter(
     prefix='/study-groups',
     tags=['Study Groups']
 )
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 user_dependency = Annotated[CurrentUserResponse, Depends(get_current_user)]
 
 
 @router.get('/{group_id}/subjects', status_code=status.HTTP_200_OK, response_model=List[SubjectResponse])
-async def get_subjects(db: db_dependency, user: user_dependency, group_id: int = Path(gt=0)):
+async def get_subjects(
+        db: db_dependency,
+        user: user_dependency,
+        request: Request,
+        response: Response,
+        group_id: int = Path(gt=0)
+    ):
 
-    get_group_member(db, user, group_id)
+    await get_group_member(db, user, group_id)
 
-    subjects = db.query(Subject).filter(
-        Subject.group_id == group_id
-    ).all()
+    not_modified = await check_not_modified(db, request, response, select(
+        func.count(), func.max(Subject.updated_at)
+    ).where(Subject.group_id == group_id))
+    if not_modified:
+        return not_modified
 
-    return subjects
+    subjects = await fetch_rows(db, group_subjects(group_id))
+
+    if FAST_RESPONSES:
+        return fast_json_response(rows_payload(subjects), response)
+
+    return [SubjectResponse(name=s.name, group_id=s.group_id) for s in subjects]
 
 
 @router.post('/{group_id}/subjects', status_code=status.HTTP_201_CREATED, response_model=SubjectResponse)
@@ -38,13 +58,13 @@ async def create_subject(
         group_id: int = Path(gt=0),
     ):
 
-    member = get_group_member(db, user, group_id)
+    member = await get_group_member(db, user, group_id)
     require_role(member.role, ['Admin', 'Creator'])
 
-    if db.query(Subject).filter(
+    if await db.scalar(select(Subject.id).where(
         Subject.name == subject_request.name,
         Subject.group_id == group_id
-    ).first():
+    )):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail='Duplicate subject is not allowed.'
@@ -55,8 +75,11 @@ async def create_subject(
         group_id=group_id
     )
     db.add(new_subject)
-    db.commit()
-    db.refresh(new_subject)
+    await db.flush()
+    await search_index.index(db, 'subject', [new_subject.id])
+    await db.commit()
+    await db.refresh(new_subject)
+    await event_bus.publish(group_id, 'subject.created', {'subject_id': new_subject.id, 'name': new_subject.name})
 
     return new_subject
 
@@ -69,13 +92,18 @@ async def delete_subject(
         subject_id: int = Path(gt=0)
     ):
 
-    member = get_group_member(db, user, group_id)
+    member = await get_group_member(db, user, group_id)
     require_role(member.role, ['Admin', 'Creator'])
 
-    subject = db.get(Subject, subject_id)
+    await remove_subject(db, subject_id)
+    result = await db.execute(delete(Subject).where(
+        Subject.id == subject_id,
+        Subject.group_id == group_id
+    ))
 
-    if subject is None or subject.group_id != group_id:
+    if result.rowcount == 0:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Subject not found.')
 
-    db.delete(subject)
-    db.commit()
+    await db.commit()
+    schedule_index.invalidate(group_id)
+    await event_bus.publish(group_id, 'subject.deleted', {'subject_id': subject_id})
@@ -4,89 +4,169 @@ from schemas.user import (
     ChangePassRequest,
     DeleteAccountRequest,
     MembershipResponse,
-    MessageResponse
+    MessageResponse,
+    UserUpcomingSession
 )
-from fastapi import APIRouter, Depends, HTTPException
-from core.security import get_current_user, bcrypt_context
-from models import User, Membership
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from core.security import get_current_user
+from core.hashing import password_hasher
+from core.rate_limit import password_user_limit
+from core.membership_cache import membership_cache
+from core.stats import remove_sessions_created_by
+from core.schedule import schedule_index
+from core.search import remove_user, remove_group
+from core.events import event_bus
+from core.pagination import encode_cursor, decode_cursor
+from core.responses import FAST_RESPONSES, fast_json_response, rows_payload
+from core.queries import fetch_rows, user_memberships
+from schemas.page import Page
+from models import User, Membership, StudyGroup, Subject, StudySession, utc_now
 from starlette import status
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from database import get_db
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, delete, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 router = APIRouter(
     prefix='/user',
     tags=['User']
 )
-db_dependency = Annotated[Session, Depends(get_db)]
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
 user_dependency = Annotated[CurrentUserResponse, Depends(get_current_user)]
 
 
+async def limit_password_attempts(user: user_dependency) -> None:
+    await password_user_limit.check(user.user_id)
+
+
 @router.get('/', status_code=status.HTTP_200_OK, response_model=CurrentUserResponse)
 async def get_user_profile(user: user_dependency):
     return user
 
 
 @router.get('/memberships', status_code=status.HTTP_200_OK, response_model=List[MembershipResponse])
-async def get_memberships(db: db_dependency, user: user_dependency):
-    memberships = db.query(Membership).options(
-        joinedload(Membership.group)
-    ).filter(Membership.user_id == user.user_id).all()
+async def get_memberships(db: db_dependency, user: user_dependency, response: Response):
+    memberships = await fetch_rows(db, user_memberships(user.user_id))
+
+    if FAST_RESPONSES:
+        return fast_json_response(rows_payload(memberships), response)
 
     return [
         MembershipResponse(
             group_id=m.group_id,
-            group_name=m.group.name,
+            group_name=m.group_name,
             role=m.role
         )
         for m in memberships
     ]
 
 
-@router.put('/email', status_code=status.HTTP_200_OK, response_model=MessageResponse)
+@router.get('/upcoming', status_code=status.HTTP_200_OK, response_model=Page[UserUpcomingSession])
+async def get_upcoming_sessions(
+        db: db_dependency,
+        user: user_dependency,
+        cursor: Optional[str] = None,
+        limit: int = Query(default=20, ge=1, le=100)
+    ):
+
+    query = select(
+        StudySession.id.label('session_id'),
+        StudySession.title,
+        StudySession.date_time,
+        StudySession.duration,
+        StudySession.status,
+        StudySession.subject_id,
+        Subject.name.label('subject'),
+        StudyGroup.id.label('group_id'),
+        StudyGroup.name.label('group_name')
+    ).select_from(Membership).join(
+        Subject, Subject.group_id == Membership.group_id
+    ).join(
+        StudySession, StudySession.subject_id == Subject.id
+    ).join(
+        StudyGroup, StudyGroup.id == Membership.group_id
+    ).where(
+        Membership.user_id == user.user_id,
+        StudySession.date_time >= utc_now(),
+        StudySession.status != 'Cancelled'
+    ).order_by(StudySession.date_time, StudySession.id).limit(limit + 1)
+
+    if cursor:
+        date_time, session_id = decode_cursor(cursor, datetime, int)
+        query = query.where(tuple_(StudySession.date_time, StudySession.id) > (date_time, session_id))
+
+    sessions = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        next_cursor = encode_cursor(sessions[-1].date_time, sessions[-1].session_id)
+
+    return Page(
+        items=[UserUpcomingSession.model_validate(s, from_attributes=True) for s in sessions],
+        next_cursor=next_cursor
+    )
+
+
+@router.put('/email', status_code=status.HTTP_200_OK, response_model=MessageResponse,
+            dependencies=[Depends(limit_password_attempts)])
 async def update_email(db: db_dependency, user: user_dependency, email_request: ChangeEmailRequest):
 
-    db_user = db.get(User, user.user_id)
+    db_user = await db.get(User, user.user_id)
 
-    if not bcrypt_context.verify(email_request.password, db_user.hashed_password):
+    if not await password_hasher.verify(email_request.password, db_user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Incorrect password!')
 
-    email_exists = db.query(User).filter(User.email == email_request.new_email).first()
+    email_exists = await db.scalar(select(User.id).where(User.email == email_request.new_email))
     if email_exists:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Email already exists!')
 
     db_user.email = email_request.new_email
-    db.commit()
+    await db.commit()
     return MessageResponse(
         success=True,
         message=f'Email successfully updated to {db_user.email}'
     )
 
 
-@router.put('/password', status_code=status.HTTP_200_OK, response_model=MessageResponse)
+@router.put('/password', status_code=status.HTTP_200_OK, response_model=MessageResponse,
+            dependencies=[Depends(limit_password_attempts)])
 async def update_password(db: db_dependency, user: user_dependency, password_request: ChangePassRequest):
 
-    db_user = db.get(User, user.user_id)
+    db_user = await db.get(User, user.user_id)
 
-    if not bcrypt_context.verify(password_request.old_password, db_user.hashed_password):
+    if not await password_hasher.verify(password_request.old_password, db_user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Incorrect password!')
 
-    db_user.hashed_password = bcrypt_context.hash(password_request.new_password)
-    db.commit()
+    db_user.hashed_password = await password_hasher.hash(password_request.new_password)
+    await db.commit()
     return MessageResponse(
         success=True,
         message='Password successfully updated.'
     )
 
 
-@router.delete('/me', status_code=status.HTTP_204_NO_CONTENT)
+@router.delete('/me', status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(limit_password_attempts)])
 async def delete_account(db: db_dependency, user: user_dependency, delete_acc_request: DeleteAccountRequest) -> None:
 
-    db_user = db.get(User, user.user_id)
+    db_user = await db.get(User, user.user_id)
 
-    if not bcrypt_context.verify(delete_acc_request.password, db_user.hashed_password):
+    if not await password_hasher.verify(delete_acc_request.password, db_user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Incorrect password!')
 
-    db.delete(db_user)
-    db.commit()
\ No newline at end of file
+    # The groups this user owns are removed with the account through the owner_id cascade.
+    owned_groups = (await db.scalars(select(StudyGroup.id).where(StudyGroup.owner_id == user.user_id))).all()
+    for group_id in owned_groups:
+        await remove_group(db, group_id)
+
+    await remove_user(db, user.user_id)
+    await remove_sessions_created_by(db, user.user_id)
+    await db.execute(delete(User).where(User.id == user.user_id))
+    await db.commit()
+    await membership_cache.invalidate_user(user.user_id)
+    for group_id in owned_groups:
+        await membership_cache.invalidate_group(group_id)
+        await event_bus.publish(group_id, 'group.deleted', {})
+    schedule_index.clear()
\ No newline at end of file
@@ -0,0 +1,16 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class SessionConflict(BaseModel):
+    session_id: Optional[int]
+    subject_id: int
+    title: str
+    start: datetime
+    end: datetime
+
+
+class FreeSlot(BaseModel):
+    start: datetime
+    end: datetime
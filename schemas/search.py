@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    kind: str
+    id: int
+    group_id: int
+    subject_id: Optional[int] = None
+    title: str
@@ -0,0 +1,11 @@
+from datetime import date
+from pydantic import BaseModel
+
+
+class WeeklyStat(BaseModel):
+    week: date
+    subject_id: int
+    subject: str
+    status: str
+    session_count: int
+    total_minutes: int
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel, Field, constr
 
 
@@ -14,4 +15,40 @@ class GroupResponse(BaseModel):
 
     model_config = {
         "from_attributes": True
-    }
\ No newline at end of file
+    }
+
+
+class MemberCounts(BaseModel):
+    total: int
+    creators: int
+    admins: int
+    members: int
+
+
+class SubjectOverview(BaseModel):
+    subject_id: int
+    name: str
+    session_count: int
+    scheduled_minutes: int
+
+
+class UpcomingSession(BaseModel):
+    session_id: int
+    title: str
+    date_time: datetime
+    duration: int
+    status: str
+    subject_id: int
+    subject: str
+
+
+class GroupOverviewResponse(BaseModel):
+    name: str
+    description: Optional[str]
+    created_at: datetime
+    member_counts: MemberCounts
+    subjects: List[SubjectOverview]
+    session_count: int
+    scheduled_minutes: int
+    upcoming_total: int
+    upcoming_sessions: List[UpcomingSession]
@@ -1,6 +1,17 @@
-from typing import Optional
-from pydantic import BaseModel, Field, constr
-from datetime import datetime
+from typing import Annotated, Any, Dict, List, Literal, Optional
+from pydantic import AfterValidator, BaseModel, Field, constr
+from datetime import datetime, timezone
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+UTCDateTime = Annotated[datetime, AfterValidator(to_naive_utc)]
+
+MAX_BULK_SESSIONS = 500
 
 
 class SessionResponse(BaseModel):
@@ -19,7 +30,7 @@ class SessionResponse(BaseModel):
 class SessionRequest(BaseModel):
     title: constr(min_length=3, max_length=250)
     description: str
-    date_time: datetime = Field(examples=["2025-12-25T10:00:00"])
+    date_time: UTCDateTime = Field(examples=["2025-12-25T10:00:00"])
     duration: int = Field(gt=0)
     status: str = Field(max_length=100)
 
@@ -27,6 +38,30 @@ class SessionRequest(BaseModel):
 class SessionUpdateRequest(BaseModel):
     title: Optional[constr(min_length=3, max_length=250)]
     description: Optional[str]
-    date_time: Optional[datetime]
+    date_time: Optional[UTCDateTime]
     duration: Optional[int] = Field(gt=0)
     status: Optional[str]
+
+
+class RecurrenceRule(BaseModel):
+    frequency: Literal['daily', 'weekly']
+    interval: int = Field(default=1, gt=0, le=52)
+    count: int = Field(gt=0, le=MAX_BULK_SESSIONS, examples=[14])
+
+
+class BulkSessionItem(SessionRequest):
+    recurrence: Optional[RecurrenceRule] = None
+
+
+class BulkSessionRequest(BaseModel):
+    sessions: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_BULK_SESSIONS)
+
+
+class BulkSessionError(BaseModel):
+    index: int
+    errors: List[str]
+
+
+class BulkSessionResponse(BaseModel):
+    success: bool
+    created: int
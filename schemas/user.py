@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, constr, EmailStr
 from datetime import datetime
+from schemas.study_group import UpcomingSession
 
 
 class CreateUserRequest(BaseModel):
@@ -29,6 +30,12 @@ class MembershipResponse(BaseModel):
     group_name: str
     role: str
 
+
+class UserUpcomingSession(UpcomingSession):
+    group_id: int
+    group_name: str
+
+
 class MessageResponse(BaseModel):
     success: bool
     message: str
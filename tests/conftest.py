@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ['URL'] = f'sqlite:///{tempfile.mkdtemp(prefix="studyhub-test-")}/test.db'
+os.environ.setdefault('KEY', 'test-secret')
+os.environ['SCHEMA_CHECK'] = 'off'
+os.environ['RATE_LIMIT_ENABLED'] = 'false'
+
+import httpx
+import pytest
+import models
+from core.membership_cache import membership_cache
+from core.schedule import schedule_index
+from core.security import token_cache
+from database import engine
+from main import app
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+async def client():
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.drop_all)
+        await conn.run_sync(models.Base.metadata.create_all)
+
+    # Ids restart with every schema, so nothing cached by an earlier test may survive.
+    membership_cache.cache.clear()
+    membership_cache.generations.clear()
+    schedule_index.clear()
+    token_cache.clear()
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test') as client:
+            yield client
+
+
+async def register(client: httpx.AsyncClient, username: str, password: str = 'password') -> dict:
+    await client.post('/auth/', json={'email': f'{username}@test.local', 'username': username, 'password': password})
+    response = await client.post('/auth/token', data={'username': username, 'password': password})
+    response.raise_for_status()
+    return {'Authorization': f"Bearer {response.json()['access_token']}"}
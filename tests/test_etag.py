@@ -0,0 +1,19 @@
+import pytest
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_wildcard_if_none_match_only_matches_existing_groups(client):
+    owner = await register(client, 'owner')
+    await client.post('/study-groups/', headers=owner, json={'name': 'Tagged', 'description': ''})
+
+    response = await client.get('/study-groups/999', headers={'If-None-Match': '*'})
+    assert response.status_code == 404
+
+    response = await client.get('/study-groups/1', headers={'If-None-Match': '*'})
+    assert response.status_code == 304
+
+    etag = (await client.get('/study-groups/1')).headers['etag']
+    response = await client.get('/study-groups/1', headers={'If-None-Match': etag})
+    assert response.status_code == 304
@@ -0,0 +1,39 @@
+import json
+import pytest
+from core.events import NOTIFY_PAYLOAD_LIMIT, PostgresEventBus
+
+pytestmark = pytest.mark.anyio
+
+
+class NotifyPool:
+    # Loops pg_notify straight back to the bus, with the server's limit on payload size.
+    def __init__(self, bus: PostgresEventBus):
+        self.bus = bus
+        self.payloads = []
+
+    async def execute(self, query: str, channel: str, payload: str) -> None:
+        assert len(payload.encode()) < 8000, 'payload string too long'
+        self.payloads.append(payload)
+        self.bus._on_notify(None, 0, channel, payload)
+
+
+@pytest.mark.parametrize('description, truncated', [('short', False), ('x' * 20000, True)])
+async def test_oversized_event_is_published_without_data(description, truncated):
+    bus = PostgresEventBus('postgresql://localhost/studyhub', queue_size=10)
+    bus.pool = NotifyPool(bus)
+    subscription = bus.hub.subscribe(1, user_id=1)
+
+    await bus.publish(1, 'group.updated', {'name': 'Math', 'description': description})
+
+    assert bus.publish_errors == 0
+    assert len(bus.pool.payloads[0].encode()) <= NOTIFY_PAYLOAD_LIMIT
+    event = subscription.queue.get_nowait()
+    assert event['type'] == 'group.updated'
+    assert event['group_id'] == 1
+    if truncated:
+        assert event['truncated'] is True
+        assert event['data'] == {}
+    else:
+        assert 'truncated' not in event
+        assert event['data'] == {'name': 'Math', 'description': 'short'}
+    json.loads(bus.pool.payloads[0])
@@ -0,0 +1,21 @@
+import pytest
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_export_rejects_unknown_status_before_streaming(client):
+    owner = await register(client, 'owner')
+    await client.post('/study-groups/', headers=owner, json={'name': 'Export', 'description': ''})
+    await client.post('/study-groups/1/subjects', headers=owner, json={'name': 'Algebra'})
+    await client.post('/study-groups/1/study_sessions/1', headers=owner, json={
+        'title': 'Week 1', 'description': '', 'date_time': '2030-01-01T10:00:00', 'duration': 60, 'status': 'Scheduled'
+    })
+
+    response = await client.get('/study-groups/1/study_sessions/export', headers=owner, params={'status': 'Bogus'})
+    assert response.status_code == 400
+
+    response = await client.get('/study-groups/1/study_sessions/export', headers=owner,
+                                params={'status': 'Scheduled', 'format': 'csv'})
+    assert response.status_code == 200
+    assert response.text.splitlines()[1].startswith('1,1,Algebra,Week 1,')
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from core.hashing import PasswordHasher, password_hasher
+
+pytestmark = pytest.mark.anyio
+
+
+async def block(hasher: PasswordHasher, release: threading.Event) -> asyncio.Task:
+    task = asyncio.create_task(hasher._run('hash', release.wait))
+    while hasher.pending < 1:
+        await asyncio.sleep(0)
+    return task
+
+
+async def test_hasher_sheds_load_past_max_pending():
+    hasher = PasswordHasher('thread', workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        blocked = await block(hasher, release)
+
+        with pytest.raises(HTTPException) as rejected:
+            await hasher.hash('password')
+        assert rejected.value.status_code == 429
+        assert rejected.value.headers == {'Retry-After': '1'}
+
+        release.set()
+        await blocked
+        assert hasher.pending == 0
+        assert await hasher.verify('password', await hasher.hash('password'))
+    finally:
+        release.set()
+        hasher.shutdown()
+
+
+async def test_registration_answers_429_while_the_hash_pool_is_full(client, monkeypatch):
+    monkeypatch.setattr(password_hasher, 'max_pending', 1)
+    release = threading.Event()
+    try:
+        blocked = await block(password_hasher, release)
+        response = await client.post('/auth/', json={'email': 'a@test.local', 'username': 'alice', 'password': 'password'})
+        assert response.status_code == 429
+        assert response.headers['retry-after'] == '1'
+    finally:
+        release.set()
+    await blocked
+
+    response = await client.post('/auth/', json={'email': 'a@test.local', 'username': 'alice', 'password': 'password'})
+    assert response.status_code == 201
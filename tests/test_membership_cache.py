@@ -0,0 +1,33 @@
+import pytest
+from core.membership_cache import LocalMembershipCache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize('invalidate', [
+    lambda cache: cache.invalidate(1, 2),
+    lambda cache: cache.invalidate_group(2),
+    lambda cache: cache.invalidate_user(1)
+])
+async def test_fill_racing_invalidation_is_not_cached(invalidate):
+    cache = LocalMembershipCache(maxsize=100, ttl=30)
+
+    generation = await cache.generation(1, 2)
+    # The membership changes while the role is being read from the database.
+    await invalidate(cache)
+    await cache.set(1, 2, 'Admin', generation)
+    assert await cache.get(1, 2) is None
+
+    generation = await cache.generation(1, 2)
+    await cache.set(1, 2, 'Member', generation)
+    assert await cache.get(1, 2) == 'Member'
+
+
+async def test_generations_are_not_reused_after_invalidation():
+    cache = LocalMembershipCache(maxsize=100, ttl=30)
+
+    stale = await cache.generation(1, 2)
+    await cache.invalidate(1, 2)
+    assert await cache.generation(1, 2) != stale
+    await cache.set(1, 2, 'Admin', stale)
+    assert await cache.get(1, 2) is None
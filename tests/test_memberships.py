@@ -0,0 +1,21 @@
+import pytest
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_transferred_group_survives_the_previous_creator(client):
+    owner = await register(client, 'owner')
+    heir = await register(client, 'heir')
+    await client.post('/study-groups/', headers=owner, json={'name': 'Inherited', 'description': ''})
+    await client.post('/study-groups/1/join', headers=heir)
+
+    response = await client.put('/study-groups/1/member/2', headers=owner, json={'role': 'Creator'})
+    assert response.status_code == 200
+
+    response = await client.request('DELETE', '/user/me', headers=owner, json={'password': 'password'})
+    assert response.status_code == 204
+
+    assert (await client.get('/study-groups/1')).status_code == 200
+    members = (await client.get('/study-groups/1/members', headers=heir)).json()['items']
+    assert [(m['username'], m['role']) for m in members] == [('heir', 'Creator')]
@@ -0,0 +1,20 @@
+import pytest
+from core.metrics import registry
+from core.query_metrics import route_query_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_unknown_methods_share_one_label(client):
+    for method in ['BREW', 'X-SCAN-1', 'X-SCAN-2']:
+        await client.request(method, '/nowhere')
+    await client.request('BREW', '/study-groups/')
+    await client.get('/nowhere')
+
+    assert 'OTHER <unmatched>' in route_query_stats
+    assert 'GET <unmatched>' in route_query_stats
+    assert not [key for key in route_query_stats if 'BREW' in key or 'SCAN' in key]
+
+    metrics = registry.render()
+    assert 'method="OTHER"' in metrics
+    assert 'BREW' not in metrics and 'SCAN' not in metrics
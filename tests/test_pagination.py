@@ -0,0 +1,123 @@
+import base64
+from datetime import datetime
+import json
+import pytest
+from sqlalchemy import insert
+from core.pagination import encode_cursor
+from database import SessionLocal
+from models import StudyGroup, utc_now
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+def raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+TAMPERED_CURSORS = [
+    'not a cursor',
+    raw_cursor({'created_at': '2030-01-01T00:00:00', 'id': 1}),
+    raw_cursor(['2030-01-01T00:00:00']),
+    raw_cursor(['2030-01-01T00:00:00', 'one']),
+    raw_cursor(['2030-01-01T00:00:00+05:00', 1]),
+    raw_cursor([None, None])
+]
+
+
+async def walk(client, url: str, limit: int, headers: dict | None = None, params: dict | None = None) -> list[dict]:
+    items, cursor = [], None
+    while True:
+        response = await client.get(url, headers=headers, params={**(params or {}), 'limit': limit,
+                                                                   **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page['items']) <= limit
+        items.extend(page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return items
+
+
+async def test_group_pages_cover_rows_that_share_a_sort_key(client):
+    await register(client, 'owner')
+    created_at = utc_now()
+    async with SessionLocal() as db:
+        await db.execute(insert(StudyGroup), [
+            {'name': f'Same {i}', 'description': '', 'owner_id': 1, 'created_at': created_at} for i in range(7)
+        ])
+        await db.commit()
+    await client.post('/study-groups/', headers=await register(client, 'other'), json={'name': 'Other', 'description': ''})
+
+    everything = (await client.get('/study-groups/', params={'name': 'same', 'limit': 100})).json()['items']
+    for limit in [1, 2, 3]:
+        assert await walk(client, '/study-groups/', limit, params={'name': 'same'}) == everything
+    assert sorted(group['name'] for group in everything) == [f'Same {i}' for i in range(7)]
+
+
+@pytest.mark.parametrize('cursor', TAMPERED_CURSORS + [encode_cursor('Member', 1)])
+async def test_group_pages_reject_tampered_and_foreign_cursors(client, cursor):
+    response = await client.get('/study-groups/', params={'cursor': cursor})
+    assert response.status_code == 400
+
+
+async def test_session_pages_cover_rows_that_share_a_sort_key(client):
+    owner = await register(client, 'owner')
+    await client.post('/study-groups/', headers=owner, json={'name': 'Sessions', 'description': ''})
+    await client.post('/study-groups/1/subjects', headers=owner, json={'name': 'Algebra'})
+    # Cancelled sessions skip the overlap check, so several can start at the same moment.
+    response = await client.post('/study-groups/1/study_sessions/1/bulk', headers=owner, json={'sessions': [
+        {'title': f'Session {i}', 'description': '', 'date_time': '2030-01-01T10:00:00', 'duration': 60,
+         'status': 'Cancelled'} for i in range(5)
+    ] + [
+        {'title': 'Weekly', 'description': '', 'date_time': '2030-01-01T12:00:00', 'duration': 60,
+         'status': 'Scheduled', 'recurrence': {'frequency': 'weekly', 'count': 3}}
+    ]})
+    assert response.status_code == 201
+
+    url = '/study-groups/1/study_sessions/1'
+    everything = (await client.get(url, headers=owner, params={'limit': 200})).json()['items']
+    assert len(everything) == 8
+    for limit in [1, 2, 3]:
+        assert await walk(client, url, limit, headers=owner) == everything
+    cancelled = await walk(client, url, 2, headers=owner, params={'status': 'Cancelled'})
+    assert sorted(s['title'] for s in cancelled) == [f'Session {i}' for i in range(5)]
+
+
+@pytest.mark.parametrize('cursor', TAMPERED_CURSORS + [encode_cursor('Member', 1)])
+async def test_session_pages_reject_tampered_and_foreign_cursors(client, cursor):
+    owner = await register(client, 'owner')
+    await client.post('/study-groups/', headers=owner, json={'name': 'Sessions', 'description': ''})
+    await client.post('/study-groups/1/subjects', headers=owner, json={'name': 'Algebra'})
+
+    response = await client.get('/study-groups/1/study_sessions/1', headers=owner, params={'cursor': cursor})
+    assert response.status_code == 400
+
+
+async def test_member_pages_cover_members_that_share_a_role(client):
+    owner = await register(client, 'owner')
+    await client.post('/study-groups/', headers=owner, json={'name': 'Members', 'description': ''})
+    for i in range(6):
+        response = await client.post('/study-groups/1/join', headers=await register(client, f'member{i}'))
+        assert response.status_code == 201
+    await client.put('/study-groups/1/member/3', headers=owner, json={'role': 'Admin'})
+
+    url = '/study-groups/1/members'
+    everything = (await client.get(url, headers=owner, params={'limit': 200})).json()['items']
+    assert [m['role'] for m in everything].count('Member') == 5
+    for limit in [1, 2, 4]:
+        assert await walk(client, url, limit, headers=owner) == everything
+    members = await walk(client, url, 2, headers=owner, params={'role': 'Member'})
+    assert [m['user_id'] for m in members] == [2, 4, 5, 6, 7]
+
+
+@pytest.mark.parametrize('cursor', TAMPERED_CURSORS + [
+    encode_cursor('Boss', 1),
+    encode_cursor(datetime(2030, 1, 1), 1)
+])
+async def test_member_pages_reject_tampered_and_foreign_cursors(client, cursor):
+    owner = await register(client, 'owner')
+    await client.post('/study-groups/', headers=owner, json={'name': 'Members', 'description': ''})
+
+    response = await client.get('/study-groups/1/members', headers=owner, params={'cursor': cursor})
+    assert response.status_code == 400
@@ -0,0 +1,122 @@
+import ipaddress
+import pytest
+from starlette.requests import Request
+import core.rate_limit
+from core.rate_limit import LocalRateLimitStore, client_ip, estimate, login_user_limit, register_ip_limit
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(core.rate_limit, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(core.rate_limit, 'rate_limit_store', LocalRateLimitStore(100))
+    return monkeypatch
+
+
+def test_estimate_denies_at_the_limit():
+    assert estimate(5, 60, 10, 4, 0) == (True, 0)
+    assert estimate(5, 60, 10, 5, 0) == (False, 50)
+
+
+def test_estimate_weights_the_previous_window_by_its_overlap():
+    # Halfway through the window, half of the previous window's hits still count.
+    assert estimate(10, 60, 30, 4, 10) == (True, 0)
+    assert estimate(10, 60, 30, 5, 10) == (False, 1)
+    # Three quarters of 20 previous hits is over the limit; 30 seconds on, half of them is not.
+    assert estimate(10, 60, 15, 0, 20) == (False, 15)
+
+
+async def test_store_carries_the_previous_window_and_resets_after_two(monkeypatch):
+    clock = Clock(600)
+    monkeypatch.setattr(core.rate_limit, 'time', clock)
+    store = LocalRateLimitStore(100)
+
+    assert [(await store.hit('k', 3, 60))[0] for _ in range(3)] == [True, True, True]
+    assert await store.hit('k', 3, 60) == (False, 60)
+
+    clock.now = 690
+    assert [(await store.hit('k', 3, 60))[0] for _ in range(3)] == [True, True, False]
+
+    clock.now = 780
+    assert [(await store.hit('k', 3, 60))[0] for _ in range(4)] == [True, True, True, False]
+
+
+async def test_store_keeps_keys_apart(monkeypatch):
+    monkeypatch.setattr(core.rate_limit, 'time', Clock(600))
+    store = LocalRateLimitStore(100)
+
+    assert (await store.hit('a', 1, 60))[0]
+    assert not (await store.hit('a', 1, 60))[0]
+    assert (await store.hit('b', 1, 60))[0]
+
+
+async def test_registrations_are_limited_per_address(client, limits):
+    limits.setattr(register_ip_limit, 'limit', 2)
+
+    for i in range(2):
+        response = await client.post('/auth/', json={'email': f'user{i}@test.local', 'username': f'user{i}', 'password': 'password'})
+        assert response.status_code == 201
+
+    response = await client.post('/auth/', json={'email': 'user2@test.local', 'username': 'user2', 'password': 'password'})
+    assert response.status_code == 429
+    assert int(response.headers['retry-after']) > 0
+
+
+async def test_logins_are_limited_per_account(client, limits):
+    limits.setattr(login_user_limit, 'limit', 3)
+    # register() logs in once, which counts against the account too.
+    await register(client, 'alice')
+
+    for _ in range(2):
+        response = await client.post('/auth/token', data={'username': 'alice', 'password': 'wrong'})
+        assert response.status_code == 401
+
+    # Even the right password is turned away once the account's attempts are spent.
+    response = await client.post('/auth/token', data={'username': 'alice', 'password': 'password'})
+    assert response.status_code == 429
+    assert int(response.headers['retry-after']) > 0
+
+    response = await client.post('/auth/token', data={'username': 'bob', 'password': 'wrong'})
+    assert response.status_code == 401
+
+
+def request_from(host: str, forwarded: str | None = None) -> Request:
+    headers = [(b'x-forwarded-for', forwarded.encode())] if forwarded else []
+    return Request({'type': 'http', 'method': 'GET', 'path': '/', 'headers': headers, 'client': (host, 50000)})
+
+
+@pytest.mark.parametrize('host, forwarded, expected', [
+    ('203.0.113.7', '198.51.100.1', '203.0.113.7'),
+    ('10.0.0.1', None, '10.0.0.1'),
+    ('10.0.0.1', '198.51.100.1', '198.51.100.1'),
+    ('10.0.0.1', 'spoofed, 198.51.100.1, 10.0.0.2', '198.51.100.1'),
+    ('10.0.0.1', '10.0.0.3, 10.0.0.2', '10.0.0.3'),
+    ('10.0.0.1', 'garbage', '10.0.0.1')
+])
+def test_client_ip_only_believes_trusted_proxies(monkeypatch, host, forwarded, expected):
+    monkeypatch.setattr(core.rate_limit, 'TRUSTED_PROXIES', [ipaddress.ip_network('10.0.0.0/8')])
+    assert client_ip(request_from(host, forwarded)) == expected
+
+
+async def test_clients_behind_a_trusted_proxy_get_their_own_limit(client, limits):
+    limits.setattr(register_ip_limit, 'limit', 1)
+    limits.setattr(core.rate_limit, 'TRUSTED_PROXIES', [ipaddress.ip_network('127.0.0.1')])
+
+    async def register_from(address: str, username: str) -> int:
+        response = await client.post('/auth/', headers={'X-Forwarded-For': address},
+                                     json={'email': f'{username}@test.local', 'username': username, 'password': 'password'})
+        return response.status_code
+
+    assert await register_from('198.51.100.1', 'first') == 201
+    assert await register_from('198.51.100.1', 'second') == 429
+    assert await register_from('198.51.100.2', 'third') == 201
@@ -0,0 +1,32 @@
+import pytest
+import core.schedule
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+def session(title: str, date_time: str) -> dict:
+    return {'title': title, 'description': '', 'date_time': date_time, 'duration': 60, 'status': 'Scheduled'}
+
+
+@pytest.mark.parametrize('mode, overlaps', [('group', True), ('subject', False), ('off', False)])
+async def test_conflict_preview_matches_session_writes(client, monkeypatch, mode, overlaps):
+    monkeypatch.setattr(core.schedule, 'SESSION_CONFLICTS', mode)
+    owner = await register(client, 'owner')
+    await client.post('/study-groups/', headers=owner, json={'name': 'Schedule', 'description': ''})
+    await client.post('/study-groups/1/subjects', headers=owner, json={'name': 'Algebra'})
+    await client.post('/study-groups/1/subjects', headers=owner, json={'name': 'Geometry'})
+
+    created = await client.post('/study-groups/1/study_sessions/1', headers=owner,
+                                json=session('Algebra review', '2030-01-01T10:00:00'))
+    assert created.status_code == 201
+
+    preview = await client.get('/study-groups/1/schedule/conflicts', headers=owner, params={
+        'start': '2030-01-01T10:30:00', 'duration': 60, 'subject_id': 2
+    })
+    write = await client.post('/study-groups/1/study_sessions/2', headers=owner,
+                              json=session('Geometry review', '2030-01-01T10:30:00'))
+
+    assert preview.status_code == 200
+    assert bool(preview.json()) == overlaps
+    assert write.status_code == (409 if overlaps else 201)
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import func, select
+from database import SessionLocal
+from models import SessionStat, StudySession
+from tests.conftest import register
+
+pytestmark = pytest.mark.anyio
+
+
+def session(title: str, status: str = 'Scheduled') -> dict:
+    return {'title': title, 'description': '', 'date_time': '2030-01-01T10:00:00', 'duration': 60, 'status': status}
+
+
+async def row_counts() -> tuple[int, int]:
+    async with SessionLocal() as db:
+        sessions = await db.scalar(select(func.count()).select_from(StudySession))
+        stats = await db.scalar(select(func.count()).select_from(SessionStat))
+        return sessions, stats
+
+
+async def test_unknown_status_is_rejected_before_any_write(client):
+    owner = await register(client, 'owner')
+    await client.post('/study-groups/', headers=owner, json={'name': 'Statuses', 'description': ''})
+    await client.post('/study-groups/1/subjects', headers=owner, json={'name': 'Algebra'})
+
+    response = await client.post('/study-groups/1/study_sessions/1', headers=owner, json=session('Week 1', 'Bogus'))
+    assert response.status_code == 400
+    assert await row_counts() == (0, 0)
+
+    response = await client.post('/study-groups/1/study_sessions/1', headers=owner, json=session('Week 1'))
+    assert response.status_code == 201
+    assert await row_counts() == (1, 1)
+
+    for bad_status in ['Bogus', None]:
+        response = await client.put('/study-groups/1/study_sessions/1/1', headers=owner, json=session('Week 1b', bad_status))
+        assert response.status_code == 400
+
+    listing = await client.get('/study-groups/1/study_sessions/1', headers=owner)
+    assert listing.status_code == 200
+    assert [s['title'] for s in listing.json()['items']] == ['Week 1']
+    stats = await client.get('/study-groups/1/stats/weekly', headers=owner)
+    assert [(s['status'], s['session_count']) for s in stats.json()] == [('Scheduled', 1)]